@@ -0,0 +1,259 @@
+"""
+Profil resmi işleme: yüklenen orijinalden istek dışında kare, metadata'sı
+(EXIF/GPS vb.) temizlenmiş WebP ve JPEG boyutları üretilir; orijinal de
+aynı adla metadata'sız yeniden kodlanır. İşlem bitene kadar API profil
+resmi olarak null döner, ham orijinalin adresi verilmez (orijinaller
+/media/ altından da sunulmaz).
+
+İşlem transaction commit edildikten sonra yerel worker thread'inde çalışır;
+MODE='queue' işi veritabanı kuyruğuna (run_worker) bırakır, MODE='sync'
+(testler) aynı thread'de hemen çalıştırır.
+"""
+import hashlib
+import io
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from taskqueue.queue import enqueue
+from .models import CustomUser
+
+logger = logging.getLogger('todocalendar.avatars')
+
+AVATAR_DEFAULTS = {
+    'SIZES': [64, 128, 256],
+    'DEFAULT_SIZE': 128,
+    'QUALITY': 82,
+    'MODE': 'thread',
+    'MAX_WORKERS': 2,
+}
+
+# Çıktı formatı -> (Pillow format adı, dosya uzantısı)
+FORMATS = {
+    'webp': ('WEBP', 'webp'),
+    'jpeg': ('JPEG', 'jpg'),
+}
+
+# Orijinali metadata'sız yeniden kodlanabilen formatlar (ad ve uzantı korunur)
+REENCODE_FORMATS = ('JPEG', 'PNG', 'WEBP')
+METADATA_KEYS = ('exif', 'xmp', 'XML:com.adobe.xmp', 'comment')
+
+
+def get_options():
+    return {**AVATAR_DEFAULTS, **getattr(settings, 'AVATARS', {})}
+
+
+def render_variants(source, sizes, quality):
+    """
+    Görüntüden her boyut ve format için kodlanmış baytları üret: {(boyut, format): bytes}.
+
+    Yeni görüntü exif/icc bilgisi verilmeden kaydedildiği için metadata taşınmaz.
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        image = image.convert('RGB')
+
+    variants = {}
+    for size in sizes:
+        thumbnail = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        for fmt, (pillow_format, _) in FORMATS.items():
+            output = io.BytesIO()
+            thumbnail.save(output, pillow_format, quality=quality, optimize=fmt == 'jpeg')
+            variants[(size, fmt)] = output.getvalue()
+    return variants
+
+
+def strip_metadata(source, quality):
+    """
+    Orijinal resmi aynı formatta metadata'sız yeniden kodla; metadata yoksa
+    veya format desteklenmiyorsa None döner
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(source) as image:
+        pillow_format = image.format
+        if pillow_format not in REENCODE_FORMATS:
+            return None
+        if not image.getexif() and not any(key in image.info for key in METADATA_KEYS):
+            return None
+        cleaned = ImageOps.exif_transpose(image)
+        if pillow_format == 'JPEG' and cleaned.mode not in ('RGB', 'L'):
+            cleaned = cleaned.convert('RGB')
+        cleaned.info = {}
+
+    output = io.BytesIO()
+    cleaned.save(output, pillow_format, quality=quality)
+    return output.getvalue()
+
+
+def save_replacing(name, content):
+    """
+    İçeriği name adıyla kaydet; dosya zaten varsa eksik kaldığı bir an olmadan değiştir.
+
+    Yerel depolamada içerik aynı dizinde geçici dosyaya yazılıp aynı ada
+    taşınır (os.replace atomiktir). Yerel yolu olmayan depolamalarda dosya
+    silinmez, depolamanın verdiği yeni ada kaydedilir. Kaydedilen adı döndürür.
+    """
+    try:
+        path = default_storage.path(name)
+    except NotImplementedError:
+        return default_storage.save(name, ContentFile(content))
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'wb') as output:
+            output.write(content)
+        os.chmod(temp_path, getattr(default_storage, 'file_permissions_mode', None) or 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return name
+
+
+def replace_original(user_id, name, content):
+    """
+    Orijinal dosyayı temizlenmiş içerikle değiştir; yeni ada kaydedildiyse
+    (yerel olmayan depolama) resim hâlâ aynıysa kayıt yeni ada çevrilir
+    """
+    saved = save_replacing(name, content)
+    if saved != name:
+        if CustomUser.objects.filter(pk=user_id, profile_picture=name).update(profile_picture=saved):
+            default_storage.delete(name)
+        else:
+            default_storage.delete(saved)
+    elif not CustomUser.objects.filter(pk=user_id, profile_picture=name).exists():
+        # Bu arada yeni resim yüklenip eski orijinal silindiyse yeniden yaratılan dosya kalmamalı
+        default_storage.delete(name)
+
+
+def process_avatar(user_id):
+    """
+    Kullanıcının güncel profil resminden boyutları üretip avatar_variants'a yaz
+    ve orijinalin metadata'sını temizle.
+
+    İşlem sırasında resim değiştiyse sonuç yazılmaz (yeni resmin işi ayrıca çalışır).
+    """
+    user = CustomUser.objects.filter(pk=user_id).only('profile_picture', 'avatar_variants').first()
+    if user is None or not user.profile_picture:
+        return None
+
+    options = get_options()
+    original = user.profile_picture.name
+    previous = user.avatar_variants or {}
+    with default_storage.open(original, 'rb') as source:
+        variants = render_variants(source, options['SIZES'], options['QUALITY'])
+        source.seek(0)
+        cleaned = strip_metadata(source, 95)
+
+    # Ada eklenen özet, resim değişince URL'yi de değiştirir (uzun süreli önbellek için)
+    prefix = f"avatars/{user_id}/{hashlib.sha256(original.encode()).hexdigest()[:12]}"
+    stored = {}
+    for (size, fmt), content in variants.items():
+        name = f'{prefix}_{size}.{FORMATS[fmt][1]}'
+        stored.setdefault(str(size), {})[fmt] = save_replacing(name, content)
+
+    updated = CustomUser.objects.filter(pk=user_id, profile_picture=original).update(avatar_variants=stored)
+    if not updated:
+        delete_variants(stored)
+        return None
+    if cleaned is not None:
+        replace_original(user_id, original, cleaned)
+
+    # Yalnızca kayıtta yerini aldığı boyutlar silinir; dizindeki diğer dosyalar
+    # (ör. bu arada yüklenen yeni resmin boyutları) başka bir işe aittir
+    delete_variants(previous, keep=stored)
+    return stored
+
+
+def variant_names(variants):
+    return {name for formats in (variants or {}).values() for name in formats.values()}
+
+
+def delete_variants(variants, keep=None):
+    for name in variant_names(variants) - variant_names(keep):
+        default_storage.delete(name)
+
+
+class AvatarWorker:
+    """
+    Profil resmi işlerini istek thread'i dışında çalıştıran yerel worker
+    """
+    def __init__(self, max_workers):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='avatar')
+
+    def submit(self, user_id):
+        return self._executor.submit(self._run, user_id)
+
+    @staticmethod
+    def _run(user_id):
+        try:
+            return process_avatar(user_id)
+        except Exception:
+            logger.exception('Profil resmi işlenemedi (kullanıcı %s)', user_id)
+            return None
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def get_worker():
+    global _worker
+    if _worker is None:
+        with _worker_lock:
+            if _worker is None:
+                _worker = AvatarWorker(get_options()['MAX_WORKERS'])
+    return _worker
+
+
+def schedule_avatar_processing(user_id):
+    """
+    Profil resmi kaydı commit edildikten sonra işlemeyi başlat
+    """
+    mode = get_options()['MODE']
+    if mode == 'sync':
+        transaction.on_commit(lambda: process_avatar(user_id))
+    elif mode == 'queue':
+        enqueue('authentication.process_avatar', args=[user_id])
+    else:
+        transaction.on_commit(lambda: get_worker().submit(user_id))
+
+
+def avatar_urls(user):
+    """
+    İşlenmiş boyutların URL'leri: {'128': {'webp': url, 'jpeg': url}, ...}
+    """
+    return {
+        size: {fmt: default_storage.url(name) for fmt, name in formats.items()}
+        for size, formats in (user.avatar_variants or {}).items()
+    }
+
+
+def avatar_url(user, size=None, fmt='jpeg'):
+    """
+    İstenen boyuta en yakın (büyük) işlenmiş varyantın URL'si.
+
+    Henüz işlenmemişse (veya işleme başarısız olduysa) None döner; metadata'sı
+    temizlenmemiş orijinalin adresi verilmez.
+    """
+    variants = user.avatar_variants or {}
+    if not variants:
+        return None
+
+    size = size or get_options()['DEFAULT_SIZE']
+    available = sorted(int(key) for key in variants)
+    chosen = next((candidate for candidate in available if candidate >= size), available[-1])
+    formats = variants[str(chosen)]
+    return default_storage.url(formats.get(fmt) or next(iter(formats.values())))
@@ -0,0 +1,38 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import check_password, make_password
+
+from .hashing import get_hashing_pool
+
+UserModel = get_user_model()
+
+
+class PooledModelBackend(ModelBackend):
+    """
+    Kullanıcı sorgusunu istek thread'inde, şifre hash'ini sınırlı havuzda yapan backend
+    """
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return
+
+        pool = get_hashing_pool()
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Var olmayan kullanıcıda da bir hash çalıştırarak zamanlama farkını azalt
+            pool.run(make_password, password)
+            return
+
+        needs_rehash = []
+        if not pool.run(check_password, password, user.password, needs_rehash.append):
+            return
+
+        # Hasher parametreleri değiştiyse şifreyi yeni ayarlarla yeniden hash'le
+        if needs_rehash:
+            user.password = pool.run(make_password, password)
+            user.save(update_fields=['password'])
+
+        if self.user_can_authenticate(user):
+            return user
@@ -0,0 +1,151 @@
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+DEFAULTS = {
+    'BLOOM_CAPACITY': 100000,
+    'BLOOM_ERROR_RATE': 0.001,
+    'BLOOM_REFRESH_SECONDS': 300,
+    'CACHE_PREFIX': 'jwt-blacklist',
+    # Sırası atlanan id'ler (henüz commit edilmemiş eşzamanlı kara liste kaydı) bu süre boyunca tekrar sorgulanır
+    'PENDING_SECONDS': 60,
+    'MAX_PENDING': 1000,
+}
+
+
+class BloomFilter:
+    """
+    Sabit boyutlu Bloom filtresi - yanlış pozitif verebilir, yanlış negatif vermez
+    """
+    def __init__(self, capacity, error_rate):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class TokenBlacklistStore:
+    """
+    Kara liste tablosunun önünde duran Bloom filtresi + önbellek katmanı
+
+    Filtre süreç içinde tutulur, ancak her sorguda tablodan son görülen id'den
+    sonraki kayıtlar (birincil anahtar aralığı, genellikle boş) okunarak
+    güncellenir; böylece başka bir süreçte kara listeye alınan token hemen
+    görülür ve filtrenin "yok" cevabı güvenilirdir. Eşzamanlı transaction'lar
+    id sırasından farklı commit edilebildiği için atlanan id'ler
+    PENDING_SECONDS boyunca tekrar sorgulanır. Süresi dolan kayıtları
+    filtreden atmak için filtre BLOOM_REFRESH_SECONDS aralıklarla baştan kurulur.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._loaded_at = 0.0
+        self._last_id = 0
+        self._pending = {}
+
+    @property
+    def options(self):
+        return {**DEFAULTS, **getattr(settings, 'TOKEN_BLACKLIST_CACHE', {})}
+
+    def _cache_key(self, jti):
+        return f"{self.options['CACHE_PREFIX']}:{jti}"
+
+    def _timeout(self, exp):
+        if exp is None:
+            return None
+        return max(int(exp - time.time()), 1)
+
+    def _load(self, rows, bloom):
+        """
+        Kayıtları filtreye ekle, son görülen id'yi ilerlet ve atlanan id'leri beklemeye al
+        """
+        options = self.options
+        now = time.monotonic()
+        seen = set()
+        for pk, jti in rows:
+            bloom.add(jti)
+            seen.add(pk)
+
+        top = max(seen | {self._last_id})
+        for pk in range(max(self._last_id + 1, top - options['MAX_PENDING']), top):
+            if pk not in seen:
+                self._pending.setdefault(pk, now)
+        self._pending = {
+            pk: since for pk, since in self._pending.items()
+            if pk not in seen and now - since < options['PENDING_SECONDS']
+        }
+        self._last_id = top
+
+    def _get_bloom(self):
+        """
+        Tablodaki son kayıtlarla güncellenmiş filtre (gerekirse baştan kurulur)
+        """
+        options = self.options
+        with self._lock:
+            if self._bloom is None or time.monotonic() - self._loaded_at >= options['BLOOM_REFRESH_SECONDS']:
+                bloom = BloomFilter(options['BLOOM_CAPACITY'], options['BLOOM_ERROR_RATE'])
+                rows = BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now())
+                self._load(rows.values_list('pk', 'token__jti').iterator(), bloom)
+                self._bloom = bloom
+                self._loaded_at = time.monotonic()
+            else:
+                rows = BlacklistedToken.objects.filter(Q(pk__gt=self._last_id) | Q(pk__in=list(self._pending)))
+                self._load(rows.values_list('pk', 'token__jti'), self._bloom)
+        return self._bloom
+
+    def contains(self, jti, exp=None):
+        """
+        Token kara listede mi? Paylaşılan önbellekte yoksa filtre tablodan
+        güncellenir; filtre "yok" diyorsa token'ın kendisi için ayrıca sorgu yapılmaz
+        """
+        if cache.get(self._cache_key(jti)):
+            return True
+        if jti not in self._get_bloom():
+            return False
+
+        exists = BlacklistedToken.objects.filter(token__jti=jti).exists()
+        if exists:
+            cache.set(self._cache_key(jti), True, self._timeout(exp))
+        return exists
+
+    def add(self, jti, exp=None):
+        """
+        Kara listeye alınan token'ı filtreye ve paylaşılan önbelleğe yaz
+        """
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+        cache.set(self._cache_key(jti), True, self._timeout(exp))
+
+    def reset(self):
+        """
+        Filtreyi bir sonraki sorguda tablodan yeniden kurulacak şekilde sıfırla
+        """
+        with self._lock:
+            self._bloom = None
+            self._loaded_at = 0.0
+            self._last_id = 0
+            self._pending = {}
+
+
+blacklist_store = TokenBlacklistStore()
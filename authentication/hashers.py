@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class ConfigurablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    İterasyon sayısı PASSWORD_HASH_ITERATIONS ayarından okunan PBKDF2 hasher'ı.
+
+    Algoritma adı Django'nunkiyle aynı olduğundan mevcut hash'ler doğrulanır;
+    iterasyon sayısı değiştiğinde must_update girişte yeniden hash'lemeyi tetikler.
+    """
+    @property
+    def iterations(self):
+        return getattr(settings, 'PASSWORD_HASH_ITERATIONS', 0) or PBKDF2PasswordHasher.iterations
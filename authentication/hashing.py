@@ -0,0 +1,63 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+DEFAULTS = {
+    'MAX_WORKERS': 4,
+    'MAX_PENDING': 16,
+    'ACQUIRE_TIMEOUT': 2.0,
+}
+
+
+class HashingPoolBusy(APIException):
+    """
+    Hash havuzu dolu olduğunda dönen hata
+    """
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Sunucu şu anda yoğun, lütfen daha sonra tekrar deneyin.'
+    default_code = 'hashing_pool_busy'
+
+
+class HashingPool:
+    """
+    Şifre hash işlemlerini sınırlı sayıda worker thread'de çalıştırır.
+
+    Aynı anda en fazla MAX_WORKERS hash hesaplanır, MAX_PENDING kadar iş
+    sırada bekleyebilir; sıra doluysa istek beklemek yerine reddedilir.
+    """
+    def __init__(self, max_workers, max_pending, acquire_timeout):
+        self.acquire_timeout = acquire_timeout
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='password-hash')
+
+    def run(self, func, *args, **kwargs):
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            raise HashingPoolBusy()
+        try:
+            return self._executor.submit(func, *args, **kwargs).result()
+        finally:
+            self._slots.release()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_hashing_pool():
+    """
+    Ayarlardan oluşturulan paylaşılan hash havuzunu döndür
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                options = {**DEFAULTS, **getattr(settings, 'PASSWORD_HASHING_POOL', {})}
+                _pool = HashingPool(
+                    options['MAX_WORKERS'],
+                    options['MAX_PENDING'],
+                    options['ACQUIRE_TIMEOUT'],
+                )
+    return _pool
@@ -0,0 +1,69 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenRefreshView
+
+from authentication.blacklist import blacklist_store
+from authentication.serializers import CachedTokenRefreshSerializer
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    """
+    TokenRefreshView'ın önbellekli kara liste ile ve onsuz verimini ölçer.
+    Tüm veriler tek bir transaction içinde oluşturulur ve geri alınır.
+    """
+    help = "TokenRefreshView verimini önbellekli kara liste ile ve onsuz ölçer"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200, help='Her senaryo için istek sayısı')
+        parser.add_argument('--blacklisted', type=int, default=1000, help='Önceden kara listeye alınacak token sayısı')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = User.objects.create_user(
+                email='benchmark-refresh@example.com',
+                username='benchmark-refresh',
+                password='benchmark-pass-123',
+            )
+            for _ in range(options['blacklisted']):
+                RefreshToken.for_user(user).blacklist()
+            blacklist_store.reset()
+
+            for label, serializer_class in (
+                ('varsayılan', TokenRefreshSerializer),
+                ('önbellekli', CachedTokenRefreshSerializer),
+            ):
+                self._run(label, serializer_class, user, options['iterations'])
+
+            transaction.set_rollback(True)
+
+    def _run(self, label, serializer_class, user, iterations):
+        factory = APIRequestFactory()
+        view = TokenRefreshView.as_view(serializer_class=serializer_class)
+        tokens = [str(RefreshToken.for_user(user)) for _ in range(iterations)]
+
+        queries = []
+
+        def count_queries(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count_queries):
+            started = time.perf_counter()
+            for token in tokens:
+                response = view(factory.post('/api/auth/token/refresh/', {'refresh': token}, format='json'))
+                assert response.status_code == 200, response.data
+            elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            f'{label:<12} {iterations / elapsed:8.1f} istek/sn  '
+            f'{elapsed / iterations * 1000:6.2f} ms/istek  '
+            f'{len(queries) / iterations:4.1f} sorgu/istek'
+        )
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from authentication.avatars import process_avatar
+from authentication.models import CustomUser
+
+
+class Command(BaseCommand):
+    """
+    Profil resmi olup henüz boyutları üretilmemiş kullanıcıları işler
+    (mevcut kullanıcılar için bir kerelik doldurma veya ayar değişikliği sonrası).
+    """
+    help = 'Profil resimlerinin WebP/JPEG boyutlarını üretir'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='İşlenmiş olanları da yeniden üret')
+
+    def handle(self, *args, **options):
+        users = CustomUser.objects.exclude(profile_picture='').exclude(profile_picture__isnull=True)
+        if not options['all']:
+            users = users.filter(avatar_variants={})
+
+        processed = failed = 0
+        for user_id in users.values_list('pk', flat=True).iterator():
+            try:
+                process_avatar(user_id)
+                processed += 1
+            except Exception as exc:
+                failed += 1
+                self.stderr.write(f'Kullanıcı {user_id}: {exc}')
+        self.stdout.write(self.style.SUCCESS(f'{processed} profil resmi işlendi, {failed} hata.'))
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+from authentication.blacklist import blacklist_store
+
+
+class Command(BaseCommand):
+    """
+    Süresi dolmuş token ve kara liste kayıtlarını toplu olarak temizler.
+    Cron vb. bir zamanlayıcı ile periyodik çalıştırılmak üzere tasarlanmıştır.
+    """
+    help = 'Süresi dolmuş token ve kara liste kayıtlarını toplu olarak temizler'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=5000,
+            help='Tek sorguda silinecek kayıt sayısı (varsayılan: 5000)'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        now = timezone.now()
+        expired = OutstandingToken.objects.filter(expires_at__lte=now).order_by('pk')
+
+        total = 0
+        while True:
+            ids = list(expired.values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                break
+            # Kara liste kayıtları CASCADE ile aynı sorgu turunda silinir
+            OutstandingToken.objects.filter(pk__in=ids).delete()
+            total += len(ids)
+
+        blacklist_store.reset()
+        self.stdout.write(self.style.SUCCESS(f'{total} süresi dolmuş token silindi.'))
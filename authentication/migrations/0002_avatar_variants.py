@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='avatar_variants',
+            field=models.JSONField(blank=True, default=dict, verbose_name='Profil Resmi Boyutları'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0002_avatar_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='timezone',
+            field=models.CharField(blank=True, default='', max_length=64, verbose_name='Zaman Dilimi'),
+        ),
+    ]
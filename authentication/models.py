@@ -10,7 +10,11 @@ class CustomUser(AbstractUser):
     phone_number = models.CharField(max_length=15, blank=True, null=True, verbose_name="Telefon Numarası")
     birth_date = models.DateField(blank=True, null=True, verbose_name="Doğum Tarihi")
     profile_picture = models.ImageField(upload_to='profile_pictures/', blank=True, null=True, verbose_name="Profil Resmi")
+    # Arka planda üretilen boyutlar: {'128': {'webp': ad, 'jpeg': ad}, ...} (authentication.avatars)
+    avatar_variants = models.JSONField(default=dict, blank=True, verbose_name="Profil Resmi Boyutları")
     bio = models.TextField(max_length=500, blank=True, verbose_name="Biyografi")
+    # IANA adı (ör. Europe/Istanbul); boşsa sunucunun TIME_ZONE ayarı kullanılır
+    timezone = models.CharField(max_length=64, blank=True, default='', verbose_name="Zaman Dilimi")
     is_verified = models.BooleanField(default=False, verbose_name="E-posta Doğrulandı")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Oluşturulma Tarihi")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Güncellenme Tarihi")
@@ -1,7 +1,16 @@
+import zoneinfo
+
 from rest_framework import serializers
 from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.password_validation import validate_password
+from django.core.files.storage import default_storage
+from django.db import transaction
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from .avatars import avatar_url, avatar_urls, delete_variants, schedule_avatar_processing
+from .hashing import get_hashing_pool
 from .models import CustomUser
+from .tokens import CachedRefreshToken
 
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
@@ -33,7 +42,13 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         Yeni kullanıcı oluşturma
         """
         validated_data.pop('password_confirm')
-        user = CustomUser.objects.create_user(**validated_data)
+        password = validated_data.pop('password')
+        user = CustomUser(**validated_data)
+        user.email = CustomUser.objects.normalize_email(user.email)
+        user.username = CustomUser.normalize_username(user.username)
+        # Hash işlemi istek thread'i yerine sınırlı havuzda yapılır
+        user.password = get_hashing_pool().run(make_password, password)
+        user.save()
         return user
 
 
@@ -52,7 +67,7 @@ class UserLoginSerializer(serializers.Serializer):
         password = attrs.get('password')
 
         if email and password:
-            user = authenticate(username=email, password=password)
+            user = authenticate(self.context.get('request'), username=email, password=password)
             if not user:
                 raise serializers.ValidationError('Geçersiz e-posta veya şifre.')
             if not user.is_active:
@@ -68,14 +83,57 @@ class UserProfileSerializer(serializers.ModelSerializer):
     Kullanıcı profil serializer'ı
     """
     full_name = serializers.ReadOnlyField()
+    avatar_urls = serializers.SerializerMethodField()
 
     class Meta:
         model = CustomUser
         fields = ('id', 'email', 'username', 'first_name', 'last_name', 'full_name', 
-                 'phone_number', 'birth_date', 'profile_picture', 'bio', 'is_verified', 
+                 'phone_number', 'birth_date', 'profile_picture', 'avatar_urls', 'bio', 'timezone', 'is_verified', 
                  'created_at', 'updated_at')
         read_only_fields = ('id', 'email', 'is_verified', 'created_at', 'updated_at')
 
+    def absolute_url(self, url):
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if url and request else url
+
+    def validate_timezone(self, value):
+        if value and value not in zoneinfo.available_timezones():
+            raise serializers.ValidationError('Geçersiz zaman dilimi.')
+        return value
+
+    def get_avatar_urls(self, obj):
+        return {
+            size: {fmt: self.absolute_url(url) for fmt, url in formats.items()}
+            for size, formats in avatar_urls(obj).items()
+        }
+
+    def to_representation(self, instance):
+        """
+        profile_picture olarak orijinal yerine işlenmiş varsayılan boyut döner (işlenene kadar null)
+        """
+        data = super().to_representation(instance)
+        data['profile_picture'] = self.absolute_url(avatar_url(instance))
+        return data
+
+    def update(self, instance, validated_data):
+        """
+        Yeni profil resmi yüklendiğinde boyutları arka planda yeniden üret;
+        önceki orijinal ve boyutları commit sonrasında silinir
+        """
+        picture_changed = 'profile_picture' in validated_data
+        previous = instance.profile_picture.name if instance.profile_picture else None
+        previous_variants = instance.avatar_variants
+        if picture_changed:
+            validated_data['avatar_variants'] = {}
+        instance = super().update(instance, validated_data)
+        if picture_changed and previous and previous != instance.profile_picture.name:
+            transaction.on_commit(lambda: default_storage.delete(previous))
+        if picture_changed and previous_variants:
+            transaction.on_commit(lambda: delete_variants(previous_variants))
+        if picture_changed and instance.profile_picture:
+            schedule_avatar_processing(instance.pk)
+        return instance
+
 
 class ChangePasswordSerializer(serializers.Serializer):
     """
@@ -101,3 +159,10 @@ class ChangePasswordSerializer(serializers.Serializer):
         if not user.check_password(value):
             raise serializers.ValidationError("Eski şifre yanlış.")
         return value
+
+
+class CachedTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Kara liste kontrolünü önbellekli depo üzerinden yapan token yenileme serializer'ı
+    """
+    token_class = CachedRefreshToken
@@ -0,0 +1,10 @@
+from taskqueue.queue import task
+from .avatars import process_avatar
+
+
+@task(name='authentication.process_avatar')
+def process_avatar_task(user_id):
+    """
+    Profil resminin boyutlarını üret
+    """
+    process_avatar(user_id)
@@ -1,10 +1,30 @@
-from django.test import TestCase
+import shutil
+import tempfile
+import threading
+import time
+from io import BytesIO, StringIO
+from unittest import mock
+from datetime import timedelta
+from django.test import TestCase, override_settings
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken, BlacklistedToken
+from PIL import Image
+from .avatars import process_avatar
+from .blacklist import BloomFilter, blacklist_store
+from .hashing import HashingPool, HashingPoolBusy
 from .models import CustomUser
+from .throttling import LoginAccountThrottle
 
 User = get_user_model()
 
@@ -162,6 +182,23 @@ class AuthenticationAPITest(APITestCase):
         self.assertEqual(response.data['first_name'], 'Updated')
         self.assertEqual(response.data['bio'], 'Updated bio')
 
+    def test_user_profile_timezone(self):
+        """
+        Profilde geçerli IANA zaman dilimi kaydedilir, geçersiz olan reddedilir
+        """
+        user = User.objects.create_user(**self.user_create_data)
+        token = RefreshToken.for_user(user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token.access_token}')
+        url = reverse('authentication:profile')
+
+        response = self.client.patch(url, {'timezone': 'Europe/Berlin'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['timezone'], 'Europe/Berlin')
+
+        response = self.client.patch(url, {'timezone': 'Mars/Olympus'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('timezone', response.data)
+
     def test_change_password(self):
         """
         Şifre değiştirme testi
@@ -194,4 +231,363 @@ class AuthenticationAPITest(APITestCase):
         
         response = self.client.post(url, logout_data, format='json')
         
-        self.assertEqual(response.status_code, status.HTTP_205_RESET_CONTENT) 
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_205_RESET_CONTENT) 
+
+class TokenBlacklistCacheTest(APITestCase):
+    """
+    Önbellekli token kara listesi testleri
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        blacklist_store.reset()
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        """
+        Bloom filtresine eklenen her anahtar bulunmalı
+        """
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        keys = [f'jti-{i}' for i in range(1000)]
+        for key in keys:
+            bloom.add(key)
+
+        self.assertTrue(all(key in bloom for key in keys))
+
+    def test_rotated_token_cannot_be_reused(self):
+        """
+        Yenilemede kara listeye alınan token tekrar kullanılamamalı
+        """
+        url = reverse('authentication:token_refresh')
+        refresh = str(RefreshToken.for_user(self.user))
+
+        response = self.client.post(url, {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('refresh', response.data)
+
+        response = self.client.post(url, {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_blacklisted_token_detected_after_reset(self):
+        """
+        Önbellek temizlense bile filtre tablodan yeniden kurulmalı
+        """
+        token = RefreshToken.for_user(self.user)
+        token.blacklist()
+        blacklist_store.reset()
+
+        url = reverse('authentication:token_refresh')
+        response = self.client.post(url, {'refresh': str(token)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token_blacklisted_by_other_worker_rejected_immediately(self):
+        """
+        Başka bir süreçte kara listeye alınan token, filtre yenilenmeden de reddedilmeli
+        """
+        url = reverse('authentication:token_refresh')
+        token = RefreshToken.for_user(self.user)
+        self.assertFalse(blacklist_store.contains(token['jti']))
+
+        # Diğer süreç: tablo yazılır, bu sürecin filtresine/önbelleğine dokunulmaz
+        BlacklistedToken.objects.create(token=OutstandingToken.objects.get(jti=token['jti']))
+        cache.clear()
+
+        response = self.client.post(url, {'refresh': str(token)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_out_of_order_commit_is_not_missed(self):
+        """
+        Daha küçük id ile sonradan commit edilen kara liste kaydı atlanmamalı
+        """
+        first = OutstandingToken.objects.get(jti=RefreshToken.for_user(self.user)['jti'])
+        second = OutstandingToken.objects.get(jti=RefreshToken.for_user(self.user)['jti'])
+        blacklist_store.contains(first.jti)
+        last_id = BlacklistedToken.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+
+        # last_id + 1 henüz commit edilmemiş bir transaction'a ait
+        BlacklistedToken.objects.create(pk=last_id + 2, token=second)
+        self.assertTrue(blacklist_store.contains(second.jti))
+
+        BlacklistedToken.objects.create(pk=last_id + 1, token=first)
+        self.assertTrue(blacklist_store.contains(first.jti))
+
+    def test_prune_command_removes_expired_tokens(self):
+        """
+        Süresi dolmuş token'lar ve kara liste kayıtları silinmeli
+        """
+        expired = RefreshToken.for_user(self.user)
+        expired.blacklist()
+        OutstandingToken.objects.filter(jti=expired['jti']).update(
+            expires_at=timezone.now() - timedelta(days=1)
+        )
+        active = RefreshToken.for_user(self.user)
+
+        call_command('prune_token_blacklist', batch_size=1, stdout=StringIO())
+
+        self.assertFalse(OutstandingToken.objects.filter(jti=expired['jti']).exists())
+        self.assertFalse(BlacklistedToken.objects.exists())
+        self.assertTrue(OutstandingToken.objects.filter(jti=active['jti']).exists())
+
+
+class LoginThroughputProtectionTest(APITestCase):
+    """
+    Giriş sınırlama, hash havuzu ve yeniden hash'leme testleri
+    """
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        self.url = reverse('authentication:login')
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_login_throttled_per_account(self):
+        """
+        Hesap başına sınır aşıldığında şifre denenmeden 429 dönmeli
+        """
+        rest_framework = dict(settings.REST_FRAMEWORK)
+        rest_framework['DEFAULT_THROTTLE_RATES'] = {'login_ip': '100/min', 'login_account': '2/min'}
+        data = {'email': 'test@example.com', 'password': 'wrongpassword'}
+
+        with self.settings(REST_FRAMEWORK=rest_framework):
+            for _ in range(2):
+                response = self.client.post(self.url, data, format='json')
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+            response = self.client.post(self.url, data, format='json')
+            self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+            # Başka bir hesap aynı IP'den denemeye devam edebilmeli
+            other = {'email': 'other@example.com', 'password': 'wrongpassword'}
+            response = self.client.post(self.url, other, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_concurrent_attempts_cannot_exceed_bucket(self):
+        """
+        Eşzamanlı denemeler aynı token'ı iki kez harcayamamalı
+        """
+        rest_framework = dict(settings.REST_FRAMEWORK)
+        rest_framework['DEFAULT_THROTTLE_RATES'] = {'login_account': '5/min'}
+        request = mock.Mock(data={'email': 'test@example.com'})
+        barrier = threading.Barrier(20)
+        results = []
+        # Önbellek bağlantıları thread başınadır; yama sınıfa yapılır
+        backend = type(caches['default'])
+        real_get = backend.get
+
+        def slow_get(*args, **kwargs):
+            # Okuma ile yazma arasındaki yarış penceresini genişlet
+            value = real_get(*args, **kwargs)
+            time.sleep(0.01)
+            return value
+
+        def attempt():
+            barrier.wait()
+            results.append(LoginAccountThrottle().allow_request(request, None))
+
+        with self.settings(REST_FRAMEWORK=rest_framework), mock.patch.object(backend, 'get', slow_get):
+            threads = [threading.Thread(target=attempt) for _ in range(20)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(results.count(True), 5)
+
+    def test_forwarded_for_header_ignored_without_proxies(self):
+        """
+        Güvenilir vekil yokken X-Forwarded-For değiştirilerek IP sınırı aşılamamalı
+        """
+        rest_framework = dict(settings.REST_FRAMEWORK)
+        rest_framework['DEFAULT_THROTTLE_RATES'] = {'login_ip': '2/min', 'login_account': '100/min'}
+        data = {'email': 'test@example.com', 'password': 'wrongpassword'}
+
+        with self.settings(REST_FRAMEWORK=rest_framework):
+            for index in range(2):
+                response = self.client.post(self.url, data, format='json', HTTP_X_FORWARDED_FOR=f'10.0.0.{index}')
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+            response = self.client.post(self.url, data, format='json', HTTP_X_FORWARDED_FOR='10.0.0.9')
+            self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_password_rehashed_when_iterations_change(self):
+        """
+        Hasher parametreleri değiştiğinde şifre girişte yeniden hash'lenmeli
+        """
+        with self.settings(PASSWORD_HASH_ITERATIONS=1000):
+            self.user.set_password('testpass123')
+            self.user.save()
+
+        with self.settings(PASSWORD_HASH_ITERATIONS=2000):
+            response = self.client.post(
+                self.url, {'email': 'test@example.com', 'password': 'testpass123'}, format='json'
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.password.split('$')[1], '2000')
+        self.assertTrue(self.user.check_password('testpass123'))
+
+    def test_hashing_pool_rejects_when_full(self):
+        """
+        Havuz doluyken yeni iş beklemeden reddedilmeli
+        """
+        pool = HashingPool(max_workers=1, max_pending=0, acquire_timeout=0)
+        self.assertEqual(pool.run(sum, [1, 2]), 3)
+
+        pool._slots.acquire()
+        with self.assertRaises(HashingPoolBusy):
+            pool.run(sum, [1, 2])
+        pool._slots.release()
+
+
+AVATAR_MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(
+    MEDIA_ROOT=AVATAR_MEDIA_ROOT,
+    AVATARS={'SIZES': [32, 96], 'DEFAULT_SIZE': 64, 'QUALITY': 80, 'MODE': 'sync'},
+)
+class AvatarProcessingTest(APITestCase):
+    """
+    Profil resmi boyutlandırma ve metadata temizleme testleri
+    """
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(AVATAR_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='avatar@example.com', username='avatar', password='testpass123'
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+    def make_photo(self):
+        """
+        EXIF (kamera modeli) içeren 400x300 JPEG
+        """
+        exif = Image.Exif()
+        exif[0x0110] = 'Gizli Kamera'
+        output = BytesIO()
+        Image.new('RGB', (400, 300), (200, 30, 30)).save(output, 'JPEG', exif=exif)
+        return SimpleUploadedFile('foto.jpg', output.getvalue(), content_type='image/jpeg')
+
+    def test_upload_generates_variants_after_commit(self):
+        """
+        Yüklenen resimden kare WebP/JPEG boyutları üretilir, varsayılan boyut döner
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(reverse('authentication:profile'), {'profile_picture': self.make_photo()}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.user.refresh_from_db()
+        self.assertEqual(set(self.user.avatar_variants), {'32', '96'})
+        for size, formats in self.user.avatar_variants.items():
+            self.assertEqual(set(formats), {'webp', 'jpeg'})
+            with default_storage.open(formats['jpeg']) as stored, Image.open(stored) as image:
+                self.assertEqual(image.size, (int(size), int(size)))
+                self.assertEqual(len(image.getexif()), 0)
+
+        response = self.client.get(reverse('authentication:profile'))
+        self.assertTrue(response.data['profile_picture'].endswith('_96.jpg'))
+        self.assertTrue(response.data['avatar_urls']['32']['webp'].endswith('_32.webp'))
+
+    def test_unprocessed_picture_not_exposed(self):
+        """
+        Boyutlar üretilene kadar metadata'lı orijinalin adresi dönmemeli
+        """
+        response = self.client.patch(reverse('authentication:profile'), {'profile_picture': self.make_photo()}, format='multipart')
+        self.assertIsNone(response.data['profile_picture'])
+        self.assertEqual(response.data['avatar_urls'], {})
+
+    def test_original_stripped_after_processing(self):
+        """
+        İşlemden sonra orijinal dosya aynı adla metadata'sız saklanmalı
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(reverse('authentication:profile'), {'profile_picture': self.make_photo()}, format='multipart')
+        self.user.refresh_from_db()
+        name = self.user.profile_picture.name
+
+        self.assertTrue(name.startswith('profile_pictures/foto'))
+        with default_storage.open(name) as stored, Image.open(stored) as image:
+            self.assertEqual(image.size, (400, 300))
+            self.assertEqual(len(image.getexif()), 0)
+            self.assertNotIn('exif', image.info)
+
+    def test_original_never_missing_while_stripped(self):
+        """
+        Orijinal silinip yeniden kaydedilmemeli, yerinde değiştirilmeli
+        """
+        self.user.profile_picture = self.make_photo()
+        self.user.save()
+        name = self.user.profile_picture.name
+
+        with mock.patch.object(default_storage, 'delete', wraps=default_storage.delete) as delete:
+            process_avatar(self.user.pk)
+
+        self.assertNotIn(mock.call(name), delete.call_args_list)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.profile_picture.name, name)
+        with default_storage.open(name) as stored, Image.open(stored) as image:
+            self.assertEqual(len(image.getexif()), 0)
+
+    def test_cleanup_keeps_files_of_newer_upload(self):
+        """
+        Eski resmin işi, dizindeki başka bir resme ait boyutları silmemeli
+        """
+        self.user.profile_picture = self.make_photo()
+        self.user.save()
+        newer = default_storage.save(f'avatars/{self.user.pk}/yeniresim_32.jpg', ContentFile(b'yeni'))
+
+        process_avatar(self.user.pk)
+        self.assertTrue(default_storage.exists(newer))
+
+    def test_replaced_original_is_deleted(self):
+        """
+        Yeni resim yüklenince önceki orijinal dosya silinmeli
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(reverse('authentication:profile'), {'profile_picture': self.make_photo()}, format='multipart')
+        self.user.refresh_from_db()
+        old_name = self.user.profile_picture.name
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(reverse('authentication:profile'), {'profile_picture': self.make_photo()}, format='multipart')
+        self.user.refresh_from_db()
+        self.assertNotEqual(self.user.profile_picture.name, old_name)
+        self.assertFalse(default_storage.exists(old_name))
+
+    def test_new_picture_replaces_old_variants(self):
+        """
+        Yeni resim işlendiğinde eski boyut dosyaları silinir
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(reverse('authentication:profile'), {'profile_picture': self.make_photo()}, format='multipart')
+        self.user.refresh_from_db()
+        old_name = self.user.avatar_variants['32']['webp']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(reverse('authentication:profile'), {'profile_picture': self.make_photo()}, format='multipart')
+        self.user.refresh_from_db()
+        self.assertNotEqual(self.user.avatar_variants['32']['webp'], old_name)
+        self.assertFalse(default_storage.exists(old_name))
+
+    def test_process_avatars_command_backfills(self):
+        """
+        process_avatars komutu boyutu olmayan kullanıcıları işler
+        """
+        self.user.profile_picture = self.make_photo()
+        self.user.save()
+        out = StringIO()
+        call_command('process_avatars', stdout=out)
+        self.user.refresh_from_db()
+        self.assertIn('1 profil resmi işlendi', out.getvalue())
+        self.assertEqual(process_avatar(self.user.pk), self.user.avatar_variants)
@@ -0,0 +1,110 @@
+import hashlib
+import time
+
+from django.core.cache import cache as default_cache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Önbellek üzerinde token-bucket algoritmasıyla çalışan throttle.
+
+    Oran DRF'in DEFAULT_THROTTLE_RATES ayarından okunur: '10/min' kova
+    kapasitesinin 10 olduğu ve dakikada 10 token dolduğu anlamına gelir.
+
+    Kovanın okunup yazılması anahtar başına bir kilit (cache.add) altında
+    yapılır; eşzamanlı denemeler aynı token'ı iki kez harcayamaz. Kilit
+    kısa sürede alınamazsa istek reddedilir.
+    """
+    cache = default_cache
+    scope = None
+    cache_format = 'throttle_bucket_%(scope)s_%(ident)s'
+    durations = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+    # Kilit en fazla lock_attempts * lock_wait saniye beklenir
+    lock_timeout = 2
+    lock_attempts = 50
+    lock_wait = 0.005
+
+    def get_ident_value(self, request, view):
+        raise NotImplementedError('.get_ident_value() must be overridden')
+
+    def parse_rate(self, rate):
+        num, period = rate.split('/')
+        capacity = int(num)
+        return capacity, capacity / self.durations[period[0]]
+
+    def acquire(self, lock_key):
+        for _ in range(self.lock_attempts):
+            if self.cache.add(lock_key, 1, self.lock_timeout):
+                return True
+            time.sleep(self.lock_wait)
+        return False
+
+    def allow_request(self, request, view):
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        ident = self.get_ident_value(request, view)
+        if rate is None or not ident:
+            return True
+
+        capacity, refill_rate = self.parse_rate(rate)
+        key = self.cache_format % {
+            'scope': self.scope,
+            'ident': hashlib.sha256(ident.encode()).hexdigest(),
+        }
+        lock_key = f'{key}_lock'
+        if not self.acquire(lock_key):
+            self.wait_seconds = 1 / refill_rate
+            return False
+        try:
+            now = time.time()
+            tokens, updated_at = self.cache.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * refill_rate)
+            timeout = int(capacity / refill_rate) + 1
+
+            if tokens < 1:
+                self.wait_seconds = (1 - tokens) / refill_rate
+                self.cache.set(key, (tokens, now), timeout)
+                return False
+
+            self.cache.set(key, (tokens - 1, now), timeout)
+            return True
+        finally:
+            self.cache.delete(lock_key)
+
+    def wait(self):
+        return getattr(self, 'wait_seconds', None)
+
+
+class LoginIPThrottle(TokenBucketThrottle):
+    """
+    IP başına giriş denemesi sınırı.
+
+    İstemci IP'si DRF'in get_ident'i ile bulunur; X-Forwarded-For yalnızca
+    REST_FRAMEWORK['NUM_PROXIES'] kadar güvenilir vekil için dikkate alınır
+    (varsayılan 0: yalnızca REMOTE_ADDR).
+    """
+    scope = 'login_ip'
+
+    def get_ident_value(self, request, view):
+        return self.get_ident(request)
+
+
+class LoginAccountThrottle(TokenBucketThrottle):
+    """
+    Hesap (e-posta) başına giriş denemesi sınırı
+    """
+    scope = 'login_account'
+
+    def get_ident_value(self, request, view):
+        email = request.data.get('email') if hasattr(request.data, 'get') else None
+        if not isinstance(email, str):
+            return None
+        return email.strip().lower()
+
+
+class RegisterIPThrottle(LoginIPThrottle):
+    """
+    IP başına kayıt denemesi sınırı
+    """
+    scope = 'register_ip'
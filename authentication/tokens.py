@@ -0,0 +1,21 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .blacklist import blacklist_store
+
+
+class CachedRefreshToken(RefreshToken):
+    """
+    Kara liste kontrolünü önbellekli depo üzerinden yapan refresh token
+    """
+    def check_blacklist(self):
+        jti = self.payload[api_settings.JTI_CLAIM]
+        if blacklist_store.contains(jti, self.payload.get('exp')):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        result = super().blacklist()
+        blacklist_store.add(self.payload[api_settings.JTI_CLAIM], self.payload.get('exp'))
+        return result
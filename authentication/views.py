@@ -1,16 +1,18 @@
 from rest_framework import status, generics, permissions
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView
 from django.contrib.auth import login
 from .models import CustomUser
+from .tokens import CachedRefreshToken
 from .serializers import (
     UserRegistrationSerializer, 
     UserLoginSerializer, 
     UserProfileSerializer,
     ChangePasswordSerializer
 )
+from .throttling import LoginIPThrottle, LoginAccountThrottle, RegisterIPThrottle
 
 
 class CustomTokenObtainPairView(TokenObtainPairView):
@@ -18,6 +20,8 @@ class CustomTokenObtainPairView(TokenObtainPairView):
     Özel JWT token alma view'ı
     """
     serializer_class = UserLoginSerializer
+    # Sınır aşıldığında istek şifre hash'lenmeden önce reddedilir
+    throttle_classes = [LoginIPThrottle, LoginAccountThrottle]
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -35,6 +39,7 @@ class CustomTokenObtainPairView(TokenObtainPairView):
 
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
+@throttle_classes([RegisterIPThrottle])
 def register_user(request):
     """
     Kullanıcı kayıt endpoint'i
@@ -92,7 +97,7 @@ def logout_user(request):
     """
     try:
         refresh_token = request.data["refresh"]
-        token = RefreshToken(refresh_token)
+        token = CachedRefreshToken(refresh_token)
         token.blacklist()
         return Response({'message': 'Başarıyla çıkış yapıldı.'}, status=status.HTTP_205_RESET_CONTENT)
     except Exception as e:
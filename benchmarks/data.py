@@ -0,0 +1,125 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+
+from calendar_app.models import Calendar, Event, EventParticipant, EventType
+from todos.models import Category, Priority, Todo, TodoComment
+
+User = get_user_model()
+
+# Profil başına kullanıcı başına todo ve etkinlik sayısı
+PROFILES = {
+    'small': 10,
+    'medium': 1_000,
+    'large': 100_000,
+}
+
+BENCHMARK_PASSWORD = 'benchmark-pass-123'
+
+
+def _batched(objects, model, batch_size):
+    """
+    Nesneleri batch'ler halinde bulk_create ile kaydet
+    """
+    batch = []
+    created = []
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) >= batch_size:
+            created.extend(model.objects.bulk_create(batch))
+            batch = []
+    if batch:
+        created.extend(model.objects.bulk_create(batch))
+    return created
+
+
+def _create_user(prefix, index, password):
+    return User.objects.create(
+        email=f'{prefix}-{index}@benchmark.local',
+        username=f'{prefix}-{index}',
+        first_name='Benchmark',
+        last_name=f'Kullanıcı {index}',
+        password=password,
+    )
+
+
+def _populate(user, rows, participants, batch_size):
+    now = timezone.now()
+    priorities = list(Priority.values)
+    event_types = list(EventType.values)
+
+    categories = Category.objects.bulk_create(
+        Category(name=f'Kategori {i}', color='#007bff', user=user) for i in range(5)
+    )
+    calendars = [
+        Calendar.objects.create(name='Kişisel Takvim', user=user, is_default=True),
+        Calendar.objects.create(name='İş', user=user, color='#dc3545'),
+    ]
+
+    todos = _batched((
+        Todo(
+            title=f'Todo {i}',
+            description='Benchmark açıklaması' if i % 2 else None,
+            user=user,
+            category=categories[i % len(categories)] if i % 3 else None,
+            priority=priorities[i % len(priorities)],
+            is_completed=i % 4 == 0,
+            is_important=i % 7 == 0,
+            due_date=now + timedelta(hours=i - rows // 2) if i % 3 else None,
+            estimated_duration=timedelta(minutes=30 + i % 90),
+        )
+        for i in range(rows)
+    ), Todo, batch_size)
+
+    _batched((
+        TodoComment(todo=todo, user=user, comment=f'Yorum {j}')
+        for todo in todos[::5]
+        for j in range(3)
+    ), TodoComment, batch_size)
+
+    events = _batched((
+        Event(
+            title=f'Etkinlik {i}',
+            description='Benchmark etkinliği',
+            calendar=calendars[i % len(calendars)],
+            user=user,
+            start_time=now + timedelta(hours=i - rows // 2),
+            end_time=now + timedelta(hours=i - rows // 2, minutes=45),
+            event_type=event_types[i % len(event_types)],
+            location='İstanbul' if i % 2 else None,
+        )
+        for i in range(rows)
+    ), Event, batch_size)
+
+    if participants and events[0].pk is not None:
+        _batched((
+            EventParticipant(event=event, user=participants[(i + j) % len(participants)])
+            for i, event in enumerate(events[::3])
+            for j in range(min(2, len(participants)))
+        ), EventParticipant, batch_size)
+
+
+def generate_dataset(profile, users=1, background_users=20, batch_size=2000):
+    """
+    Sentetik veri üret ve profil boyutundaki kullanıcıları döndür.
+
+    Her ana kullanıcı profil boyutunda todo ve etkinliğe, kategorilere,
+    yorumlara ve katılımcılara sahiptir; arka plan kullanıcıları sorgu
+    seçiciliğinin gerçekçi olması için küçük profille oluşturulur.
+    """
+    rows = PROFILES[profile]
+    # Tüm kullanıcılar aynı şifreyi paylaşır; hash bir kez hesaplanır
+    password = make_password(BENCHMARK_PASSWORD)
+
+    background = [_create_user('background', i, password) for i in range(background_users)]
+    for user in background:
+        _populate(user, PROFILES['small'], [], batch_size)
+
+    primary = []
+    for i in range(users):
+        user = _create_user(f'benchmark-{profile}', i, password)
+        _populate(user, rows, background, batch_size)
+        primary.append(user)
+    return primary
@@ -0,0 +1,77 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+
+from benchmarks.report import percentile
+
+
+class Command(BaseCommand):
+    """
+    İstek döngüsünü (request_started -> sorgu -> request_finished) taklit ederek
+    bağlantı kurulum maliyetini ölçer: her istekte yeni bağlantı, kalıcı
+    bağlantı (CONN_MAX_AGE) ve yapılandırılmışsa psycopg havuzu.
+    """
+    help = 'Yeni, kalıcı ve havuzlu veritabanı bağlantılarının istek başına maliyetini ölçer'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--iterations', type=int, default=200, help='Mod başına istek sayısı')
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.in_atomic_block:
+            raise CommandError('Bağlantılar transaction içinde kapatılamaz; komutu transaction dışında çalıştırın.')
+
+        pool_options = connection.settings_dict['OPTIONS'].get('pool')
+        modes = [('yeni bağlantı', 0, None), ('kalıcı bağlantı', 600, None)]
+        if pool_options:
+            modes.append(('havuz', 0, pool_options))
+
+        results = {}
+        for name, conn_max_age, pool in modes:
+            results[name] = self.run_mode(connection, options['iterations'], conn_max_age, pool)
+
+        self.stdout.write(f"{'Mod':<18}{'ort ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+        for name, timings in results.items():
+            self.stdout.write(
+                f'{name:<18}{sum(timings) / len(timings):>10.3f}'
+                f'{percentile(timings, 0.50):>10.3f}{percentile(timings, 0.95):>10.3f}'
+            )
+
+        baseline = results['yeni bağlantı']
+        best_name = min(results, key=lambda name: sum(results[name]))
+        saved = (sum(baseline) - sum(results[best_name])) / len(baseline)
+        self.stdout.write(self.style.SUCCESS(
+            f'{best_name}: istek başına {saved:.3f} ms bağlantı kurulum süresi kazanıldı.'
+        ))
+
+    def run_mode(self, connection, iterations, conn_max_age, pool):
+        """
+        Verilen CONN_MAX_AGE / havuz ayarıyla istek döngüsünü çalıştır, istek başına süreleri döndür
+        """
+        settings_dict = connection.settings_dict
+        original = settings_dict['CONN_MAX_AGE'], settings_dict['OPTIONS'].get('pool')
+        connection.close()
+        settings_dict['CONN_MAX_AGE'] = conn_max_age
+        if pool:
+            settings_dict['OPTIONS']['pool'] = pool
+        else:
+            settings_dict['OPTIONS'].pop('pool', None)
+
+        timings = []
+        try:
+            for _ in range(iterations):
+                started = time.perf_counter()
+                close_old_connections()
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+                    cursor.fetchone()
+                close_old_connections()
+                timings.append((time.perf_counter() - started) * 1000)
+        finally:
+            connection.close()
+            settings_dict['CONN_MAX_AGE'] = original[0]
+            if original[1]:
+                settings_dict['OPTIONS']['pool'] = original[1]
+        return timings
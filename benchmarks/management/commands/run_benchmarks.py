@@ -0,0 +1,85 @@
+import json
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from benchmarks.data import PROFILES, generate_dataset
+from benchmarks.report import build_report, compare_reports, format_report, save_report
+from benchmarks.runner import SCENARIOS, ScenarioRunner
+
+
+class Command(BaseCommand):
+    """
+    Sentetik veri üzerinde app.js senaryolarını çalıştırır; endpoint başına verim,
+    p50/p95/p99 gecikme ve istek başına sorgu sayısını raporlar ve kaydeder.
+    Yapılandırılmış veritabanı (SQLite veya PostgreSQL) kullanılır; veriler tek
+    bir transaction içinde oluşturulur ve geri alınır.
+    """
+    help = 'API yük testi ve benchmark senaryolarını çalıştırır'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profile', choices=sorted(PROFILES), default='small', help='Kullanıcı başına veri boyutu')
+        parser.add_argument('--users', type=int, default=1, help='Profil boyutundaki kullanıcı sayısı')
+        parser.add_argument('--background-users', type=int, default=20, help='Küçük profilli arka plan kullanıcı sayısı')
+        parser.add_argument('--iterations', type=int, default=50, help='Kullanıcı başına senaryo tekrarı')
+        parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+        parser.add_argument('--output-dir', default=str(settings.BASE_DIR / 'benchmarks' / 'results'))
+        parser.add_argument('--no-save', action='store_true', help='Sonucu dosyaya kaydetme')
+        parser.add_argument('--compare', help='Karşılaştırılacak önceki sonuç dosyası')
+        parser.add_argument('--tolerance', type=float, default=0.2, help='İzin verilen p95 artışı (0.2 = %%20)')
+        parser.add_argument('--fail-on-regression', action='store_true')
+
+    def handle(self, *args, **options):
+        started_at = timezone.now().strftime('%Y%m%dT%H%M%S')
+
+        # Giriş sınırlamaları ölçümü bozmasın diye benchmark sırasında kapatılır
+        rest_framework = {**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {}}
+
+        with override_settings(REST_FRAMEWORK=rest_framework), transaction.atomic():
+            self.stdout.write(f"Veri üretiliyor ({options['profile']}: {PROFILES[options['profile']]} satır/kullanıcı)...")
+            seed_started = time.perf_counter()
+            users = generate_dataset(options['profile'], options['users'], options['background_users'])
+            self.stdout.write(f'Veri üretildi ({time.perf_counter() - seed_started:.1f} sn).')
+
+            stats = {}
+            for index, user in enumerate(users):
+                runner = ScenarioRunner(user, seed=index)
+                for _ in range(options['iterations']):
+                    for scenario in options['scenarios']:
+                        getattr(runner, scenario)()
+                for name, endpoint in runner.stats.items():
+                    merged = stats.setdefault(name, endpoint)
+                    if merged is not endpoint:
+                        merged.latencies.extend(endpoint.latencies)
+                        merged.queries.extend(endpoint.queries)
+                        merged.errors += endpoint.errors
+
+            transaction.set_rollback(True)
+
+        report = build_report(stats, {
+            'started_at': started_at,
+            'vendor': connection.vendor,
+            'profile': options['profile'],
+            'users': options['users'],
+            'iterations': options['iterations'],
+            'scenarios': options['scenarios'],
+        })
+        self.stdout.write(format_report(report))
+
+        if not options['no_save']:
+            path = save_report(report, options['output_dir'])
+            self.stdout.write(f'Sonuç kaydedildi: {path}')
+
+        if options['compare']:
+            with open(options['compare']) as baseline_file:
+                regressions = compare_reports(report, json.load(baseline_file), options['tolerance'])
+            for regression in regressions:
+                self.stdout.write(self.style.WARNING(f'Gerileme: {regression}'))
+            if regressions and options['fail_on_regression']:
+                raise CommandError(f'{len(regressions)} endpoint\'te gerileme tespit edildi.')
+            if not regressions:
+                self.stdout.write(self.style.SUCCESS('Gerileme yok.'))
@@ -0,0 +1,81 @@
+import json
+from pathlib import Path
+
+
+def percentile(values, fraction):
+    """
+    Doğrusal enterpolasyonla yüzdelik değer
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def build_report(stats, meta):
+    """
+    Endpoint ölçümlerinden kaydedilebilir rapor sözlüğü oluştur
+    """
+    endpoints = {}
+    for name, endpoint in sorted(stats.items()):
+        total = sum(endpoint.latencies)
+        count = len(endpoint.latencies)
+        endpoints[name] = {
+            'requests': count,
+            'errors': endpoint.errors,
+            'throughput': count / total if total else None,
+            'p50_ms': percentile(endpoint.latencies, 0.50) * 1000,
+            'p95_ms': percentile(endpoint.latencies, 0.95) * 1000,
+            'p99_ms': percentile(endpoint.latencies, 0.99) * 1000,
+            'queries_per_request': sum(endpoint.queries) / count,
+        }
+    return {'meta': meta, 'endpoints': endpoints}
+
+
+def format_report(report):
+    lines = [
+        f"{'endpoint':<20} {'istek':>6} {'hata':>5} {'istek/sn':>9} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'sorgu/istek':>12}"
+    ]
+    for name, row in report['endpoints'].items():
+        lines.append(
+            f"{name:<20} {row['requests']:>6} {row['errors']:>5} {row['throughput']:>9.1f} "
+            f"{row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f} {row['p99_ms']:>8.2f} "
+            f"{row['queries_per_request']:>12.1f}"
+        )
+    return '\n'.join(lines)
+
+
+def save_report(report, directory):
+    """
+    Raporu <tarih>-<veritabanı>-<profil>.json adıyla kaydet
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    meta = report['meta']
+    path = directory / f"{meta['started_at']}-{meta['vendor']}-{meta['profile']}.json"
+    path.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    return path
+
+
+def compare_reports(report, baseline, tolerance):
+    """
+    Önceki sonuca göre p95 gecikmesi toleransı aşan veya sorgu sayısı artan endpoint'leri döndür
+    """
+    regressions = []
+    for name, row in report['endpoints'].items():
+        previous = baseline['endpoints'].get(name)
+        if previous is None:
+            continue
+        if row['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p95 {previous['p95_ms']:.2f} ms -> {row['p95_ms']:.2f} ms"
+            )
+        if row['queries_per_request'] > previous['queries_per_request']:
+            regressions.append(
+                f"{name}: sorgu/istek {previous['queries_per_request']:.1f} -> {row['queries_per_request']:.1f}"
+            )
+    return regressions
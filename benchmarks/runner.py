@@ -0,0 +1,109 @@
+import random
+import time
+from datetime import timedelta
+
+from django.db import connection
+from django.test import Client
+from django.utils import timezone
+
+from .data import BENCHMARK_PASSWORD
+
+
+class EndpointStats:
+    """
+    Tek bir endpoint için gecikme ve sorgu sayısı ölçümleri
+    """
+    def __init__(self, name):
+        self.name = name
+        self.latencies = []
+        self.queries = []
+        self.errors = 0
+
+
+class ScenarioRunner:
+    """
+    static/js/app.js akışlarını uygulama içi test istemcisiyle çalıştırır.
+
+    Her istek tüm middleware zincirinden geçer; süre ve sorgu sayısı
+    URL adına göre (todo-list-create, event-list-create, ...) toplanır.
+    """
+    def __init__(self, user, seed=0):
+        self.user = user
+        self.client = Client(HTTP_HOST='localhost')
+        self.random = random.Random(seed)
+        self.stats = {}
+        self.access_token = None
+        self.todo_ids = list(user.todos.values_list('pk', flat=True)[:500])
+
+    def request(self, name, method, path, data=None):
+        stats = self.stats.setdefault(name, EndpointStats(name))
+        queries = []
+
+        def count_queries(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        headers = {}
+        if self.access_token:
+            headers['HTTP_AUTHORIZATION'] = f'Bearer {self.access_token}'
+
+        with connection.execute_wrapper(count_queries):
+            started = time.perf_counter()
+            if method == 'get':
+                response = self.client.get(path, data, **headers)
+            else:
+                response = self.client.post(path, data, content_type='application/json', **headers)
+            elapsed = time.perf_counter() - started
+
+        stats.latencies.append(elapsed)
+        stats.queries.append(len(queries))
+        if response.status_code >= 400:
+            stats.errors += 1
+        return response
+
+    def login(self):
+        response = self.request('login', 'post', '/api/auth/login/', {
+            'email': self.user.email,
+            'password': BENCHMARK_PASSWORD,
+        })
+        if response.status_code == 200:
+            self.access_token = response.json()['access']
+
+    def load_data(self):
+        if not self.access_token:
+            self.login()
+        self.request('profile', 'get', '/api/auth/profile/')
+        self.request('todo-list-create', 'get', '/api/todos/')
+        self.request('event-list-create', 'get', '/api/calendar/events/')
+
+    def toggle(self):
+        if not self.access_token:
+            self.login()
+        todo_id = self.random.choice(self.todo_ids)
+        self.request('todo-toggle', 'post', f'/api/todos/{todo_id}/toggle/')
+
+    def add_todo(self):
+        if not self.access_token:
+            self.login()
+        self.request('todo-create', 'post', '/api/todos/', {
+            'title': 'Benchmark todo',
+            'description': 'Senaryo ile eklendi',
+            'priority': 'medium',
+            'due_date': (timezone.now() + timedelta(days=2)).isoformat(),
+            'is_important': False,
+        })
+
+    def add_event(self):
+        if not self.access_token:
+            self.login()
+        start_time = timezone.now() + timedelta(hours=self.random.randint(1, 240))
+        self.request('event-create', 'post', '/api/calendar/events/', {
+            'title': 'Benchmark etkinlik',
+            'description': 'Senaryo ile eklendi',
+            'start_time': start_time.isoformat(),
+            'end_time': (start_time + timedelta(hours=1)).isoformat(),
+            'location': 'İstanbul',
+        })
+
+
+SCENARIOS = ('login', 'load_data', 'toggle', 'add_todo', 'add_event')
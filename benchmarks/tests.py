@@ -0,0 +1,66 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from .report import compare_reports, percentile
+
+
+@override_settings(PASSWORD_HASH_ITERATIONS=1000)
+class RunBenchmarksCommandTest(TestCase):
+    """
+    Benchmark komutu ve rapor karşılaştırma testleri
+    """
+    def test_run_saves_report(self):
+        """
+        Komut tüm senaryoları hatasız çalıştırıp sonucu kaydetmeli
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            call_command(
+                'run_benchmarks', profile='small', iterations=2, background_users=2,
+                output_dir=directory, stdout=StringIO()
+            )
+            files = list(Path(directory).glob('*.json'))
+            self.assertEqual(len(files), 1)
+            report = json.loads(files[0].read_text())
+
+        for name in ('login', 'profile', 'todo-list-create', 'event-list-create',
+                     'todo-toggle', 'todo-create', 'event-create'):
+            self.assertIn(name, report['endpoints'])
+            self.assertEqual(report['endpoints'][name]['errors'], 0)
+            self.assertGreater(report['endpoints'][name]['queries_per_request'], 0)
+
+    def test_compare_reports_flags_regressions(self):
+        """
+        p95 toleransı aşıldığında veya sorgu sayısı arttığında gerileme bildirilmeli
+        """
+        baseline = {'endpoints': {'todo-list-create': {'p95_ms': 10.0, 'queries_per_request': 3.0}}}
+        report = {'endpoints': {'todo-list-create': {'p95_ms': 11.0, 'queries_per_request': 3.0}}}
+        self.assertEqual(compare_reports(report, baseline, tolerance=0.2), [])
+
+        report['endpoints']['todo-list-create'].update(p95_ms=13.0, queries_per_request=23.0)
+        self.assertEqual(len(compare_reports(report, baseline, tolerance=0.2)), 2)
+
+    def test_percentile(self):
+        """
+        Yüzdelik değer doğrusal enterpolasyonla hesaplanmalı
+        """
+        values = list(range(1, 101))
+        self.assertAlmostEqual(percentile(values, 0.5), 50.5)
+        self.assertAlmostEqual(percentile(values, 0.99), 99.01)
+        self.assertIsNone(percentile([], 0.5))
+
+
+class BenchmarkDbConnectionsCommandTest(TestCase):
+    """
+    Bağlantı kurulum benchmark komutu testleri
+    """
+    def test_refuses_to_run_inside_transaction(self):
+        """
+        Transaction içindeki bağlantı kapatılmamalı; komut hata vermeli
+        """
+        with self.assertRaises(CommandError):
+            call_command('benchmark_db_connections', iterations=1, stdout=StringIO())
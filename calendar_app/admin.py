@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from django.utils import timezone
-from .models import Calendar, Event, EventParticipant, EventAttachment, EventReminder
+from .models import ArchivedEvent, Calendar, Event, EventParticipant, EventAttachment, EventReminder
 
 
 @admin.register(Calendar)
@@ -125,3 +125,20 @@ class EventReminderAdmin(admin.ModelAdmin):
     list_filter = ('is_sent', 'reminder_time', 'event__user')
     search_fields = ('event__title',)
     ordering = ('reminder_time',)
+
+
+@admin.register(ArchivedEvent)
+class ArchivedEventAdmin(admin.ModelAdmin):
+    """
+    Arşivlenmiş etkinlikler admin paneli (salt okunur)
+    """
+    list_display = ('title', 'calendar', 'user', 'start_time', 'end_time', 'archived_at')
+    list_filter = ('event_type', 'archived_at', 'user')
+    search_fields = ('title', 'description', 'location', 'user__username', 'user__email')
+    ordering = ('-archived_at',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
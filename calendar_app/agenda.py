@@ -0,0 +1,62 @@
+"""
+Kullanıcının ajandası: sahibi olduğu ve katılımcısı olduğu etkinlikler.
+
+İki kol tek bir UNION ALL sorgusunda birleşir; sahip kolu
+`event_user_start_idx` (user, start_time), katılımcı kolu katılımcı
+tablosunun user index'i üzerinden taranır. Kullanıcı hem sahip hem
+katılımcıysa etkinlik yalnızca sahip kolunda yer alır.
+"""
+from django.db.models import BooleanField, CharField, Exists, F, OuterRef, Q, Value
+
+from .models import Event, EventParticipant
+
+# Ajanda en fazla bu kadar gün kapsar
+AGENDA_DEFAULT_DAYS = 7
+AGENDA_MAX_DAYS = 31
+
+
+def participation(user):
+    """
+    Kullanıcının etkinliğe katılımcı olup olmadığı (aynı sorguda alt sorgu)
+    """
+    return Exists(EventParticipant.objects.filter(event=OuterRef('pk'), user=user))
+
+
+def visible_events(user):
+    """
+    Sahibi veya katılımcısı olunan etkinlikler.
+
+    Satırlar `is_participant` ile işaretlenir; IsEventOwnerOrParticipant bu
+    değeri okuyarak nesne başına sorgu yapmaz.
+    """
+    return Event.objects.annotate(is_participant=participation(user)).filter(
+        Q(user=user) | Q(is_participant=True)
+    )
+
+
+def agenda_queryset(user, start, end, serializer, fields=None):
+    """
+    [start, end) aralığında başlayan ajanda satırları (.values()), başlangıca göre sıralı.
+
+    Her satır `is_owner`, `is_organizer` ve `response_status` (sahip için None) taşır.
+    """
+    extra = ('start_time', 'id')
+    owned = serializer.values(
+        Event.objects.filter(user=user, start_time__gte=start, start_time__lt=end).order_by(),
+        fields, extra,
+    ).annotate(
+        is_owner=Value(True, output_field=BooleanField()),
+        is_organizer=Value(True, output_field=BooleanField()),
+        response_status=Value(None, output_field=CharField()),
+    )
+    # Katılım alanları filtredeki katılımcı join'inden okunur (etkinlik başına tek satır)
+    participating = serializer.values(
+        Event.objects.filter(participants__user=user, start_time__gte=start, start_time__lt=end)
+        .exclude(user=user).order_by(),
+        fields, extra,
+    ).annotate(
+        is_owner=Value(False, output_field=BooleanField()),
+        is_organizer=F('participants__is_organizer'),
+        response_status=F('participants__response_status'),
+    )
+    return owned.union(participating, all=True).order_by('start_time', 'id')
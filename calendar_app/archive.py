@@ -0,0 +1,68 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from todocalendar_project.archive import archive_in_batches, get_options
+from .feeds import invalidate_feed
+from .models import ArchivedEvent, Event
+
+
+def archivable_events(days=None, now=None):
+    """
+    `days` günden daha önce bitmiş, tekrarlamayan etkinlikler
+    """
+    days = get_options()['EVENT_DAYS'] if days is None else days
+    cutoff = (now or timezone.now()) - timedelta(days=days)
+    return Event.objects.filter(is_recurring=False, end_time__lt=cutoff)
+
+
+def snapshot_event(event):
+    """
+    Etkinliğin katılımcı, ek ve hatırlatıcı bilgilerini arşiv JSON'una çevir
+    """
+    return {
+        'participants': [
+            {
+                'user': participant.user_id,
+                'is_organizer': participant.is_organizer,
+                'response_status': participant.response_status,
+            }
+            for participant in event.participants.all()
+        ],
+        'attachments': [
+            {
+                'filename': attachment.filename,
+                'file': attachment.file.name,
+                'file_size': attachment.file_size,
+                'sha256': attachment.blob.sha256 if attachment.blob_id else None,
+                'uploaded_by': attachment.uploaded_by_id,
+                'uploaded_at': attachment.uploaded_at.isoformat(),
+            }
+            for attachment in event.attachments.all()
+        ],
+        'reminders': [
+            {
+                'reminder_type': reminder.reminder_type,
+                'reminder_time': reminder.reminder_time.isoformat(),
+                'is_sent': reminder.is_sent,
+            }
+            for reminder in event.reminders.all()
+        ],
+    }
+
+
+def invalidate_batch_feeds(batch):
+    """
+    Partide etkinliği arşivlenen takvimlerin yayınını commit'te bir kez geçersiz kıl
+    """
+    invalidate_feed(*{event.calendar_id for event in batch})
+
+
+def archive_events(days=None, **options):
+    """
+    Geçmiş tekrarlamayan etkinlikleri ArchivedEvent tablosuna taşı
+    """
+    queryset = archivable_events(days).prefetch_related('participants', 'attachments__blob', 'reminders')
+    return archive_in_batches(
+        queryset, ArchivedEvent, snapshot_event, after_delete=invalidate_batch_feeds, **options,
+    )
@@ -0,0 +1,210 @@
+"""
+Herkese açık takvimlerin abone olunabilir iCalendar (.ics) yayını.
+
+Yayın bir kez üretilir ve ETag'iyle birlikte takvimin `updated_at` değeriyle
+anahtarlanmış önbellek girdisinde tutulur. Etkinlikleri değişince takvimin
+`updated_at`'i transaction commit edilince, değişen her takvim için tek
+UPDATE ile ilerletilir; sürüm veritabanından okunduğu için işlem başına
+(LocMem) önbellekle de tüm worker'lar değişikliği hemen görür. Tüm gün
+etkinlikleri takvim sahibinin zaman diliminde tarihe çevrilir. Sık yoklayan
+aboneler If-None-Match ile geldiğinde yanıt tek bir birincil anahtar
+sorgusuyla 304 olur.
+"""
+import datetime
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from todocalendar_project.dates import user_timezone
+from .models import Calendar, Event
+
+CALENDAR_FEEDS_DEFAULTS = {
+    # Önbellekteki yayının en uzun ömrü (değişiklikte zaten geçersiz olur)
+    'CACHE_SECONDS': 24 * 60 * 60,
+    # Abonelere ve ara önbelleklere verilen Cache-Control max-age
+    'MAX_AGE': 300,
+    # Bu kadar gün önce bitmiş (tekrarlamayan) etkinlikler yayına girmez
+    'PAST_DAYS': 90,
+}
+
+# recurrence_pattern -> RRULE FREQ
+RRULE_FREQUENCIES = {
+    'daily': 'DAILY',
+    'weekly': 'WEEKLY',
+    'monthly': 'MONTHLY',
+    'yearly': 'YEARLY',
+}
+
+FEED_FIELDS = (
+    'id', 'title', 'description', 'location', 'start_time', 'end_time', 'is_all_day',
+    'is_recurring', 'recurrence_pattern', 'recurrence_end_date', 'updated_at',
+)
+
+
+def get_options():
+    return {**CALENDAR_FEEDS_DEFAULTS, **getattr(settings, 'CALENDAR_FEEDS', {})}
+
+
+def feed_cache_key(calendar_id, version, tz):
+    # Sahip zaman dilimini değiştirirse tüm gün tarihleri de değişir
+    return f'calendar-feed:{calendar_id}:{version.timestamp()}:{tz}'
+
+
+def escape_text(value):
+    """
+    RFC 5545 TEXT değeri: ters bölü, noktalı virgül, virgül ve satır sonları kaçırılır
+    """
+    return (
+        (value or '').replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+        .replace('\r\n', '\\n').replace('\n', '\\n')
+    )
+
+
+def fold(line):
+    """
+    75 oktetten uzun satırları boşlukla başlayan devam satırlarına böl
+    """
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line
+    parts, current = [], b''
+    for char in line:
+        size = len(char.encode())
+        if len(current) + size > (75 if not parts else 74):
+            parts.append(current.decode())
+            current = b''
+        current += char.encode()
+    parts.append(current.decode())
+    return '\r\n '.join(parts)
+
+
+def format_utc(value):
+    return value.astimezone(datetime.timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def event_lines(row, tz):
+    lines = [
+        'BEGIN:VEVENT',
+        f"UID:event-{row['id']}@todocalendar",
+        f"DTSTAMP:{format_utc(row['updated_at'])}",
+    ]
+    if row['is_all_day']:
+        start_date = timezone.localtime(row['start_time'], tz).date()
+        local_end = timezone.localtime(row['end_time'], tz)
+        # DTEND gününü kapsamaz: gün içinde biten etkinlik bitiş gününü de içerir
+        end_date = local_end.date() + datetime.timedelta(days=local_end.time() != datetime.time.min)
+        end_date = max(end_date, start_date + datetime.timedelta(days=1))
+        lines += [f'DTSTART;VALUE=DATE:{start_date:%Y%m%d}', f'DTEND;VALUE=DATE:{end_date:%Y%m%d}']
+    else:
+        lines += [f"DTSTART:{format_utc(row['start_time'])}", f"DTEND:{format_utc(row['end_time'])}"]
+
+    lines.append(f"SUMMARY:{escape_text(row['title'])}")
+    if row['description']:
+        lines.append(f"DESCRIPTION:{escape_text(row['description'])}")
+    if row['location']:
+        lines.append(f"LOCATION:{escape_text(row['location'])}")
+
+    frequency = RRULE_FREQUENCIES.get(row['recurrence_pattern'] or '') if row['is_recurring'] else None
+    if frequency:
+        rule = f'RRULE:FREQ={frequency}'
+        if row['recurrence_end_date']:
+            rule += f";UNTIL={format_utc(row['recurrence_end_date'])}"
+        lines.append(rule)
+    lines.append('END:VEVENT')
+    return lines
+
+
+def feed_events(calendar, now=None):
+    """
+    Yayına giren etkinlikler: özel olmayanlar; yakın geçmişte bitenler veya hâlâ tekrarlayanlar
+    """
+    cutoff = (now or timezone.now()) - datetime.timedelta(days=get_options()['PAST_DAYS'])
+    return Event.objects.filter(calendar=calendar, is_private=False).filter(
+        Q(end_time__gte=cutoff)
+        | (Q(is_recurring=True) & (Q(recurrence_end_date__isnull=True) | Q(recurrence_end_date__gte=cutoff)))
+    ).order_by('start_time', 'pk').values(*FEED_FIELDS)
+
+
+def render_feed(calendar, rows, tz=None):
+    """
+    Takvimi ve etkinlik satırlarını iCalendar metnine çevir (CRLF satır sonlu bayt)
+    """
+    tz = tz or timezone.get_current_timezone()
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//TodoCalendar//TR',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f'X-WR-CALNAME:{escape_text(calendar.name)}',
+        f'X-WR-TIMEZONE:{tz}',
+    ]
+    if calendar.description:
+        lines.append(f'X-WR-CALDESC:{escape_text(calendar.description)}')
+    for row in rows:
+        lines += event_lines(row, tz)
+    lines.append('END:VCALENDAR')
+    return ('\r\n'.join(fold(line) for line in lines) + '\r\n').encode()
+
+
+def build_feed(calendar_id):
+    """
+    Herkese açık takvimin yayını ve ETag'i: önbellekten, yoksa üretip önbelleğe yazarak.
+
+    Takvim yoksa veya herkese açık değilse None döner.
+    """
+    calendar = (
+        Calendar.objects.filter(pk=calendar_id, is_public=True)
+        .select_related('user').only('name', 'description', 'updated_at', 'user__timezone').first()
+    )
+    if calendar is None:
+        return None
+    tz = user_timezone(calendar.user)
+    key = feed_cache_key(calendar_id, calendar.updated_at, tz)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    body = render_feed(calendar, feed_events(calendar), tz)
+    feed = {'etag': f'"{hashlib.sha256(body).hexdigest()[:32]}"', 'body': body}
+    cache.set(key, feed, get_options()['CACHE_SECONDS'])
+    return feed
+
+
+class PendingInvalidation:
+    """
+    Bir transaction içinde yayını değişen takvimler; commit'te tek UPDATE ile ilerletilir
+    """
+    def __init__(self):
+        self.calendar_ids = set()
+        self.flushed = False
+
+    def __call__(self):
+        self.flushed = True
+        Calendar.objects.filter(pk__in=self.calendar_ids).update(updated_at=timezone.now())
+
+
+def invalidate_feed(*calendar_ids):
+    """
+    Takvimlerin updated_at'ini ilerleterek önbellekteki yayınlarını geçersiz kıl.
+
+    Kimlikler bağlantı üzerinde toplanır ve transaction commit edilince her
+    takvim bir kez güncellenir (transaction dışında hemen). Toplu silme gibi
+    sinyal göndermeyen yollar bu fonksiyonu kendileri çağırmalıdır.
+    """
+    calendar_ids = {calendar_id for calendar_id in calendar_ids if calendar_id}
+    if not calendar_ids:
+        return
+    connection = transaction.get_connection()
+    pending = getattr(connection, 'pending_feed_invalidation', None)
+    # Geri alınan transaction'ın (veya savepoint'in) commit kancası silinmiştir
+    if pending is not None and not pending.flushed and any(hook[1] is pending for hook in connection.run_on_commit):
+        pending.calendar_ids.update(calendar_ids)
+        return
+    pending = connection.pending_feed_invalidation = PendingInvalidation()
+    pending.calendar_ids.update(calendar_ids)
+    transaction.on_commit(pending)
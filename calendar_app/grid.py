@@ -0,0 +1,208 @@
+"""
+Ay / hafta takvim ızgarası: etkinlikler sunucuda yerel gün kutularına
+yerleştirilir, böylece istemci yalnızca çizim yapar.
+
+- Tekrarlayan etkinlikler pencere içindeki tekrarlarına açılır (yerel saatle).
+- Birden fazla güne yayılan etkinlikler gün gün parçalara bölünür.
+- Aynı günde çakışan saatli parçalara aralık bölümleme (interval
+  partitioning) ile sütun atanır; `columns` parçanın ait olduğu çakışma
+  grubundaki sütun sayısıdır (genişlik = 1 / columns).
+"""
+import datetime
+import heapq
+
+from django.db.models import Q
+from django.utils import timezone
+
+from todocalendar_project.dates import local_midnight
+
+from .models import Event
+from .partitioning import add_months
+
+MONTH = 'month'
+WEEK = 'week'
+VIEWS = (MONTH, WEEK)
+
+# recurrence_pattern -> (gün, ay) adımı; tanınmayan desen tek seferlik kabul edilir
+RECURRENCE_STEPS = {
+    'daily': (1, 0),
+    'weekly': (7, 0),
+    'monthly': (0, 1),
+    'yearly': (0, 12),
+}
+
+GRID_FIELDS = (
+    'id', 'title', 'location', 'calendar', 'calendar__color', 'start_time', 'end_time',
+    'is_all_day', 'is_recurring', 'recurrence_pattern', 'recurrence_end_date',
+)
+
+
+def grid_days(view, day):
+    """
+    Izgaradaki yerel günler: hafta görünümü Pazartesi-Pazar, ay görünümü ayı
+    kapsayan tam haftalar
+    """
+    if view == WEEK:
+        first = day - datetime.timedelta(days=day.weekday())
+        last = first + datetime.timedelta(days=6)
+    else:
+        month_first = day.replace(day=1)
+        month_last = add_months(month_first, 1) - datetime.timedelta(days=1)
+        first = month_first - datetime.timedelta(days=month_first.weekday())
+        last = month_last + datetime.timedelta(days=6 - month_last.weekday())
+    return [first + datetime.timedelta(days=offset) for offset in range((last - first).days + 1)]
+
+
+def shift(value, days, months, count, tz):
+    """
+    Yerel saat korunarak count adım ileri (aylık tekrarda gün ay sonuna kırpılır)
+    """
+    local = timezone.localtime(value, tz).replace(tzinfo=None)
+    if months:
+        index = local.year * 12 + local.month - 1 + months * count
+        year, month = divmod(index, 12)
+        month += 1
+        last_day = (add_months(datetime.date(year, month, 1), 1) - datetime.timedelta(days=1)).day
+        local = local.replace(year=year, month=month, day=min(local.day, last_day))
+    else:
+        local += datetime.timedelta(days=days * count)
+    return timezone.make_aware(local, tz)
+
+
+def occurrences(row, window_start, window_end, tz):
+    """
+    Etkinliğin pencereyle kesişen (başlangıç, bitiş) tekrarları
+    """
+    start, end = row['start_time'], row['end_time']
+    step = RECURRENCE_STEPS.get(row['recurrence_pattern'] or '') if row['is_recurring'] else None
+    if step is None:
+        if start < window_end and end > window_start:
+            yield start, end
+        return
+
+    days, months = step
+    duration = end - start
+    until = row['recurrence_end_date']
+    # Pencereden çok önce başlayan serilerde ilk adaylara doğrudan atla
+    if days:
+        count = max((window_start - end).days // days, 0)
+    else:
+        local_start = timezone.localtime(start, tz)
+        local_window = timezone.localtime(window_start, tz)
+        elapsed = (local_window.year - local_start.year) * 12 + local_window.month - local_start.month
+        count = max(elapsed // months - 1, 0)
+
+    while True:
+        occurrence = shift(start, days, months, count, tz)
+        if occurrence >= window_end or (until is not None and occurrence > until):
+            return
+        if occurrence + duration > window_start:
+            yield occurrence, occurrence + duration
+        count += 1
+
+
+def split_by_day(start, end, tz, window_start, window_end):
+    """
+    Tekrarın pencere içindeki kısmını yerel gün sınırlarında parçala:
+    [(gün, parça başı, parça sonu), ...]
+    """
+    day = timezone.localtime(max(start, window_start), tz).date()
+    segments = []
+    while True:
+        next_midnight = local_midnight(day + datetime.timedelta(days=1), tz)
+        segments.append((day, max(start, local_midnight(day, tz)), min(end, next_midnight)))
+        if end <= next_midnight or next_midnight >= window_end:
+            return segments
+        day += datetime.timedelta(days=1)
+
+
+def assign_columns(segments):
+    """
+    Aralık bölümleme: başlangıca göre sıralı parçalara en küçük boş sütunu ver.
+
+    Çakışma grubu (zincirleme kesişen parçalar) kapanınca gruptaki her
+    parçanın `columns` değeri grubun kullandığı sütun sayısı olur.
+    """
+    segments.sort(key=lambda item: (item['segment_start'], -item['segment_end'].timestamp()))
+    active = []   # (bitiş, sütun) min-heap
+    free = []     # boşalan sütunlar min-heap
+    group, group_columns = [], 0
+
+    for segment in segments:
+        while active and active[0][0] <= segment['segment_start']:
+            _, column = heapq.heappop(active)
+            heapq.heappush(free, column)
+        if not active:
+            for member in group:
+                member['columns'] = group_columns
+            group, group_columns, free = [], 0, []
+
+        column = heapq.heappop(free) if free else group_columns
+        group_columns = max(group_columns, column + 1)
+        segment['column'] = column
+        heapq.heappush(active, (segment['segment_end'], column))
+        group.append(segment)
+
+    for member in group:
+        member['columns'] = group_columns
+    return segments
+
+
+def build_grid(user, view, day, tz=None):
+    """
+    Kullanıcının etkinliklerini ızgara günlerine yerleştir
+    """
+    tz = tz or timezone.get_current_timezone()
+    days = grid_days(view, day)
+    window_start = local_midnight(days[0], tz)
+    window_end = local_midnight(days[-1] + datetime.timedelta(days=1), tz)
+
+    rows = Event.objects.filter(
+        Q(start_time__lt=window_end, end_time__gt=window_start)
+        | Q(is_recurring=True, start_time__lt=window_end),
+        user=user,
+    ).exclude(
+        is_recurring=True, recurrence_end_date__lt=window_start
+    ).order_by('start_time').values(*GRID_FIELDS)
+
+    buckets = {value: {'timed': [], 'all_day': []} for value in days}
+    for row in rows:
+        for start, end in occurrences(row, window_start, window_end, tz):
+            for segment_day, segment_start, segment_end in split_by_day(start, end, tz, window_start, window_end):
+                segment = {
+                    'id': row['id'],
+                    'title': row['title'],
+                    'location': row['location'],
+                    'calendar': row['calendar'],
+                    'color': row['calendar__color'],
+                    'is_all_day': row['is_all_day'],
+                    'is_recurring': row['is_recurring'],
+                    'start_time': start,
+                    'end_time': end,
+                    'segment_start': segment_start,
+                    'segment_end': segment_end,
+                    'continues_before': segment_start > start,
+                    'continues_after': segment_end < end,
+                }
+                buckets[segment_day]['all_day' if row['is_all_day'] else 'timed'].append(segment)
+
+    def local_iso(value):
+        return timezone.localtime(value, tz).isoformat()
+
+    result = []
+    for value in days:
+        bucket = buckets[value]
+        timed = assign_columns(bucket['timed'])
+        for segment in timed + bucket['all_day']:
+            for key in ('start_time', 'end_time', 'segment_start', 'segment_end'):
+                segment[key] = local_iso(segment[key])
+        result.append({'date': value.isoformat(), 'all_day': bucket['all_day'], 'events': timed})
+
+    return {
+        'view': view,
+        'date': day.isoformat(),
+        'timezone': str(tz),
+        'start': days[0].isoformat(),
+        'end': days[-1].isoformat(),
+        'days': result,
+    }
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from calendar_app.archive import archivable_events, archive_events
+from todocalendar_project.archive import get_options
+
+
+class Command(BaseCommand):
+    """
+    Geçmiş, tekrarlamayan etkinlikleri partiler halinde arşiv tablosuna taşır.
+    Her parti ayrı bir transaction'dır; yarıda kesilen çalıştırma tekrar
+    başlatıldığında kaldığı yerden devam eder.
+    """
+    help = 'Geçmiş tekrarlamayan etkinlikleri arşivler'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=get_options()['EVENT_DAYS'], help='Bu kadar gün önce bitenler')
+        parser.add_argument('--batch-size', type=int, default=get_options()['BATCH_SIZE'])
+        parser.add_argument('--max-batches', type=int, help='En fazla çalıştırılacak parti sayısı')
+        parser.add_argument('--pause', type=float, default=0, help='Partiler arası bekleme (sn)')
+        parser.add_argument('--dry-run', action='store_true', help='Sadece arşivlenecek kayıt sayısını göster')
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            self.stdout.write(f"{archivable_events(options['days']).count()} etkinlik arşivlenecek.")
+            return
+
+        moved = archive_events(
+            options['days'],
+            batch_size=options['batch_size'],
+            max_batches=options['max_batches'],
+            pause=options['pause'],
+            progress=lambda moved, last_id: self.stdout.write(f'{moved} etkinlik taşındı (son id: {last_id})'),
+        )
+        self.stdout.write(self.style.SUCCESS(f'Toplam {moved} etkinlik arşivlendi.'))
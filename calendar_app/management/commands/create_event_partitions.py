@@ -0,0 +1,37 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from calendar_app import partitioning
+
+
+class Command(BaseCommand):
+    """
+    Bölümlenmiş Event tablosu için gelecek ayların bölümlerini oluşturur.
+    Cron ile periyodik (ör. günlük) çalıştırılmalıdır; eksik olmayan bölümler
+    için bir şey yapmaz.
+    """
+    help = 'Event tablosunun gelecek aylık bölümlerini oluşturur'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months-ahead', type=int, default=12)
+
+    def handle(self, *args, **options):
+        try:
+            partitioning.require_postgresql()
+        except ImproperlyConfigured as exc:
+            raise CommandError(str(exc))
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            if partitioning.is_partitioned(cursor):
+                parent = partitioning.TABLE
+            elif partitioning.table_exists(cursor, partitioning.PARTITIONED_TABLE):
+                parent = partitioning.PARTITIONED_TABLE
+            else:
+                raise CommandError('Event tablosu bölümlenmemiş; önce partition_events prepare çalıştırın.')
+            created = partitioning.ensure_partitions(cursor, parent, timezone.now(), options['months_ahead'])
+
+        for name in created:
+            self.stdout.write(f'{name} oluşturuldu.')
+        self.stdout.write(self.style.SUCCESS(f'{len(created)} yeni bölüm oluşturuldu.'))
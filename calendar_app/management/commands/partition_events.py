@@ -0,0 +1,64 @@
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from calendar_app import partitioning
+
+
+class Command(BaseCommand):
+    """
+    Event tablosunu çevrimiçi olarak aylık aralık bölümlerine taşır (yalnızca
+    PostgreSQL). Adımlar sırayla çalıştırılır: prepare -> backfill -> swap.
+    Ayrıntılar için calendar_app/partitioning.py.
+    """
+    help = 'Event tablosunu start_time aylarına göre bölümlenmiş tabloya taşır'
+
+    def add_arguments(self, parser):
+        parser.add_argument('step', choices=['prepare', 'backfill', 'swap'])
+        parser.add_argument('--months-ahead', type=int, default=12, help='Önceden oluşturulacak gelecek ay sayısı')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--start-id', type=int, default=0, help='Backfill bu id\'den sonra devam eder')
+        parser.add_argument('--pause', type=float, default=0, help='Partiler arası bekleme (sn)')
+
+    def handle(self, *args, **options):
+        try:
+            partitioning.require_postgresql()
+        except ImproperlyConfigured as exc:
+            raise CommandError(str(exc))
+        getattr(self, options['step'])(options)
+
+    def prepare(self, options):
+        with transaction.atomic(), connection.cursor() as cursor:
+            if partitioning.is_partitioned(cursor):
+                raise CommandError('Event tablosu zaten bölümlenmiş.')
+            created = partitioning.prepare(cursor, options['months_ahead'])
+        self.stdout.write(self.style.SUCCESS(
+            f'{partitioning.PARTITIONED_TABLE} hazır ({len(created)} bölüm); yeni yazmalar yansıtılıyor.'
+        ))
+
+    def backfill(self, options):
+        last_id, copied_batches = options['start_id'], 0
+        while True:
+            with transaction.atomic(), connection.cursor() as cursor:
+                batch_last_id = partitioning.backfill_batch(cursor, last_id, options['batch_size'])
+            if batch_last_id is None:
+                break
+            last_id = batch_last_id
+            copied_batches += 1
+            self.stdout.write(f'{copied_batches}. parti kopyalandı (son id: {last_id}; devam için --start-id {last_id})')
+            if options['pause']:
+                time.sleep(options['pause'])
+        self.stdout.write(self.style.SUCCESS('Backfill tamamlandı.'))
+
+    def swap(self, options):
+        try:
+            with transaction.atomic(), connection.cursor() as cursor:
+                rows = partitioning.swap(cursor)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(self.style.SUCCESS(
+            f'{rows} etkinlik bölümlenmiş tabloda. Eski tablo {partitioning.UNPARTITIONED_TABLE} '
+            f'olarak saklandı; doğrulamadan sonra silinebilir.'
+        ))
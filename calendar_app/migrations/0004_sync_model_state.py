@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:12
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendar_app', '0003_auto_20250914_2205'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='event',
+            options={'ordering': ['start_time'], 'verbose_name': 'Etkinlik', 'verbose_name_plural': 'Etkinlikler'},
+        ),
+        migrations.AlterModelOptions(
+            name='eventreminder',
+            options={'verbose_name': 'Etkinlik Hatırlatıcısı', 'verbose_name_plural': 'Etkinlik Hatırlatıcıları'},
+        ),
+        migrations.RemoveField(
+            model_name='event',
+            name='send_notification',
+        ),
+        migrations.AddField(
+            model_name='eventreminder',
+            name='reminder_type',
+            field=models.CharField(choices=[('email', 'E-posta'), ('push', 'Push Bildirimi'), ('sms', 'SMS')], default='email', max_length=20, verbose_name='Hatırlatıcı Türü'),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='reminder_minutes',
+            field=models.PositiveIntegerField(default=15, validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(10080)], verbose_name='Hatırlatıcı (Dakika)'),
+        ),
+        migrations.AlterField(
+            model_name='eventattachment',
+            name='file_size',
+            field=models.PositiveIntegerField(verbose_name='Dosya Boyutu (Byte)'),
+        ),
+        migrations.AlterField(
+            model_name='eventreminder',
+            name='reminder_time',
+            field=models.DateTimeField(verbose_name='Hatırlatma Zamanı'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendar_app', '0004_sync_model_state'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['user', 'start_time'], name='event_user_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventreminder',
+            index=models.Index(condition=models.Q(('is_sent', False)), fields=['reminder_time'], name='reminder_unsent_time_idx'),
+        ),
+    ]
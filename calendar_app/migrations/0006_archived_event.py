@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:33
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendar_app', '0005_query_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedEvent',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=200, verbose_name='Başlık')),
+                ('description', models.TextField(blank=True, null=True, verbose_name='Açıklama')),
+                ('start_time', models.DateTimeField(verbose_name='Başlangıç Tarihi')),
+                ('end_time', models.DateTimeField(verbose_name='Bitiş Tarihi')),
+                ('is_all_day', models.BooleanField(default=False, verbose_name='Tüm Gün')),
+                ('is_recurring', models.BooleanField(default=False, verbose_name='Tekrarlayan')),
+                ('recurrence_pattern', models.CharField(blank=True, max_length=50, null=True, verbose_name='Tekrarlama Deseni')),
+                ('recurrence_end_date', models.DateTimeField(blank=True, null=True, verbose_name='Tekrarlama Bitiş Tarihi')),
+                ('event_type', models.CharField(choices=[('meeting', 'Toplantı'), ('appointment', 'Randevu'), ('task', 'Görev'), ('reminder', 'Hatırlatıcı'), ('holiday', 'Tatil'), ('personal', 'Kişisel'), ('work', 'İş'), ('other', 'Diğer')], default='other', max_length=20, verbose_name='Etkinlik Türü')),
+                ('location', models.CharField(blank=True, max_length=255, null=True, verbose_name='Konum')),
+                ('is_important', models.BooleanField(default=False, verbose_name='Önemli')),
+                ('is_private', models.BooleanField(default=False, verbose_name='Özel')),
+                ('reminder_minutes', models.PositiveIntegerField(default=15, verbose_name='Hatırlatıcı (Dakika)')),
+                ('created_at', models.DateTimeField(verbose_name='Oluşturulma Tarihi')),
+                ('updated_at', models.DateTimeField(verbose_name='Güncellenme Tarihi')),
+                ('related', models.JSONField(blank=True, default=dict, verbose_name='Katılımcılar, Ekler ve Hatırlatıcılar')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='Arşivlenme Tarihi')),
+                ('calendar', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_events', to='calendar_app.calendar', verbose_name='Takvim')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_events', to=settings.AUTH_USER_MODEL, verbose_name='Kullanıcı')),
+            ],
+            options={
+                'verbose_name': 'Arşivlenmiş Etkinlik',
+                'verbose_name_plural': 'Arşivlenmiş Etkinlikler',
+                'ordering': ['start_time'],
+                'indexes': [models.Index(fields=['user', 'start_time'], name='archived_event_user_start_idx')],
+            },
+        ),
+    ]
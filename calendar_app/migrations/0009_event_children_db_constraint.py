@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendar_app', '0008_event_children_without_db_constraint'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='eventattachment',
+            name='event',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attachments', to='calendar_app.event', verbose_name='Etkinlik'),
+        ),
+        migrations.AlterField(
+            model_name='eventparticipant',
+            name='event',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='participants', to='calendar_app.event', verbose_name='Etkinlik'),
+        ),
+        migrations.AlterField(
+            model_name='eventreminder',
+            name='event',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminders', to='calendar_app.event', verbose_name='Etkinlik'),
+        ),
+    ]
@@ -90,10 +90,27 @@ class Event(models.Model):
         verbose_name = "Etkinlik"
         verbose_name_plural = "Etkinlikler"
         ordering = ['start_time']
+        indexes = [
+            # Liste, bugünkü ve yaklaşan etkinlikler: filter(user=...) + start_time aralığı/sıralaması
+            models.Index(fields=['user', 'start_time'], name='event_user_start_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.start_time.strftime('%d.%m.%Y %H:%M')}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Etkinlik başka takvime taşınırsa eski takvimin yayını da geçersiz kılınır
+        instance._loaded_calendar_id = instance.__dict__.get('calendar_id')
+        return instance
+
+    def delete(self, *args, **kwargs):
+        from .feeds import invalidate_feed
+        # post_delete alıcısı yerine burada: queryset silmeleri satır satır sinyal göndermez
+        invalidate_feed(self.calendar_id)
+        return super().delete(*args, **kwargs)
+
     @property
     def duration(self):
         """
@@ -172,6 +189,9 @@ class EventAttachment(models.Model):
     file = models.FileField(upload_to='event_attachments/', verbose_name="Dosya")
     file_size = models.PositiveIntegerField(verbose_name="Dosya Boyutu (Byte)")
     uploaded_at = models.DateTimeField(auto_now_add=True, verbose_name="Yüklenme Tarihi")
+    # Yükleme hattıyla eklenen dosyalar içerik adresli blob'a bağlanır
+    blob = models.ForeignKey('uploads.StoredBlob', on_delete=models.PROTECT, null=True, blank=True, related_name='event_attachments', verbose_name="Saklanan Dosya")
+    uploaded_by = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='+', verbose_name="Yükleyen")
 
     class Meta:
         verbose_name = "Etkinlik Eki"
@@ -182,9 +202,9 @@ class EventAttachment(models.Model):
 
     def save(self, *args, **kwargs):
         """
-        Dosya boyutunu otomatik hesapla
+        Dosya boyutunu otomatik hesapla (yalnızca yeni dosyada; kayıtlı dosya için depolamaya gidilmez)
         """
-        if self.file:
+        if self.file and (self.file_size is None or not self.file._committed):
             self.file_size = self.file.size
         super().save(*args, **kwargs)
 
@@ -212,6 +232,54 @@ class EventReminder(models.Model):
     class Meta:
         verbose_name = "Etkinlik Hatırlatıcısı"
         verbose_name_plural = "Etkinlik Hatırlatıcıları"
+        indexes = [
+            # Gönderilmemiş hatırlatıcılar zamanına göre taranır
+            models.Index(
+                fields=['reminder_time'],
+                name='reminder_unsent_time_idx',
+                condition=models.Q(is_sent=False),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.event.title} - {self.reminder_time.strftime('%d.%m.%Y %H:%M')}"
+
+
+class ArchivedEvent(models.Model):
+    """
+    Arşivlenmiş (geçmiş, tekrarlamayan) etkinlikler.
+
+    Canlı tablodan aynı id ile taşınır; katılımcı, ek ve hatırlatıcı
+    bilgileri `related` alanında salt-okunur olarak saklanır.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=200, verbose_name="Başlık")
+    description = models.TextField(blank=True, null=True, verbose_name="Açıklama")
+    calendar = models.ForeignKey(Calendar, on_delete=models.CASCADE, related_name='archived_events', verbose_name="Takvim")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_events', verbose_name="Kullanıcı")
+    start_time = models.DateTimeField(verbose_name="Başlangıç Tarihi")
+    end_time = models.DateTimeField(verbose_name="Bitiş Tarihi")
+    is_all_day = models.BooleanField(default=False, verbose_name="Tüm Gün")
+    is_recurring = models.BooleanField(default=False, verbose_name="Tekrarlayan")
+    recurrence_pattern = models.CharField(max_length=50, blank=True, null=True, verbose_name="Tekrarlama Deseni")
+    recurrence_end_date = models.DateTimeField(blank=True, null=True, verbose_name="Tekrarlama Bitiş Tarihi")
+    event_type = models.CharField(max_length=20, choices=EventType.choices, default=EventType.OTHER, verbose_name="Etkinlik Türü")
+    location = models.CharField(max_length=255, blank=True, null=True, verbose_name="Konum")
+    is_important = models.BooleanField(default=False, verbose_name="Önemli")
+    is_private = models.BooleanField(default=False, verbose_name="Özel")
+    reminder_minutes = models.PositiveIntegerField(default=15, verbose_name="Hatırlatıcı (Dakika)")
+    created_at = models.DateTimeField(verbose_name="Oluşturulma Tarihi")
+    updated_at = models.DateTimeField(verbose_name="Güncellenme Tarihi")
+    related = models.JSONField(default=dict, blank=True, verbose_name="Katılımcılar, Ekler ve Hatırlatıcılar")
+    archived_at = models.DateTimeField(auto_now_add=True, verbose_name="Arşivlenme Tarihi")
+
+    class Meta:
+        verbose_name = "Arşivlenmiş Etkinlik"
+        verbose_name_plural = "Arşivlenmiş Etkinlikler"
+        ordering = ['start_time']
+        indexes = [
+            models.Index(fields=['user', 'start_time'], name='archived_event_user_start_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.title} - {self.start_time.strftime('%d.%m.%Y %H:%M')}"
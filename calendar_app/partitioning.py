@@ -0,0 +1,355 @@
+"""
+Event tablosunun PostgreSQL'de start_time'a göre aylık aralık bölümlerine
+(range partition) ayrılması.
+
+Geçiş çevrimiçi ve üç adımda yapılır (partition_events komutu):
+
+1. prepare: Bölümlenmiş yeni tablo, aylık bölümler ve varsayılan bölüm
+   oluşturulur; eski tablodaki her INSERT/UPDATE/DELETE tetikleyici ile yeni
+   tabloya yansıtılır.
+2. backfill: Mevcut satırlar id sırasıyla partiler halinde kopyalanır
+   (ON CONFLICT DO NOTHING; tekrar çalıştırmak güvenlidir).
+3. swap: Kısa bir ACCESS EXCLUSIVE kilit altında satır sayıları doğrulanır,
+   tablolar yer değiştirir; eski tablo geri dönüş için saklanır. Eski
+   tablonun kullanıcı ve takvim yabancı anahtarları kaldırılır (aksi halde
+   swap sırasında etkinliği olan kullanıcı/takvim silinemezdi).
+
+Gelecek ayların bölümleri create_event_partitions komutuyla (cron) önceden
+oluşturulur.
+
+Bilinen sınırlar:
+
+- Bölüm anahtarı birincil anahtarın parçası olmak zorunda olduğundan yeni
+  tablonun birincil anahtarı (id, start_time)'dır ve `id` tek başına
+  veritabanında benzersiz değildir. Benzersizlik yalnızca id'lerin tek bir
+  dizi (sequence) ile üretilmesine dayanır; id'yi elle veren yazmalar
+  (fixture, ham SQL) çakışma oluşturabilir.
+- Aynı nedenle Event'e bağlı tablolar (katılımcı, ek, hatırlatıcı)
+  bölümlenmiş tabloya yabancı anahtarla bağlanamaz. swap bu yabancı
+  anahtarları kaldırıp yerlerine aynı adlı, ertelenmiş (DEFERRABLE INITIALLY
+  DEFERRED) kısıt tetikleyicileri kurar: alt tabloya yazılan event_id'nin
+  Event'te bulunması ve başvurulan bir Event'in silinmemesi yine veritabanında
+  denetlenir. Bölümlenmemiş kurulumlarda (SQLite dahil) yabancı anahtarlar
+  olduğu gibi kalır. Migration durumu bu alanları hâlâ yabancı anahtar olarak
+  bilir; bölümlenmiş kurulumda bu alanları değiştiren bir migration
+  SeparateDatabaseAndState ile yazılmalıdır.
+"""
+import datetime
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.utils import timezone
+
+from .models import Event
+
+TABLE = Event._meta.db_table
+PARTITIONED_TABLE = f'{TABLE}_partitioned'
+UNPARTITIONED_TABLE = f'{TABLE}_unpartitioned'
+DEFAULT_PARTITION = f'{TABLE}_pdefault'
+SEQUENCE = f'{TABLE}_part_id_seq'
+MIRROR_FUNCTION = f'{TABLE}_mirror'
+# swap sonrası yabancı anahtarların yerini alan kısıt tetikleyicisi fonksiyonları
+REFERENCE_FUNCTION = f'{TABLE}_reference_check'
+REFERENCED_FUNCTION = f'{TABLE}_referenced_check'
+# Django'nun Event.Meta.indexes içindeki index'i; swap sonrası yeni tabloda aynı adı taşır
+USER_START_INDEX = 'event_user_start_idx'
+
+
+def month_start(value):
+    return datetime.datetime(value.year, value.month, 1, tzinfo=datetime.timezone.utc)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def month_bounds(month):
+    """
+    Ayın UTC [başlangıç, bitiş) sınırları
+    """
+    start = month_start(month)
+    return start, add_months(start, 1)
+
+
+def partition_name(month):
+    return f'{TABLE}_p{month.year:04d}{month.month:02d}'
+
+
+def require_postgresql():
+    if connection.vendor != 'postgresql':
+        raise ImproperlyConfigured('Event bölümlendirmesi yalnızca PostgreSQL üzerinde desteklenir.')
+
+
+def table_exists(cursor, name):
+    cursor.execute('SELECT to_regclass(%s) IS NOT NULL', [name])
+    return cursor.fetchone()[0]
+
+
+def is_partitioned(cursor, name=TABLE):
+    cursor.execute("SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass(%s)", [name])
+    row = cursor.fetchone()
+    return bool(row and row[0])
+
+
+def inbound_foreign_keys(cursor, table=TABLE):
+    """
+    Tabloya başvuran yabancı anahtarlar: [(tablo, kısıt adı, sütun), ...]
+    """
+    cursor.execute(
+        "SELECT c.conrelid::regclass::text, c.conname, a.attname FROM pg_constraint c "
+        "JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = c.conkey[1] "
+        "WHERE c.confrelid = %s::regclass AND c.contype = 'f' ORDER BY 1, 2",
+        [table]
+    )
+    return cursor.fetchall()
+
+
+def outbound_foreign_keys(cursor, table=TABLE):
+    """
+    Tablonun başka tablolara yabancı anahtarları: [(kısıt adı, tanım), ...]
+    """
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'",
+        [table]
+    )
+    return cursor.fetchall()
+
+
+def reference_triggers(cursor):
+    """
+    Yabancı anahtarların yerini alan kısıt tetikleyicileri: [(tablo, tetikleyici adı), ...]
+    """
+    cursor.execute(
+        "SELECT DISTINCT tgrelid::regclass::text, tgname FROM pg_trigger t JOIN pg_proc p ON p.oid = t.tgfoid "
+        "WHERE p.proname IN (%s, %s) AND tgparentid = 0 ORDER BY 1, 2",
+        [REFERENCE_FUNCTION, REFERENCED_FUNCTION]
+    )
+    return cursor.fetchall()
+
+
+def create_reference_functions(cursor):
+    """
+    Alt tablo -> Event ve Event -> alt tablo denetimlerini yapan tetikleyici fonksiyonları.
+
+    Denetimler ertelenmiş çalıştığından satırın o ana kadar silinmiş ya da
+    bölümler arasında taşınmış olabileceği hesaba katılır.
+    """
+    cursor.execute(f"""
+        CREATE OR REPLACE FUNCTION {REFERENCE_FUNCTION}() RETURNS trigger AS $$
+        DECLARE
+            ref_id bigint := (to_jsonb(NEW) ->> TG_ARGV[0])::bigint;
+            remaining integer;
+        BEGIN
+            IF ref_id IS NULL THEN
+                RETURN NULL;
+            END IF;
+            -- Satır aynı transaction içinde silindiyse ya da başka etkinliğe bağlandıysa denetim gerekmez
+            EXECUTE format('SELECT 1 FROM %I.%I WHERE id = $1 AND %I = $2', TG_TABLE_SCHEMA, TG_TABLE_NAME, TG_ARGV[0])
+                USING NEW.id, ref_id;
+            GET DIAGNOSTICS remaining = ROW_COUNT;
+            IF remaining = 0 THEN
+                RETURN NULL;
+            END IF;
+            PERFORM 1 FROM {TABLE} WHERE id = ref_id FOR KEY SHARE;
+            IF NOT FOUND THEN
+                RAISE foreign_key_violation USING MESSAGE = format(
+                    '%s.%s = %s, {TABLE} tablosunda yok', TG_TABLE_NAME, TG_ARGV[0], ref_id
+                );
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    cursor.execute(f"""
+        CREATE OR REPLACE FUNCTION {REFERENCED_FUNCTION}() RETURNS trigger AS $$
+        DECLARE
+            remaining integer;
+        BEGIN
+            -- Bölümler arasında taşınan ya da id'si değişmeyen satır hâlâ mevcuttur
+            PERFORM 1 FROM {TABLE} WHERE id = OLD.id;
+            IF FOUND THEN
+                RETURN NULL;
+            END IF;
+            EXECUTE format('SELECT 1 FROM %I WHERE %I = $1 LIMIT 1', TG_ARGV[0], TG_ARGV[1]) USING OLD.id;
+            GET DIAGNOSTICS remaining = ROW_COUNT;
+            IF remaining > 0 THEN
+                RAISE foreign_key_violation USING MESSAGE = format(
+                    '{TABLE}.id = %s, %s.%s tarafından kullanılıyor', OLD.id, TG_ARGV[0], TG_ARGV[1]
+                );
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+
+
+def create_partition(cursor, parent, month):
+    """
+    Ayın bölümünü oluştur; zaten varsa False döndür.
+
+    Varsayılan bölümde o aya düşen satırlar varsa varsayılan bölüm ayrılır,
+    satırlar yeni bölüme taşınır ve varsayılan bölüm tekrar bağlanır.
+    """
+    name = partition_name(month)
+    if table_exists(cursor, name):
+        return False
+
+    start, end = month_bounds(month)
+    create_sql = (
+        f"CREATE TABLE {name} PARTITION OF {parent} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
+    cursor.execute(
+        f'SELECT 1 FROM {DEFAULT_PARTITION} WHERE start_time >= %s AND start_time < %s LIMIT 1', [start, end]
+    )
+    if cursor.fetchone() is None:
+        cursor.execute(create_sql)
+        return True
+
+    cursor.execute(f'ALTER TABLE {parent} DETACH PARTITION {DEFAULT_PARTITION}')
+    cursor.execute(create_sql)
+    cursor.execute(
+        f'INSERT INTO {name} SELECT * FROM {DEFAULT_PARTITION} WHERE start_time >= %s AND start_time < %s',
+        [start, end]
+    )
+    cursor.execute(f'DELETE FROM {DEFAULT_PARTITION} WHERE start_time >= %s AND start_time < %s', [start, end])
+    cursor.execute(f'ALTER TABLE {parent} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT')
+    return True
+
+
+def ensure_partitions(cursor, parent, first_month, months_ahead):
+    """
+    first_month'tan bugünden months_ahead ay sonrasına kadar eksik bölümleri oluştur
+    """
+    created = []
+    month = month_start(first_month)
+    last = add_months(month_start(timezone.now()), months_ahead)
+    while month <= last:
+        if create_partition(cursor, parent, month):
+            created.append(partition_name(month))
+        month = add_months(month, 1)
+    return created
+
+
+def prepare(cursor, months_ahead):
+    """
+    Bölümlenmiş tabloyu, bölümleri ve eski tablodan yansıtma tetikleyicisini oluştur
+    """
+    cursor.execute(f'CREATE SEQUENCE IF NOT EXISTS {SEQUENCE}')
+    cursor.execute(
+        f'CREATE TABLE IF NOT EXISTS {PARTITIONED_TABLE} '
+        f'(LIKE {TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) PARTITION BY RANGE (start_time)'
+    )
+    cursor.execute(f"ALTER TABLE {PARTITIONED_TABLE} ALTER COLUMN id SET DEFAULT nextval('{SEQUENCE}')")
+    # Bölüm anahtarı birincil anahtarın parçası olmak zorundadır
+    cursor.execute(
+        f"SELECT 1 FROM pg_constraint WHERE conrelid = '{PARTITIONED_TABLE}'::regclass AND contype = 'p'"
+    )
+    if cursor.fetchone() is None:
+        cursor.execute(f'ALTER TABLE {PARTITIONED_TABLE} ADD PRIMARY KEY (id, start_time)')
+    cursor.execute(
+        f'CREATE INDEX IF NOT EXISTS {PARTITIONED_TABLE}_user_start ON {PARTITIONED_TABLE} (user_id, start_time)'
+    )
+    cursor.execute(
+        f'CREATE INDEX IF NOT EXISTS {PARTITIONED_TABLE}_calendar ON {PARTITIONED_TABLE} (calendar_id)'
+    )
+    # Kullanıcı ve takvim yabancı anahtarları eski tablodakiyle aynı tanımla eklenir
+    for constraint, definition in outbound_foreign_keys(cursor):
+        cursor.execute('SELECT 1 FROM pg_constraint WHERE conname = %s', [f'{constraint}_part'])
+        if cursor.fetchone() is None:
+            cursor.execute(f'ALTER TABLE {PARTITIONED_TABLE} ADD CONSTRAINT {constraint}_part {definition}')
+    cursor.execute(f'CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {PARTITIONED_TABLE} DEFAULT')
+
+    cursor.execute(f'SELECT min(start_time) FROM {TABLE}')
+    first = cursor.fetchone()[0] or timezone.now()
+    created = ensure_partitions(cursor, PARTITIONED_TABLE, first, months_ahead)
+
+    cursor.execute(f"""
+        CREATE OR REPLACE FUNCTION {MIRROR_FUNCTION}() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM {PARTITIONED_TABLE} WHERE id = OLD.id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO {PARTITIONED_TABLE} SELECT (NEW).*;
+                RETURN NEW;
+            END IF;
+            RETURN OLD;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    cursor.execute(f'DROP TRIGGER IF EXISTS {MIRROR_FUNCTION} ON {TABLE}')
+    cursor.execute(
+        f'CREATE TRIGGER {MIRROR_FUNCTION} AFTER INSERT OR UPDATE OR DELETE ON {TABLE} '
+        f'FOR EACH ROW EXECUTE FUNCTION {MIRROR_FUNCTION}()'
+    )
+    return created
+
+
+def backfill_batch(cursor, after_id, batch_size):
+    """
+    after_id'den sonraki batch_size satırı kopyala; son kopyalanan id'yi (yoksa None) döndür.
+
+    Satırlar kopyalanırken kilitlenir, böylece eşzamanlı bir UPDATE'in
+    tetikleyicisi ile kopyalama birbirini ezmez.
+    """
+    cursor.execute(
+        f'SELECT id FROM {TABLE} WHERE id > %s ORDER BY id LIMIT 1 OFFSET %s', [after_id, batch_size - 1]
+    )
+    row = cursor.fetchone()
+    upper = row[0] if row else None
+    bound = 'AND id <= %s' if upper is not None else ''
+    params = [after_id] + ([upper] if upper is not None else [])
+
+    cursor.execute(
+        f'INSERT INTO {PARTITIONED_TABLE} SELECT * FROM {TABLE} WHERE id > %s {bound} ORDER BY id FOR UPDATE '
+        f'ON CONFLICT DO NOTHING',
+        params
+    )
+    cursor.execute(f'SELECT max(id) FROM {TABLE} WHERE id > %s {bound}', params)
+    return cursor.fetchone()[0]
+
+
+def swap(cursor):
+    """
+    Satır sayılarını doğrulayıp bölümlenmiş tabloyu Event tablosunun yerine koy
+    """
+    cursor.execute(f'LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE')
+    cursor.execute(f'SELECT (SELECT count(*) FROM {TABLE}), (SELECT count(*) FROM {PARTITIONED_TABLE})')
+    live, partitioned = cursor.fetchone()
+    if live != partitioned:
+        raise ValueError(f'Satır sayıları eşleşmiyor ({live} != {partitioned}); önce backfill çalıştırın.')
+
+    # Yeniden adlandırmadan sonra bu yabancı anahtarlar eski tabloya başvurmaya devam ederdi
+    children = inbound_foreign_keys(cursor)
+
+    cursor.execute(f'DROP TRIGGER IF EXISTS {MIRROR_FUNCTION} ON {TABLE}')
+    cursor.execute(f'DROP FUNCTION IF EXISTS {MIRROR_FUNCTION}()')
+
+    cursor.execute(f'ALTER TABLE {TABLE} RENAME TO {UNPARTITIONED_TABLE}')
+    if table_exists(cursor, USER_START_INDEX):
+        cursor.execute(f'ALTER INDEX {USER_START_INDEX} RENAME TO {USER_START_INDEX}_unpartitioned')
+    cursor.execute(f'ALTER TABLE {PARTITIONED_TABLE} RENAME TO {TABLE}')
+    cursor.execute(f'ALTER INDEX {PARTITIONED_TABLE}_user_start RENAME TO {USER_START_INDEX}')
+    cursor.execute(f"SELECT setval('{SEQUENCE}', (SELECT coalesce(max(id), 0) + 1 FROM {TABLE}), false)")
+    cursor.execute(f'ALTER SEQUENCE {SEQUENCE} OWNED BY {TABLE}.id')
+
+    # Eski tablo geri dönüş için saklanır ama kullanıcı/takvim silinmesini engellememeli
+    for constraint, _ in outbound_foreign_keys(cursor, UNPARTITIONED_TABLE):
+        cursor.execute(f'ALTER TABLE {UNPARTITIONED_TABLE} DROP CONSTRAINT {constraint}')
+
+    # Bölümlenmiş tabloya yabancı anahtarla başvurulamaz; aynı denetim kısıt tetikleyicileriyle yapılır
+    create_reference_functions(cursor)
+    for child, constraint, column in children:
+        cursor.execute(f'ALTER TABLE {child} DROP CONSTRAINT {constraint}')
+        cursor.execute(
+            f'CREATE CONSTRAINT TRIGGER {constraint} AFTER INSERT OR UPDATE OF {column} ON {child} '
+            f"DEFERRABLE INITIALLY DEFERRED FOR EACH ROW EXECUTE FUNCTION {REFERENCE_FUNCTION}('{column}')"
+        )
+        cursor.execute(
+            f'CREATE CONSTRAINT TRIGGER {constraint} AFTER DELETE OR UPDATE OF id ON {TABLE} '
+            f"DEFERRABLE INITIALLY DEFERRED FOR EACH ROW EXECUTE FUNCTION {REFERENCED_FUNCTION}('{child}', '{column}')"
+        )
+    return live
@@ -11,7 +11,7 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
             return True
         
         # Yazma izni sadece objenin sahibine
-        return obj.user == request.user
+        return obj.user_id == request.user.pk
 
 
 class IsOwner(permissions.BasePermission):
@@ -19,20 +19,26 @@ class IsOwner(permissions.BasePermission):
     Sadece sahibi erişebilir
     """
     def has_object_permission(self, request, view, obj):
-        return obj.user == request.user
+        return obj.user_id == request.user.pk
 
 
 class IsEventOwnerOrParticipant(permissions.BasePermission):
     """
-    Etkinlik sahibi veya katılımcısı erişebilir
+    Etkinlik sahibi veya katılımcısı erişebilir.
+
+    Nesne `is_participant` ile yüklendiyse (agenda.visible_events) katılım
+    için ayrıca sorgu yapılmaz.
     """
     def has_object_permission(self, request, view, obj):
         # Sahibi her zaman erişebilir
-        if obj.user == request.user:
+        if obj.user_id == request.user.pk:
             return True
         
         # Katılımcısı sadece okuma yapabilir
         if request.method in permissions.SAFE_METHODS:
-            return obj.participants.filter(user=request.user).exists()
+            is_participant = getattr(obj, 'is_participant', None)
+            if is_participant is None:
+                is_participant = obj.participants.filter(user=request.user).exists()
+            return is_participant
         
         return False
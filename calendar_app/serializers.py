@@ -1,16 +1,24 @@
+from operator import itemgetter
+
+from django.db.models import Count, Q
+from django.urls import reverse
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.utils import timezone
+from todocalendar_project.fast_serializers import ValuesReadSerializer
+from todocalendar_project.field_selection import DynamicFieldsMixin
 from .models import Calendar, Event, EventParticipant, EventAttachment, EventReminder
 
 User = get_user_model()
 
 
-class CalendarSerializer(serializers.ModelSerializer):
+class CalendarSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Takvim serializer'ı
     """
     event_count = serializers.SerializerMethodField()
+    # Listede istendiğinde satır başına COUNT yerine tek sorguda annotate edilir
+    field_annotations = {'event_count': Count('events')}
 
     class Meta:
         model = Calendar
@@ -24,10 +32,41 @@ class CalendarSerializer(serializers.ModelSerializer):
         """
         Takvime ait etkinlik sayısını getir
         """
+        if hasattr(obj, 'event_count'):
+            return obj.event_count
         return obj.events.count()
 
 
-class EventCreateSerializer(serializers.ModelSerializer):
+class PublicCalendarSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """
+    Herkese açık takvimler için salt-okunur serializer (özel etkinlikler sayılmaz)
+    """
+    owner = serializers.CharField(source='user.username', read_only=True)
+    event_count = serializers.SerializerMethodField()
+    feed_url = serializers.SerializerMethodField()
+    field_annotations = {'event_count': Count('events', filter=Q(events__is_private=False))}
+    field_dependencies = {'feed_url': ()}
+
+    class Meta:
+        model = Calendar
+        fields = ('id', 'name', 'description', 'color', 'owner', 'event_count', 'feed_url', 'updated_at')
+        read_only_fields = fields
+
+    def get_event_count(self, obj):
+        if hasattr(obj, 'event_count'):
+            return obj.event_count
+        return obj.events.filter(is_private=False).count()
+
+    def get_feed_url(self, obj):
+        """
+        Abone olunabilir .ics yayınının adresi
+        """
+        url = reverse('calendar_app:calendar-feed', args=[obj.pk])
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
+
+class EventCreateSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Etkinlik oluşturma için basit serializer
     """
@@ -60,7 +99,7 @@ class EventCreateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class EventParticipantSerializer(serializers.ModelSerializer):
+class EventParticipantSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Etkinlik katılımcısı serializer'ı
     """
@@ -76,17 +115,26 @@ class EventParticipantSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'joined_at')
 
 
-class EventAttachmentSerializer(serializers.ModelSerializer):
+class EventAttachmentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Etkinlik eki serializer'ı
     """
+    # Dosya /media/ yerine yetki kontrollü indirme endpoint'inden sunulur
+    file = serializers.SerializerMethodField()
+    field_dependencies = {'file': ()}
+
     class Meta:
         model = EventAttachment
         fields = ('id', 'filename', 'file', 'file_size', 'uploaded_at')
         read_only_fields = ('id', 'filename', 'file_size', 'uploaded_at')
 
+    def get_file(self, obj):
+        url = reverse('calendar_app:event-attachment-download', kwargs={'pk': obj.pk})
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
 
-class EventReminderSerializer(serializers.ModelSerializer):
+class EventReminderSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Etkinlik hatırlatıcısı serializer'ı
     """
@@ -99,7 +147,7 @@ class EventReminderSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'is_sent', 'sent_at', 'created_at')
 
 
-class EventListSerializer(serializers.ModelSerializer):
+class EventListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Etkinlik listesi için basit serializer
     """
@@ -109,6 +157,12 @@ class EventListSerializer(serializers.ModelSerializer):
     is_past = serializers.ReadOnlyField()
     is_current = serializers.ReadOnlyField()
     is_upcoming = serializers.ReadOnlyField()
+    field_dependencies = {
+        'duration': ('start_time', 'end_time'),
+        'is_past': ('end_time',),
+        'is_current': ('start_time', 'end_time'),
+        'is_upcoming': ('start_time',),
+    }
 
     class Meta:
         model = Event
@@ -120,7 +174,66 @@ class EventListSerializer(serializers.ModelSerializer):
         )
 
 
-class EventDetailSerializer(serializers.ModelSerializer):
+class EventListReadSerializer(ValuesReadSerializer):
+    """
+    EventListSerializer ile aynı çıktıyı .values() satırlarından üreten hızlı serializer
+    """
+    value_fields = (
+        'id', 'title', 'description', 'calendar', 'calendar__name', 'calendar__color',
+        'start_time', 'end_time', 'location', 'is_all_day', 'created_at', 'updated_at'
+    )
+
+    field_sources = {
+        'calendar_name': ('calendar__name',),
+        'calendar_color': ('calendar__color',),
+        'duration': ('start_time', 'end_time'),
+        'is_past': ('end_time',),
+        'is_current': ('start_time', 'end_time'),
+        'is_upcoming': ('start_time',),
+    }
+
+    def get_builders(self):
+        now = self.now
+        format_datetime = self.format_datetime
+
+        def duration(row):
+            start_time, end_time = row['start_time'], row['end_time']
+            return end_time - start_time if end_time and start_time else None
+
+        return {
+            'id': itemgetter('id'),
+            'title': itemgetter('title'),
+            'description': itemgetter('description'),
+            'calendar': itemgetter('calendar'),
+            'calendar_name': itemgetter('calendar__name'),
+            'calendar_color': itemgetter('calendar__color'),
+            'start_time': lambda row: format_datetime(row['start_time']),
+            'end_time': lambda row: format_datetime(row['end_time']),
+            'location': itemgetter('location'),
+            'is_all_day': itemgetter('is_all_day'),
+            'duration': duration,
+            'is_past': lambda row: row['end_time'] < now,
+            'is_current': lambda row: row['start_time'] <= now <= row['end_time'],
+            'is_upcoming': lambda row: row['start_time'] > now,
+            'created_at': lambda row: format_datetime(row['created_at']),
+            'updated_at': lambda row: format_datetime(row['updated_at']),
+        }
+
+
+class AgendaReadSerializer(EventListReadSerializer):
+    """
+    Ajanda satırları: etkinlik listesi alanları ve kullanıcının etkinlikteki rolü
+    """
+    def get_builders(self):
+        return {
+            **super().get_builders(),
+            'is_owner': itemgetter('is_owner'),
+            'is_organizer': itemgetter('is_organizer'),
+            'response_status': itemgetter('response_status'),
+        }
+
+
+class EventDetailSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Etkinlik detayı için kapsamlı serializer
     """
@@ -133,6 +246,13 @@ class EventDetailSerializer(serializers.ModelSerializer):
     is_past = serializers.ReadOnlyField()
     is_current = serializers.ReadOnlyField()
     is_upcoming = serializers.ReadOnlyField()
+    expandable_fields = ('calendar', 'participants', 'attachments', 'reminders')
+    field_dependencies = {
+        'duration': ('start_time', 'end_time'),
+        'is_past': ('end_time',),
+        'is_current': ('start_time', 'end_time'),
+        'is_upcoming': ('start_time',),
+    }
 
     class Meta:
         model = Event
@@ -166,7 +286,7 @@ class EventDetailSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class EventParticipantCreateSerializer(serializers.ModelSerializer):
+class EventParticipantCreateSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Etkinlik katılımcısı oluşturma serializer'ı
     """
@@ -0,0 +1,29 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .feeds import invalidate_feed
+from .models import Calendar, Event
+
+
+@receiver(post_save, sender=Calendar)
+def calendar_changed(sender, instance, update_fields=None, **kwargs):
+    """
+    Takvim değişince (ör. herkese açıklığı) yayınını geçersiz kıl.
+
+    auto_now yalnızca update_fields updated_at'i içeriyorsa yazılır; silinen
+    takvimin yayını ise zaten bulunamaz.
+    """
+    if update_fields is not None and 'updated_at' not in update_fields:
+        invalidate_feed(instance.pk)
+
+
+@receiver(post_save, sender=Event)
+def event_changed(sender, instance, **kwargs):
+    """
+    Etkinlik değişince takviminin (başka takvime taşındıysa eskisinin de) yayınını geçersiz kıl.
+
+    Silme için alıcı yoktur: post_delete alıcısı queryset silmelerinde Django'yu
+    her satırı çekip tek tek sinyal göndermeye zorlar. Tekil silmeyi
+    Event.delete(), toplu yolları (arşivleme) çağıranlar geçersiz kılar.
+    """
+    invalidate_feed(instance.calendar_id, getattr(instance, '_loaded_calendar_id', None))
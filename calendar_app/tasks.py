@@ -0,0 +1,10 @@
+from taskqueue.queue import task
+from .archive import archive_events
+
+
+@task(name='calendar_app.archive_events')
+def archive_events_task(days=None, batch_size=None):
+    """
+    Geçmiş tekrarlamayan etkinlikleri arka planda arşivle
+    """
+    return archive_events(days, batch_size=batch_size)
@@ -1,12 +1,24 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection, transaction
 from django.urls import reverse
 from django.utils import timezone
-from datetime import timedelta, datetime
+from datetime import timedelta, datetime, timezone as dt_timezone
+from io import StringIO
+from unittest import mock, skipUnless
+import zoneinfo
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 from rest_framework_simplejwt.tokens import RefreshToken
-from .models import Calendar, Event, EventParticipant
+from todocalendar_project.dates import DateWindow, local_day_range
+from . import feeds, partitioning
+from .models import ArchivedEvent, Calendar, Event, EventParticipant
+from .serializers import EventListSerializer, EventListReadSerializer
 
 User = get_user_model()
 
@@ -147,6 +159,7 @@ class EventModelTest(TestCase):
         self.assertTrue(event.is_upcoming)
 
 
+@override_settings(QUERY_INSPECTOR={'ENABLED': True, 'MODE': 'raise', 'DUPLICATE_THRESHOLD': 3, 'SLOW_QUERY_MS': 1000})
 class CalendarAPITest(APITestCase):
     """
     Calendar API testleri
@@ -339,3 +352,738 @@ class CalendarAPITest(APITestCase):
         
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(response.data['response_status'], 'accepted')
+
+
+class EventListReadSerializerParityTest(APITestCase):
+    """
+    Hızlı liste serializer'ının EventListSerializer ile aynı çıktıyı ürettiğini doğrular
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        self.calendar = Calendar.objects.create(name='Test Takvim', color='#00ff00', user=self.user)
+        self.now = timezone.now()
+
+        for title, start, length in (
+            ('Geçmiş', self.now - timedelta(days=1), timedelta(hours=2)),
+            ('Devam eden', self.now - timedelta(minutes=30), timedelta(hours=1)),
+            ('Yaklaşan', self.now + timedelta(hours=5), timedelta(minutes=45)),
+            ('Şimdi başlayan', self.now, timedelta(days=1, seconds=1)),
+        ):
+            Event.objects.create(
+                title=title, calendar=self.calendar, user=self.user,
+                start_time=start, end_time=start + length, location='İstanbul'
+            )
+
+    def render(self, data):
+        return JSONRenderer().render(data)
+
+    def test_output_identical_to_model_serializer(self):
+        """
+        Aynı `now` ile iki serializer bayt düzeyinde aynı JSON'u üretmeli
+        """
+        queryset = Event.objects.filter(user=self.user).order_by('-start_time')
+
+        with mock.patch('django.utils.timezone.now', return_value=self.now):
+            expected = self.render(EventListSerializer(queryset, many=True).data)
+            actual = self.render(EventListReadSerializer(EventListReadSerializer.values(queryset)).data)
+
+        self.assertEqual(actual, expected)
+
+    def test_list_endpoint_matches_model_serializer(self):
+        """
+        Liste endpoint'i sayfalı çıktıda aynı sonucu vermeli
+        """
+        token = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token.access_token}')
+        url = reverse('calendar_app:event-list-create')
+
+        with mock.patch('django.utils.timezone.now', return_value=self.now):
+            response = self.client.get(url)
+            queryset = Event.objects.filter(user=self.user).order_by('-start_time')
+            expected = self.render(EventListSerializer(queryset, many=True).data)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.render(response.data['results']), expected)
+
+
+class EventArchiveTest(APITestCase):
+    """
+    Geçmiş etkinliklerin arşivlenmesi testleri
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        self.other = User.objects.create_user(
+            email='other@example.com',
+            username='otheruser',
+            password='testpass123'
+        )
+        token = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token.access_token}')
+        self.calendar = Calendar.objects.create(name='Test Takvim', user=self.user)
+
+        # Kurulum verisi commit edilmiş sayılır (bekleyen yayın güncellemesi burada çalışır)
+        with self.captureOnCommitCallbacks(execute=True):
+            past = timezone.now() - timedelta(days=60)
+            self.past = Event.objects.create(
+                title='Eski toplantı', calendar=self.calendar, user=self.user,
+                start_time=past, end_time=past + timedelta(hours=1)
+            )
+            EventParticipant.objects.create(event=self.past, user=self.other, response_status='accepted')
+            self.recurring = Event.objects.create(
+                title='Haftalık toplantı', calendar=self.calendar, user=self.user,
+                start_time=past, end_time=past + timedelta(hours=1),
+                is_recurring=True, recurrence_pattern='weekly'
+            )
+            self.upcoming = Event.objects.create(
+                title='Yeni toplantı', calendar=self.calendar, user=self.user,
+                start_time=timezone.now() + timedelta(days=1),
+                end_time=timezone.now() + timedelta(days=1, hours=1)
+            )
+
+    def test_archive_moves_past_non_recurring_events(self):
+        """
+        Sadece geçmiş ve tekrarlamayan etkinlikler katılımcılarıyla taşınmalı
+        """
+        call_command('archive_events', days=30, stdout=StringIO())
+
+        self.assertEqual(
+            set(Event.objects.values_list('pk', flat=True)), {self.recurring.pk, self.upcoming.pk}
+        )
+        archived = ArchivedEvent.objects.get(pk=self.past.pk)
+        self.assertEqual(archived.related['participants'][0]['user'], self.other.pk)
+        self.assertFalse(EventParticipant.objects.exists())
+
+    def test_list_includes_archived_on_request(self):
+        """
+        Etkinlik listesi include_archived ile arşivlenmiş etkinlikleri de döndürmeli
+        """
+        call_command('archive_events', days=30, stdout=StringIO())
+        url = reverse('calendar_app:event-list-create')
+
+        self.assertEqual(self.client.get(url).data['count'], 2)
+
+        response = self.client.get(url, {'include_archived': 'true', 'ordering': 'start_time'})
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(
+            {event['title'] for event in response.data['results'] if event['is_archived']},
+            {'Eski toplantı'}
+        )
+
+    def test_archive_invalidates_feed_once_per_batch(self):
+        """
+        Arşivleme partisi etkinlik başına değil, takvim başına bir UPDATE yapmalı
+        """
+        past = timezone.now() - timedelta(days=45)
+        with self.captureOnCommitCallbacks(execute=True):
+            for title in ('Eski 1', 'Eski 2'):
+                Event.objects.create(
+                    title=title, calendar=self.calendar, user=self.user,
+                    start_time=past, end_time=past + timedelta(hours=1)
+                )
+        version = Calendar.objects.get(pk=self.calendar.pk).updated_at
+
+        with CaptureQueriesContext(connection) as queries:
+            with self.captureOnCommitCallbacks(execute=True):
+                call_command('archive_events', days=30, stdout=StringIO())
+
+        self.assertEqual(ArchivedEvent.objects.count(), 3)
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE "calendar_app_calendar"')]
+        self.assertEqual(len(updates), 1)
+        self.assertGreater(Calendar.objects.get(pk=self.calendar.pk).updated_at, version)
+
+
+class EventPartitioningTest(TestCase):
+    """
+    Event aylık bölümlendirme yardımcıları testleri
+    """
+    def test_month_bounds_and_names(self):
+        """
+        Bölüm sınırları UTC ay başları olmalı ve yıl sonunu doğru geçmeli
+        """
+        start, end = partitioning.month_bounds(datetime(2025, 12, 17, 10, tzinfo=dt_timezone.utc))
+
+        self.assertEqual(start, datetime(2025, 12, 1, tzinfo=dt_timezone.utc))
+        self.assertEqual(end, datetime(2026, 1, 1, tzinfo=dt_timezone.utc))
+        self.assertEqual(partitioning.partition_name(start), 'calendar_app_event_p202512')
+
+    def test_local_day_range_matches_date_lookup(self):
+        """
+        Gün aralığı filtresi start_time__date ile aynı etkinlikleri seçmeli
+        """
+        user = User.objects.create_user(email='test@example.com', username='testuser', password='testpass123')
+        calendar = Calendar.objects.create(name='Test Takvim', user=user)
+        day = timezone.localdate()
+        midnight = timezone.make_aware(datetime.combine(day, datetime.min.time()))
+        for offset in (-1, 0, 1, 23 * 60 + 59, 24 * 60):
+            start = midnight + timedelta(minutes=offset)
+            Event.objects.create(title=str(offset), calendar=calendar, user=user,
+                                 start_time=start, end_time=start + timedelta(minutes=30))
+
+        day_start, day_end = local_day_range(day)
+        self.assertEqual(
+            set(Event.objects.filter(start_time__gte=day_start, start_time__lt=day_end).values_list('title', flat=True)),
+            set(Event.objects.filter(start_time__date=day).values_list('title', flat=True)),
+        )
+
+    def test_commands_require_postgresql(self):
+        """
+        PostgreSQL dışındaki veritabanlarında komutlar hata vermeli
+        """
+        if connection.vendor == 'postgresql':
+            self.skipTest('PostgreSQL üzerinde çalışıyor')
+        for command, args in (('partition_events', ['prepare']), ('create_event_partitions', [])):
+            with self.assertRaises(CommandError):
+                call_command(command, *args, stdout=StringIO())
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Bölümlendirme yalnızca PostgreSQL üzerinde çalışır')
+class EventPartitionMigrationTest(TestCase):
+    """
+    prepare -> backfill -> swap geçişinin PostgreSQL üzerinde uçtan uca testi
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(email='test@example.com', username='testuser', password='testpass123')
+        self.calendar = Calendar.objects.create(name='Test Takvim', user=self.user)
+        self.now = timezone.now()
+
+    def create_event(self, title, start):
+        return Event.objects.create(
+            title=title, calendar=self.calendar, user=self.user, start_time=start, end_time=start + timedelta(hours=1)
+        )
+
+    def check_constraints(self):
+        # Ertelenmiş denetimler test transaction'ı commit edilmediği için burada çalıştırılır
+        with connection.cursor() as cursor:
+            cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+            cursor.execute('SET CONSTRAINTS ALL DEFERRED')
+
+    def partition(self, months_ahead=1):
+        call_command('partition_events', 'prepare', months_ahead=months_ahead, stdout=StringIO())
+        call_command('partition_events', 'backfill', stdout=StringIO())
+        self.check_constraints()
+        call_command('partition_events', 'swap', stdout=StringIO())
+
+    def assert_violates(self, sql, params):
+        with self.assertRaises(IntegrityError), transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+
+    def test_prepare_backfill_swap(self):
+        """
+        Geçiş sonrası tüm satırlar (geçiş sırasındaki yazmalar dahil) bölümlenmiş tabloda olmalı
+        """
+        old = self.create_event('Eski', self.now - timedelta(days=70))
+        changed = self.create_event('Değişecek', self.now - timedelta(days=35))
+        removed = self.create_event('Silinecek', self.now)
+        EventParticipant.objects.create(event=old, user=self.user)
+
+        call_command('partition_events', 'prepare', months_ahead=1, stdout=StringIO())
+        # Yansıtma tetikleyicisi: prepare ile swap arasındaki yazmalar
+        during = self.create_event('Geçiş sırasında', self.now + timedelta(days=3))
+        Event.objects.filter(pk=changed.pk).update(title='Değişti', start_time=self.now + timedelta(days=1))
+        removed.delete()
+        call_command('partition_events', 'backfill', batch_size=1, stdout=StringIO())
+        self.check_constraints()
+        call_command('partition_events', 'swap', stdout=StringIO())
+
+        with connection.cursor() as cursor:
+            self.assertTrue(partitioning.is_partitioned(cursor))
+            self.assertTrue(partitioning.table_exists(cursor, partitioning.UNPARTITIONED_TABLE))
+            self.assertEqual(partitioning.inbound_foreign_keys(cursor), [])
+            self.assertEqual(partitioning.inbound_foreign_keys(cursor, partitioning.UNPARTITIONED_TABLE), [])
+            self.assertEqual(partitioning.outbound_foreign_keys(cursor, partitioning.UNPARTITIONED_TABLE), [])
+            cursor.execute(f'SELECT tableoid::regclass::text FROM {partitioning.TABLE} WHERE id = %s', [old.pk])
+            self.assertEqual(cursor.fetchone()[0], partitioning.partition_name(old.start_time))
+
+        self.assertEqual(
+            dict(Event.objects.values_list('pk', 'title')),
+            {old.pk: 'Eski', changed.pk: 'Değişti', during.pk: 'Geçiş sırasında'}
+        )
+        self.assertEqual(Event.objects.get(pk=changed.pk).start_time, self.now + timedelta(days=1))
+
+        # Yeni id'ler dizi üzerinden devam eder; CASCADE ORM tarafından uygulanır
+        created = self.create_event('Yeni', self.now + timedelta(days=2))
+        self.assertGreater(created.pk, during.pk)
+        old.delete()
+        self.check_constraints()
+        self.assertFalse(EventParticipant.objects.exists())
+
+    def test_users_and_calendars_deletable_after_swap(self):
+        """
+        Eski tablo saklansa da swap öncesi etkinliği olan kullanıcı ve takvim silinebilmeli
+        """
+        event = self.create_event('Eski', self.now)
+        EventParticipant.objects.create(event=event, user=self.user)
+        other_calendar = Calendar.objects.create(name='Diğer', user=self.user)
+        Event.objects.create(title='Diğer', calendar=other_calendar, user=self.user,
+                             start_time=self.now, end_time=self.now + timedelta(hours=1))
+        self.partition()
+
+        other_calendar.delete()
+        self.check_constraints()
+        self.user.delete()
+        self.check_constraints()
+
+        self.assertFalse(Event.objects.exists())
+        self.assertFalse(User.objects.exists())
+
+    def test_event_references_enforced_after_swap(self):
+        """
+        Yabancı anahtarların yerini alan tetikleyiciler geçersiz başvuruları reddetmeli
+        """
+        event = self.create_event('Eski', self.now)
+        EventParticipant.objects.create(event=event, user=self.user)
+        # months_ahead dışında kalan etkinlik varsayılan bölüme düşer
+        later = self.create_event('Sonra', self.now + timedelta(days=150))
+        EventParticipant.objects.create(event=later, user=self.user)
+        self.partition()
+
+        with connection.cursor() as cursor:
+            self.assertEqual(len(partitioning.reference_triggers(cursor)), 6)
+        participants = EventParticipant._meta.db_table
+        self.assert_violates(
+            f"INSERT INTO {participants} (event_id, user_id, is_organizer, response_status, joined_at) "
+            f"VALUES (%s, %s, false, 'pending', now())",
+            [later.pk + 1000, self.user.pk]
+        )
+        self.assert_violates(f'DELETE FROM {partitioning.TABLE} WHERE id = %s', [event.pk])
+
+        # Bölümler arası taşıma ve varsayılan bölümün ayrılması başvuruyu bozmamalı
+        Event.objects.filter(pk=event.pk).update(start_time=self.now - timedelta(days=40))
+        call_command('create_event_partitions', months_ahead=6, stdout=StringIO())
+        self.check_constraints()
+        self.assert_violates(f'DELETE FROM {partitioning.TABLE} WHERE id = %s', [later.pk])
+
+        event.delete()
+        self.check_constraints()
+        self.assertEqual(list(EventParticipant.objects.values_list('event_id', flat=True)), [later.pk])
+
+    def test_swap_refuses_mismatched_counts(self):
+        """
+        Backfill yapılmadan swap tabloları değiştirmemeli
+        """
+        self.create_event('Eski', self.now)
+        call_command('partition_events', 'prepare', months_ahead=1, stdout=StringIO())
+
+        with self.assertRaises(CommandError):
+            call_command('partition_events', 'swap', stdout=StringIO())
+        with connection.cursor() as cursor:
+            self.assertFalse(partitioning.is_partitioned(cursor))
+
+
+class EventFieldSelectionTest(APITestCase):
+    """
+    Etkinlik yanıtlarında ?fields= ve ?expand= testleri
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        token = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token.access_token}')
+
+        self.calendar = Calendar.objects.create(name='İş', user=self.user)
+        start = timezone.now() + timedelta(hours=2)
+        self.event = Event.objects.create(
+            title='Toplantı', user=self.user, calendar=self.calendar,
+            start_time=start, end_time=start + timedelta(hours=1)
+        )
+        guest = User.objects.create_user(email='guest@example.com', username='guest', password='testpass123')
+        EventParticipant.objects.create(event=self.event, user=guest)
+
+    def test_detail_expand_selects_relations(self):
+        """
+        Sadece genişletilen ilişki yüklenir; diğerleri id'ye indirgenir veya çıkarılır
+        """
+        url = reverse('calendar_app:event-detail', kwargs={'pk': self.event.pk})
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'fields': 'title,calendar,participants.user_email,reminders', 'expand': 'participants'})
+
+        self.assertEqual(response.data, {
+            'title': 'Toplantı',
+            'calendar': self.calendar.pk,
+            'participants': [{'user_email': 'guest@example.com'}],
+        })
+        sql = ' '.join(query['sql'] for query in queries.captured_queries)
+        self.assertNotIn('calendar_app_eventreminder', sql)
+        self.assertNotIn('calendar_app_calendar', sql)
+
+    def test_list_fields(self):
+        """
+        Etkinlik ve takvim listeleri yalnızca seçilen alanları döndürür
+        """
+        response = self.client.get(reverse('calendar_app:event-list-create'), {'fields': 'title,is_upcoming'})
+        self.assertEqual(response.data['results'], [{'title': 'Toplantı', 'is_upcoming': True}])
+
+        response = self.client.get(reverse('calendar_app:calendar-list-create'), {'fields': 'name,event_count'})
+        self.assertEqual(response.data['results'], [{'name': 'İş', 'event_count': 1}])
+
+
+class CalendarGridTest(APITestCase):
+    """
+    Ay / hafta ızgarası: tekrar açma, günlere bölme ve sütun atama testleri
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        token = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token.access_token}')
+        self.calendar = Calendar.objects.create(name='İş', user=self.user, color='#ff0000')
+        self.url = reverse('calendar_app:calendar-grid')
+
+    def local(self, *args):
+        return timezone.make_aware(datetime(*args))
+
+    def create(self, title, start, end, **extra):
+        return Event.objects.create(
+            title=title, user=self.user, calendar=self.calendar, start_time=start, end_time=end, **extra
+        )
+
+    def day(self, data, value):
+        return next(day for day in data['days'] if day['date'] == value)
+
+    def test_week_overlaps_get_columns(self):
+        """
+        Çakışan etkinlikler farklı sütunlara, ayrık olanlar tekrar ilk sütuna yerleşir
+        """
+        self.create('A', self.local(2025, 9, 16, 9), self.local(2025, 9, 16, 11))
+        self.create('B', self.local(2025, 9, 16, 10), self.local(2025, 9, 16, 12))
+        self.create('C', self.local(2025, 9, 16, 10, 30), self.local(2025, 9, 16, 11, 30))
+        self.create('D', self.local(2025, 9, 16, 14), self.local(2025, 9, 16, 15))
+
+        response = self.client.get(self.url, {'view': 'week', 'date': '2025-09-18'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data['start'], response.data['end']), ('2025-09-15', '2025-09-21'))
+        self.assertEqual(len(response.data['days']), 7)
+
+        layout = {event['title']: (event['column'], event['columns']) for event in self.day(response.data, '2025-09-16')['events']}
+        self.assertEqual(layout, {'A': (0, 3), 'B': (1, 3), 'C': (2, 3), 'D': (0, 1)})
+
+    def test_multi_day_event_is_split_in_local_days(self):
+        """
+        Gece yarısını geçen etkinlik yerel gün sınırında iki parçaya bölünür
+        """
+        self.create('Gece nöbeti', self.local(2025, 9, 16, 22), self.local(2025, 9, 17, 6))
+        data = self.client.get(self.url, {'view': 'week', 'date': '2025-09-16'}).data
+
+        first = self.day(data, '2025-09-16')['events'][0]
+        second = self.day(data, '2025-09-17')['events'][0]
+        self.assertEqual(first['segment_end'], '2025-09-17T00:00:00+03:00')
+        self.assertTrue(first['continues_after'])
+        self.assertEqual(second['segment_start'], '2025-09-17T00:00:00+03:00')
+        self.assertTrue(second['continues_before'])
+        self.assertEqual(second['start_time'], '2025-09-16T22:00:00+03:00')
+
+    def test_recurrences_are_expanded(self):
+        """
+        Haftalık tekrar ay ızgarasındaki her haftaya, bitiş tarihine kadar açılır
+        """
+        self.create(
+            'Haftalık toplantı', self.local(2025, 6, 2, 10), self.local(2025, 6, 2, 11),
+            is_recurring=True, recurrence_pattern='weekly', recurrence_end_date=self.local(2025, 9, 16)
+        )
+        self.create('Tatil', self.local(2025, 9, 1), self.local(2025, 9, 2), is_all_day=True)
+
+        data = self.client.get(self.url, {'view': 'month', 'date': '2025-09-10'}).data
+        # Eylül 2025: 1 Eylül Pazartesi, ızgara 5 Ekim Pazar'a kadar
+        self.assertEqual((data['start'], data['end']), ('2025-09-01', '2025-10-05'))
+        meeting_days = [day['date'] for day in data['days'] if day['events']]
+        self.assertEqual(meeting_days, ['2025-09-01', '2025-09-08', '2025-09-15'])
+        self.assertEqual(self.day(data, '2025-09-01')['all_day'][0]['title'], 'Tatil')
+        self.assertEqual(self.day(data, '2025-09-08')['events'][0]['start_time'], '2025-09-08T10:00:00+03:00')
+
+    def test_invalid_parameters(self):
+        """
+        Geçersiz görünüm veya tarih 400 döner
+        """
+        self.assertEqual(self.client.get(self.url, {'view': 'year'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.url, {'date': '16.09.2025'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_user_timezone_sets_local_days(self):
+        """
+        Kullanıcının zaman dilimi seçiliyse gün sınırları ona göre hesaplanır
+        """
+        self.user.timezone = 'America/New_York'
+        self.user.save(update_fields=['timezone'])
+        # İstanbul'da 17 Eylül 02:00, New York'ta 16 Eylül 19:00
+        self.create('Akşam', self.local(2025, 9, 17, 2), self.local(2025, 9, 17, 3))
+
+        data = self.client.get(self.url, {'view': 'week', 'date': '2025-09-16'}).data
+        self.assertEqual(data['timezone'], 'America/New_York')
+        self.assertEqual([day['date'] for day in data['days'] if day['events']], ['2025-09-16'])
+        self.assertEqual(self.day(data, '2025-09-16')['events'][0]['start_time'], '2025-09-16T19:00:00-04:00')
+
+    def test_date_window_ranges(self):
+        """
+        DateWindow yerel gün, hafta ve ay sınırlarını UTC aralık olarak verir
+        """
+        window = DateWindow(timezone.get_current_timezone(), now=self.local(2025, 9, 17, 1))
+        self.assertEqual(window.today.isoformat(), '2025-09-17')
+        self.assertEqual(window.day(), (self.local(2025, 9, 17), self.local(2025, 9, 18)))
+        self.assertEqual(window.week(), (self.local(2025, 9, 15), self.local(2025, 9, 22)))
+        self.assertEqual(window.month(), (self.local(2025, 9, 1), self.local(2025, 10, 1)))
+
+
+class PublicCalendarTest(APITestCase):
+    """
+    Herkese açık takvimler, paylaşılan etkinlikler ve .ics yayını testleri
+    """
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(email='owner@example.com', username='owner', password='testpass123')
+        self.viewer = User.objects.create_user(email='viewer@example.com', username='viewer', password='testpass123')
+        self.public = Calendar.objects.create(name='Resmi Tatiller', user=self.owner, is_public=True)
+        self.hidden = Calendar.objects.create(name='Gizli', user=self.owner)
+        # Kurulum verisi commit edilmiş sayılır (bekleyen yayın güncellemesi burada çalışır)
+        with self.captureOnCommitCallbacks(execute=True):
+            start = timezone.make_aware(datetime(2030, 5, 1, 10))
+            self.event = Event.objects.create(
+                title='Bahar, Şenliği; açılış', calendar=self.public, user=self.owner,
+                start_time=start, end_time=start + timedelta(hours=2), location='Meydan',
+            )
+            Event.objects.create(
+                title='Özel', calendar=self.public, user=self.owner, is_private=True,
+                start_time=start, end_time=start + timedelta(hours=1),
+            )
+            Event.objects.create(
+                title='Gizli takvim', calendar=self.hidden, user=self.owner,
+                start_time=start, end_time=start + timedelta(hours=1),
+            )
+        token = RefreshToken.for_user(self.viewer)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token.access_token}')
+        self.feed_url = reverse('calendar_app:calendar-feed', args=[self.public.pk])
+
+    def test_public_calendar_endpoints(self):
+        """
+        Başka kullanıcı herkese açık takvimi ve özel olmayan etkinliklerini görür
+        """
+        response = self.client.get(reverse('calendar_app:public-calendar-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['name'] for item in response.data['results']], ['Resmi Tatiller'])
+        self.assertEqual(response.data['results'][0]['owner'], 'owner')
+        self.assertEqual(response.data['results'][0]['event_count'], 1)
+        self.assertTrue(response.data['results'][0]['feed_url'].endswith(self.feed_url))
+
+        response = self.client.get(reverse('calendar_app:calendar-events', args=[self.public.pk]))
+        self.assertEqual([item['title'] for item in response.data['results']], ['Bahar, Şenliği; açılış'])
+
+        response = self.client.get(reverse('calendar_app:calendar-events', args=[self.hidden.pk]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(reverse('calendar_app:public-calendar-detail', args=[self.hidden.pk]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.patch(reverse('calendar_app:calendar-detail', args=[self.public.pk]), {'name': 'x'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_participant_can_read_shared_event(self):
+        """
+        Katılımcı etkinliği okuyabilir ama değiştiremez; diğerleri göremez
+        """
+        url = reverse('calendar_app:event-detail', args=[self.event.pk])
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+        EventParticipant.objects.create(event=self.event, user=self.viewer)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['title'], self.event.title)
+        self.assertEqual(self.client.patch(url, {'title': 'Değişti'}).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_feed_renders_ics_and_uses_etag(self):
+        """
+        Yayın anonim sunulur, önbellekten gelir ve If-None-Match ile 304 döner
+        """
+        client = APIClient()
+        response = client.get(self.feed_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/calendar; charset=utf-8')
+        body = response.content.decode()
+        self.assertTrue(body.startswith('BEGIN:VCALENDAR\r\n'))
+        self.assertIn('SUMMARY:Bahar\\, Şenliği\\; açılış\r\n', body)
+        self.assertIn('DTSTART:20300501T070000Z\r\n', body)
+        self.assertNotIn('Özel', body)
+        etag = response['ETag']
+
+        # Yalnızca takvimin sürümü (updated_at) okunur
+        with self.assertNumQueries(1):
+            response = client.get(self.feed_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+
+        self.assertEqual(client.get(reverse('calendar_app:calendar-feed', args=[self.hidden.pk])).status_code, 404)
+
+    def test_feed_invalidated_on_change(self):
+        """
+        Etkinlik değişince veya takvim gizlenince önbellekteki yayın kullanılmaz
+        """
+        client = APIClient()
+        etag = client.get(self.feed_url)['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.title = 'Yeni başlık'
+            self.event.save()
+        response = client.get(self.feed_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('SUMMARY:Yeni başlık', response.content.decode())
+
+        # Başka takvime taşınan etkinlik eski takvimin yayınından çıkar
+        with self.captureOnCommitCallbacks(execute=True):
+            moved = Event.objects.get(pk=self.event.pk)
+            moved.calendar = self.hidden
+            moved.save()
+        self.assertNotIn('Yeni başlık', client.get(self.feed_url).content.decode())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.public.is_public = False
+            self.public.save()
+        self.assertEqual(client.get(self.feed_url).status_code, 404)
+
+    def test_feed_invalidated_once_per_transaction(self):
+        """
+        Aynı transaction'daki değişiklikler takvimi commit'te bir kez günceller; silme de geçersiz kılar
+        """
+        client = APIClient()
+        etag = client.get(self.feed_url)['ETag']
+
+        with CaptureQueriesContext(connection) as queries:
+            with self.captureOnCommitCallbacks(execute=True):
+                with transaction.atomic():
+                    for title in ('Birinci', 'İkinci', 'Üçüncü'):
+                        self.event.title = title
+                        self.event.save()
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE "calendar_app_calendar"')]
+        self.assertEqual(len(updates), 1)
+        response = client.get(self.feed_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertIn('SUMMARY:Üçüncü', response.content.decode())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Event.objects.get(pk=self.event.pk).delete()
+        self.assertNotIn('Üçüncü', client.get(self.feed_url).content.decode())
+
+    def test_feed_all_day_dates_in_owner_timezone(self):
+        """
+        Tüm gün etkinlikleri sunucunun değil takvim sahibinin zaman diliminde tarihlenir
+        """
+        self.owner.timezone = 'America/New_York'
+        self.owner.save()
+        start = datetime(2030, 7, 4, tzinfo=zoneinfo.ZoneInfo('America/New_York'))
+        Event.objects.create(
+            title='Bağımsızlık Günü', calendar=self.public, user=self.owner, is_all_day=True,
+            start_time=start, end_time=start + timedelta(days=1),
+        )
+
+        body = APIClient().get(self.feed_url).content.decode()
+        self.assertIn('X-WR-TIMEZONE:America/New_York\r\n', body)
+        self.assertIn('DTSTART;VALUE=DATE:20300704\r\n', body)
+        self.assertIn('DTEND;VALUE=DATE:20300705\r\n', body)
+
+    def test_feed_invalidated_across_worker_caches(self):
+        """
+        Yazmayı başka bir worker (ayrı yerel önbellek) yapsa da yayın güncel olmalı
+        """
+        client = APIClient()
+        etag = client.get(self.feed_url)['ETag']
+
+        with mock.patch.object(feeds, 'cache', LocMemCache('other-worker', {})):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.event.title = 'Diğer worker'
+                self.event.save()
+
+        response = client.get(self.feed_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('SUMMARY:Diğer worker', response.content.decode())
+
+    def test_feed_text_helpers(self):
+        """
+        Uzun satırlar 75 oktette katlanır, tüm gün etkinlikleri tarih olarak yazılır
+        """
+        line = 'DESCRIPTION:' + 'ğ' * 60
+        folded = feeds.fold(line)
+        self.assertTrue(all(len(part.encode()) <= 75 for part in folded.split('\r\n')))
+        self.assertEqual(folded.replace('\r\n ', ''), line)
+
+        start = timezone.make_aware(datetime(2030, 1, 1))
+        row = {
+            'id': 1, 'title': 'Yılbaşı', 'description': '', 'location': None, 'start_time': start,
+            'end_time': start + timedelta(days=1), 'is_all_day': True, 'is_recurring': True,
+            'recurrence_pattern': 'yearly', 'recurrence_end_date': None, 'updated_at': start,
+        }
+        lines = feeds.event_lines(row, timezone.get_current_timezone())
+        self.assertIn('DTSTART;VALUE=DATE:20300101', lines)
+        self.assertIn('DTEND;VALUE=DATE:20300102', lines)
+        self.assertIn('RRULE:FREQ=YEARLY', lines)
+
+
+class AgendaTest(APITestCase):
+    """
+    Ajanda: sahip ve katılımcı etkinliklerinin tek sorguda birleşmesi testleri
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(email='test@example.com', username='testuser', password='testpass123')
+        self.other = User.objects.create_user(email='other@example.com', username='other', password='testpass123')
+        token = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token.access_token}')
+        self.url = reverse('calendar_app:agenda')
+
+        mine = Calendar.objects.create(name='Benim', user=self.user)
+        theirs = Calendar.objects.create(name='Onların', user=self.other)
+        start = timezone.make_aware(datetime(2025, 9, 16, 9))
+        self.own = self.create('Kendi toplantım', mine, self.user, start)
+        self.shared = self.create('Davet', theirs, self.other, start + timedelta(hours=2))
+        self.create('Davetsiz', theirs, self.other, start + timedelta(hours=3))
+        self.create('Gelecek ay', mine, self.user, start + timedelta(days=40))
+        EventParticipant.objects.create(event=self.shared, user=self.user, response_status='accepted')
+        # Sahibi olunan etkinliğe katılımcı eklemek satırı çoğaltmamalı
+        EventParticipant.objects.create(event=self.own, user=self.user, is_organizer=True)
+        EventParticipant.objects.create(event=self.own, user=self.other, response_status='declined')
+
+    def create(self, title, calendar, user, start):
+        return Event.objects.create(title=title, calendar=calendar, user=user,
+                                    start_time=start, end_time=start + timedelta(hours=1))
+
+    def test_agenda_unions_owned_and_participating(self):
+        """
+        Ajanda sahibi ve katılımcısı olunan etkinlikleri bir kez ve sıralı döndürür
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'start': '2025-09-15', 'days': 7})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # JWT kullanıcısı + tek UNION sorgusu
+        self.assertEqual(len(queries), 2)
+        self.assertEqual(
+            [(row['title'], row['is_owner'], row['response_status']) for row in response.data],
+            [('Kendi toplantım', True, None), ('Davet', False, 'accepted')],
+        )
+        self.assertEqual(response.data[1]['calendar_name'], 'Onların')
+
+        response = self.client.get(self.url, {'start': '2025-09-15', 'fields': 'id,response_status'})
+        self.assertEqual(set(response.data[0]), {'id', 'response_status'})
+
+    def test_agenda_invalid_parameters(self):
+        """
+        Geçersiz başlangıç tarihi veya gün sayısı 400 döner
+        """
+        self.assertEqual(self.client.get(self.url, {'start': '15.09.2025'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.url, {'days': 365}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_participant_permission_uses_loaded_flag(self):
+        """
+        Katılımcının detay erişimi nesneyle birlikte yüklenen işaretle kontrol edilir
+        """
+        url = reverse('calendar_app:event-detail', args=[self.shared.pk])
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'expand': ''})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # JWT kullanıcısı + etkinlik (katılım EXISTS alt sorgusuyla)
+        self.assertEqual(len(queries), 2)
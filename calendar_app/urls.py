@@ -3,7 +3,10 @@ from .views import (
     CalendarListCreateView, CalendarDetailView,
     EventListCreateView, EventDetailView,
     today_events, upcoming_events,
-    add_event_participant, calendar_statistics
+    add_event_participant, start_event_attachment_upload, download_event_attachment,
+    calendar_grid, calendar_statistics,
+    PublicCalendarListView, PublicCalendarDetailView, CalendarEventListView, calendar_feed,
+    my_agenda
 )
 
 app_name = 'calendar_app'
@@ -12,14 +15,22 @@ urlpatterns = [
     # Takvim endpoints
     path('calendars/', CalendarListCreateView.as_view(), name='calendar-list-create'),
     path('calendars/<int:pk>/', CalendarDetailView.as_view(), name='calendar-detail'),
+    path('calendars/<int:pk>/events/', CalendarEventListView.as_view(), name='calendar-events'),
+    path('calendars/<int:pk>/feed.ics', calendar_feed, name='calendar-feed'),
+    path('public/', PublicCalendarListView.as_view(), name='public-calendar-list'),
+    path('public/<int:pk>/', PublicCalendarDetailView.as_view(), name='public-calendar-detail'),
     
     # Etkinlik endpoints
     path('events/', EventListCreateView.as_view(), name='event-list-create'),
     path('events/<int:pk>/', EventDetailView.as_view(), name='event-detail'),
     path('events/<int:pk>/participants/', add_event_participant, name='event-add-participant'),
+    path('events/<int:pk>/attachments/', start_event_attachment_upload, name='event-attachment-upload'),
+    path('attachments/<int:pk>/download/', download_event_attachment, name='event-attachment-download'),
     
     # Özel endpoints
     path('events/today/', today_events, name='today-events'),
     path('events/upcoming/', upcoming_events, name='upcoming-events'),
+    path('grid/', calendar_grid, name='calendar-grid'),
+    path('agenda/', my_agenda, name='agenda'),
     path('statistics/', calendar_statistics, name='calendar-statistics'),
 ]
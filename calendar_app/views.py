@@ -1,15 +1,31 @@
 from django.shortcuts import render
+from django.http import Http404, HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from django.views.decorators.http import require_safe
 from rest_framework import generics, status, permissions, filters
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from django.utils import timezone
+from django.db.models import Q
 from datetime import timedelta, datetime
-from .models import Calendar, Event, EventParticipant
+from .models import ArchivedEvent, Calendar, Event, EventAttachment, EventParticipant
 from .serializers import (
     CalendarSerializer, EventListSerializer, EventDetailSerializer,
-    EventCreateSerializer, EventParticipantCreateSerializer
+    EventCreateSerializer, EventParticipantCreateSerializer, EventListReadSerializer,
+    PublicCalendarSerializer, AgendaReadSerializer
 )
+from todocalendar_project.archive import include_archived, union_with_archived
+from todocalendar_project.dates import date_window
+from todocalendar_project.field_selection import FieldSelectionFilter, requested_fields
+from todocalendar_project.query_inspector import query_budget
+from todocalendar_project.renderers import DownloadRenderer, FastJSONRenderer
+from todocalendar_project.routers import read_replica
+from uploads.serving import serve_attachment
+from uploads.views import start_upload_response
+from .agenda import AGENDA_DEFAULT_DAYS, AGENDA_MAX_DAYS, agenda_queryset, visible_events
+from .feeds import build_feed, get_options as get_feed_options
+from .grid import MONTH, VIEWS, build_grid
 from .permissions import IsOwnerOrReadOnly, IsOwner, IsEventOwnerOrParticipant
 
 
@@ -19,7 +35,7 @@ class CalendarListCreateView(generics.ListCreateAPIView):
     """
     serializer_class = CalendarSerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [filters.SearchFilter, filters.OrderingFilter, FieldSelectionFilter]
     search_fields = ['name', 'description']
     ordering_fields = ['name', 'created_at']
     ordering = ['-created_at']
@@ -37,11 +53,16 @@ class CalendarDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
     serializer_class = CalendarSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwner]
+    filter_backends = [FieldSelectionFilter]
+    # IsOwner izni için only() ile birlikte yüklenir
+    required_fields = ('user',)
 
     def get_queryset(self):
         return Calendar.objects.filter(user=self.request.user)
 
 
+@read_replica
+@query_budget(4)
 class EventListCreateView(generics.ListCreateAPIView):
     """
     Etkinlik listesi ve oluşturma
@@ -61,19 +82,138 @@ class EventListCreateView(generics.ListCreateAPIView):
             return EventCreateSerializer
         return EventListSerializer
 
+    def list(self, request, *args, **kwargs):
+        """
+        Liste .values() satırlarından hızlı serializer ile üretilir;
+        ?fields= ile yalnızca seçilen alanların sütunları çekilir,
+        ?include_archived=true ile arşivlenmiş kayıtlar da eklenir
+        """
+        fields = requested_fields(request)
+        live = self.filter_queryset(self.get_queryset())
+        if include_archived(request):
+            archived = ArchivedEvent.objects.filter(user=request.user)
+            ordering = filters.OrderingFilter().get_ordering(request, archived, self)
+            # UNION sonucu yalnızca seçilen sütunlarla sıralanabilir
+            extra = [field.lstrip('-') for field in ordering]
+            queryset = union_with_archived(
+                EventListReadSerializer.values(live, fields, extra),
+                EventListReadSerializer.values(self.filter_queryset(archived), fields, extra),
+                ordering,
+            )
+        else:
+            queryset = EventListReadSerializer.values(live, fields)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(EventListReadSerializer(page, fields=fields).data)
+        return Response(EventListReadSerializer(queryset, fields=fields).data)
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
 
 class EventDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
-    Etkinlik detayı, güncelleme ve silme
+    Etkinlik detayı, güncelleme ve silme (katılımcılar yalnızca okuyabilir)
     """
     serializer_class = EventDetailSerializer
-    permission_classes = [permissions.IsAuthenticated, IsOwner]
+    permission_classes = [permissions.IsAuthenticated, IsEventOwnerOrParticipant]
+    filter_backends = [FieldSelectionFilter]
+    # İzin kontrolü için only() ile birlikte yüklenir
+    required_fields = ('user',)
 
     def get_queryset(self):
-        return Event.objects.filter(user=self.request.user)
+        return visible_events(self.request.user)
+
+
+@read_replica
+@query_budget(3)
+class PublicCalendarListView(generics.ListAPIView):
+    """
+    Herkese açık takvimler
+    """
+    serializer_class = PublicCalendarSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    filter_backends = [filters.SearchFilter, filters.OrderingFilter, FieldSelectionFilter]
+    search_fields = ['name', 'description', 'user__username']
+    ordering_fields = ['name', 'updated_at']
+    ordering = ['name']
+
+    def get_queryset(self):
+        return Calendar.objects.filter(is_public=True)
+
+
+@read_replica
+@query_budget(2)
+class PublicCalendarDetailView(generics.RetrieveAPIView):
+    """
+    Herkese açık takvim detayı
+    """
+    serializer_class = PublicCalendarSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    filter_backends = [FieldSelectionFilter]
+
+    def get_queryset(self):
+        return Calendar.objects.filter(is_public=True)
+
+
+@read_replica
+@query_budget(4)
+class CalendarEventListView(generics.ListAPIView):
+    """
+    Takvimin etkinlikleri: kendi takvimi veya başkasının herkese açık takvimi
+    (başkalarına özel etkinlikler gösterilmez)
+    """
+    serializer_class = EventListSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    search_fields = ['title', 'description', 'location']
+    ordering_fields = ['title', 'start_time']
+    ordering = ['start_time']
+
+    def get_queryset(self):
+        user = self.request.user
+        owner_id = Calendar.objects.filter(
+            Q(user=user) | Q(is_public=True), pk=self.kwargs['pk']
+        ).values_list('user', flat=True).first()
+        if owner_id is None:
+            raise NotFound('Takvim bulunamadı')
+        events = Event.objects.filter(calendar_id=self.kwargs['pk'])
+        if owner_id != user.pk:
+            events = events.filter(is_private=False)
+        return events
+
+    def list(self, request, *args, **kwargs):
+        fields = requested_fields(request)
+        queryset = EventListReadSerializer.values(self.filter_queryset(self.get_queryset()), fields)
+        now = date_window(request).now
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(EventListReadSerializer(page, now=now, fields=fields).data)
+        return Response(EventListReadSerializer(queryset, now=now, fields=fields).data)
+
+
+# Yayın replikadan okunmaz: geçersiz kılmadan hemen sonra gecikmeli replikadan
+# üretilen eski yayın yeni sürümün önbelleğine yazılabilirdi
+@query_budget(2)
+@require_safe
+def calendar_feed(request, pk):
+    """
+    Herkese açık takvimin iCalendar (.ics) yayını; kimlik doğrulaması gerekmez.
+
+    Yanıt önbellekten ETag ile sunulur; If-None-Match eşleşirse gövdesiz 304 döner.
+    """
+    feed = build_feed(pk)
+    if feed is None:
+        raise Http404('Takvim bulunamadı')
+
+    headers = {
+        'ETag': feed['etag'],
+        'Cache-Control': f"public, max-age={get_feed_options()['MAX_AGE']}",
+    }
+    if_none_match = parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))
+    if feed['etag'] in if_none_match or '*' in if_none_match:
+        return HttpResponseNotModified(headers=headers)
+    return HttpResponse(feed['body'], content_type='text/calendar; charset=utf-8', headers=headers)
 
 
 @api_view(['POST'])
@@ -97,29 +237,69 @@ def add_event_participant(request, pk):
         )
 
 
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def start_event_attachment_upload(request, pk):
+    """
+    Etkinliğe parça parça ek yüklemeyi başlat
+    """
+    if not Event.objects.filter(pk=pk, user=request.user).exists():
+        return Response(
+            {'error': 'Etkinlik bulunamadı'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    return start_upload_response(request, 'event', pk)
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+@renderer_classes([FastJSONRenderer, DownloadRenderer])
+def download_event_attachment(request, pk):
+    """
+    Etkinlik ekini indir; sahibi ve katılımcıları erişebilir (Range ve ETag destekli)
+    """
+    attachment = EventAttachment.objects.select_related('blob').filter(
+        Q(event__user=request.user) | Q(event__participants__user=request.user),
+        pk=pk,
+    ).first()
+    if attachment is None:
+        return Response(
+            {'error': 'Ek bulunamadı'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    return serve_attachment(request, attachment)
+
+
+@read_replica
+@query_budget(2)
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def today_events(request):
     """
     Bugünkü etkinlikler
     """
-    today = timezone.now().date()
+    window = date_window(request)
+    day_start, day_end = window.day()
     events = Event.objects.filter(
         user=request.user,
-        start_time__date=today
+        start_time__gte=day_start,
+        start_time__lt=day_end
     ).order_by('start_time')
     
-    serializer = EventListSerializer(events, many=True)
+    fields = requested_fields(request)
+    serializer = EventListReadSerializer(EventListReadSerializer.values(events, fields), now=window.now, fields=fields)
     return Response(serializer.data)
 
 
+@read_replica
+@query_budget(2)
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def upcoming_events(request):
     """
     Yaklaşan etkinlikler
     """
-    now = timezone.now()
+    now = date_window(request).now
     upcoming_date = now + timedelta(days=7)
     
     events = Event.objects.filter(
@@ -127,10 +307,74 @@ def upcoming_events(request):
         start_time__range=[now, upcoming_date]
     ).order_by('start_time')
     
-    serializer = EventListSerializer(events, many=True)
+    fields = requested_fields(request)
+    serializer = EventListReadSerializer(EventListReadSerializer.values(events, fields), now=now, fields=fields)
     return Response(serializer.data)
 
 
+@read_replica
+@query_budget(2)
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def calendar_grid(request):
+    """
+    Ay / hafta ızgarası: yerel günlere yerleştirilmiş ve sütunları atanmış etkinlikler
+    """
+    window = date_window(request)
+    view = request.query_params.get('view', MONTH)
+    if view not in VIEWS:
+        return Response(
+            {'error': 'view parametresi month veya week olmalı'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        day = datetime.strptime(request.query_params['date'], '%Y-%m-%d').date()
+    except KeyError:
+        day = window.today
+    except ValueError:
+        return Response(
+            {'error': 'date parametresi YYYY-MM-DD biçiminde olmalı'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    return Response(build_grid(request.user, view, day, window.tz))
+
+
+@read_replica
+@query_budget(2)
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def my_agenda(request):
+    """
+    Ajanda: sahibi ve katılımcısı olunan etkinlikler (katılım yanıtıyla), tek sorguda
+    """
+    window = date_window(request)
+    try:
+        first = datetime.strptime(request.query_params['start'], '%Y-%m-%d').date()
+    except KeyError:
+        first = window.today
+    except ValueError:
+        return Response(
+            {'error': 'start parametresi YYYY-MM-DD biçiminde olmalı'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        days = int(request.query_params.get('days', AGENDA_DEFAULT_DAYS))
+    except ValueError:
+        days = 0
+    if not 1 <= days <= AGENDA_MAX_DAYS:
+        return Response(
+            {'error': f'days parametresi 1 ile {AGENDA_MAX_DAYS} arasında olmalı'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    start, end = window.days(days, first)
+    fields = requested_fields(request)
+    rows = agenda_queryset(request.user, start, end, AgendaReadSerializer, fields)
+    return Response(AgendaReadSerializer(rows, now=window.now, fields=fields).data)
+
+
+@read_replica
+@query_budget(5)
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def calendar_statistics(request):
@@ -138,16 +382,17 @@ def calendar_statistics(request):
     Takvim istatistikleri
     """
     user_events = Event.objects.filter(user=request.user)
-    today = timezone.now().date()
+    # Gün sınırları aralık olarak verilir ki index ve bölüm budama kullanılabilsin
+    day_start, day_end = date_window(request).day()
     
     stats = {
         'total_events': user_events.count(),
-        'today_events': user_events.filter(start_time__date=today).count(),
+        'today_events': user_events.filter(start_time__gte=day_start, start_time__lt=day_end).count(),
         'upcoming_events': user_events.filter(
-            start_time__date__gt=today
+            start_time__gte=day_end
         ).count(),
         'past_events': user_events.filter(
-            start_time__date__lt=today
+            start_time__lt=day_start
         ).count(),
     }
     
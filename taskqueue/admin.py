@@ -0,0 +1,15 @@
+from django.contrib import admin
+
+from .models import Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    """
+    Kuyruk işleri admin paneli
+    """
+    list_display = ('name', 'status', 'attempts', 'max_attempts', 'run_at', 'locked_by', 'finished_at')
+    list_filter = ('status', 'name')
+    search_fields = ('name', 'idempotency_key')
+    readonly_fields = ('attempts', 'last_error', 'locked_by', 'locked_at', 'created_at', 'finished_at')
+    ordering = ('-created_at',)
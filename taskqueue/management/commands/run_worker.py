@@ -0,0 +1,50 @@
+import os
+import signal
+import socket
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from taskqueue.queue import get_options, prune_finished, run_once
+
+
+class Command(BaseCommand):
+    """
+    Veritabanı kuyruğundaki işleri çalıştıran worker.
+    Birden fazla kopya paralel çalıştırılabilir (işler SKIP LOCKED ile paylaşılır);
+    SIGTERM/SIGINT alındığında elindeki partiyi bitirip çıkar.
+    """
+    help = 'Kuyruktaki arka plan işlerini çalıştırır'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=get_options()['BATCH_SIZE'])
+        parser.add_argument('--poll-interval', type=float, default=get_options()['POLL_INTERVAL'], help='Kuyruk boşken bekleme (sn)')
+        parser.add_argument('--once', action='store_true', help='Sıradaki işleri bitirip çık')
+        parser.add_argument('--prune-days', type=int, help='Başlarken bu kadar günden eski bitmiş işleri sil')
+
+    def handle(self, *args, **options):
+        worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        self.stopping = False
+        previous = {signum: signal.signal(signum, self.stop) for signum in (signal.SIGTERM, signal.SIGINT)}
+
+        if options['prune_days'] is not None:
+            self.stdout.write(f"{prune_finished(options['prune_days'])} eski iş silindi.")
+
+        total = 0
+        try:
+            while not self.stopping:
+                close_old_connections()
+                count = run_once(worker_id, options['batch_size'])
+                total += count
+                if options['once'] and count == 0:
+                    break
+                if count == 0:
+                    time.sleep(options['poll_interval'])
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+        self.stdout.write(self.style.SUCCESS(f'Worker {worker_id} durdu; {total} iş çalıştırıldı.'))
+
+    def stop(self, signum, frame):
+        self.stopping = True
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:52
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Task',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200, verbose_name='İş Adı')),
+                ('args', models.JSONField(blank=True, default=list, verbose_name='Argümanlar')),
+                ('kwargs', models.JSONField(blank=True, default=dict, verbose_name='Anahtar Argümanlar')),
+                ('status', models.CharField(choices=[('queued', 'Sırada'), ('running', 'Çalışıyor'), ('succeeded', 'Başarılı'), ('failed', 'Başarısız')], default='queued', max_length=10, verbose_name='Durum')),
+                ('priority', models.SmallIntegerField(default=0, verbose_name='Öncelik')),
+                ('run_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Çalışma Zamanı')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Deneme Sayısı')),
+                ('max_attempts', models.PositiveSmallIntegerField(default=3, verbose_name='En Fazla Deneme')),
+                ('idempotency_key', models.CharField(blank=True, max_length=200, null=True, unique=True, verbose_name='Tekillik Anahtarı')),
+                ('last_error', models.TextField(blank=True, verbose_name='Son Hata')),
+                ('locked_by', models.CharField(blank=True, max_length=100, verbose_name='Worker')),
+                ('locked_at', models.DateTimeField(blank=True, null=True, verbose_name='Alınma Zamanı')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Oluşturulma Tarihi')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Bitiş Tarihi')),
+            ],
+            options={
+                'verbose_name': 'İş',
+                'verbose_name_plural': 'İşler',
+                'indexes': [models.Index(condition=models.Q(('status', 'queued')), fields=['priority', 'run_at'], name='task_queued_idx'), models.Index(condition=models.Q(('status', 'running')), fields=['locked_at'], name='task_running_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,58 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Task(models.Model):
+    """
+    Veritabanı tabanlı kuyruktaki iş.
+
+    Worker'lar sıradaki işleri SELECT ... FOR UPDATE SKIP LOCKED ile alır;
+    aynı idempotency_key ile ikinci kez kuyruğa eklenen iş yeni kayıt oluşturmaz.
+    """
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'Sırada'),
+        (RUNNING, 'Çalışıyor'),
+        (SUCCEEDED, 'Başarılı'),
+        (FAILED, 'Başarısız'),
+    ]
+
+    name = models.CharField(max_length=200, verbose_name="İş Adı")
+    args = models.JSONField(default=list, blank=True, verbose_name="Argümanlar")
+    kwargs = models.JSONField(default=dict, blank=True, verbose_name="Anahtar Argümanlar")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED, verbose_name="Durum")
+    # Küçük değer önce çalışır
+    priority = models.SmallIntegerField(default=0, verbose_name="Öncelik")
+    run_at = models.DateTimeField(default=timezone.now, verbose_name="Çalışma Zamanı")
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name="Deneme Sayısı")
+    max_attempts = models.PositiveSmallIntegerField(default=3, verbose_name="En Fazla Deneme")
+    idempotency_key = models.CharField(max_length=200, unique=True, null=True, blank=True, verbose_name="Tekillik Anahtarı")
+    last_error = models.TextField(blank=True, verbose_name="Son Hata")
+    locked_by = models.CharField(max_length=100, blank=True, verbose_name="Worker")
+    locked_at = models.DateTimeField(null=True, blank=True, verbose_name="Alınma Zamanı")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Oluşturulma Tarihi")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="Bitiş Tarihi")
+
+    class Meta:
+        verbose_name = "İş"
+        verbose_name_plural = "İşler"
+        indexes = [
+            # Worker sorgusu: sıradaki işler öncelik ve zamana göre
+            models.Index(
+                fields=['priority', 'run_at'],
+                name='task_queued_idx',
+                condition=models.Q(status='queued'),
+            ),
+            # Takılan işlerin geri alınması
+            models.Index(
+                fields=['locked_at'],
+                name='task_running_idx',
+                condition=models.Q(status='running'),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
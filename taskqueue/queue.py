@@ -0,0 +1,284 @@
+"""
+Veritabanı tabanlı iş kuyruğu.
+
+İşler `@task` ile kaydedilir ve `.delay()` / `enqueue()` ile Task tablosuna
+yazılır. Kayıt çağıranın transaction'ına dahildir; transaction geri alınırsa
+iş de kuyruğa girmez. `run_worker` komutu işleri SKIP LOCKED ile alıp çalıştırır,
+hata alanları artan gecikmeyle tekrar dener.
+
+Çalışan iş HEARTBEAT_INTERVAL aralıklarla `locked_at`'i yeniler; yalnızca
+yenilenmeyen (worker'ı çökmüş) iş VISIBILITY_TIMEOUT sonunda tekrar sıraya
+girer, deneme hakkı bittiyse başarısız sayılır. Partideki her iş başlamadan
+hemen önce sahiplik yenilenir; bu arada başka bir worker'a geçen iş
+çalıştırılmaz. Sonuç yalnızca işi hâlâ aynı worker tutuyorsa yazılır.
+"""
+import logging
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from todocalendar_project.metrics import registry
+from .models import Task
+
+logger = logging.getLogger('todocalendar.tasks')
+
+TASK_QUEUE_DEFAULTS = {
+    # 'queue': iş tabloya yazılır ve worker çalıştırır; 'sync': commit sonrasında hemen çalışır (testler)
+    'MODE': 'queue',
+    'MAX_ATTEMPTS': 3,
+    # n. tekrar denemesi RETRY_DELAY * 2 ** (n - 1) saniye sonra
+    'RETRY_DELAY': 30,
+    # Bu süreden uzun 'running' kalan iş (çöken worker) tekrar sıraya alınır
+    'VISIBILITY_TIMEOUT': 600,
+    # Çalışan işin locked_at'i bu aralıkla yenilenir (VISIBILITY_TIMEOUT'tan küçük olmalı)
+    'HEARTBEAT_INTERVAL': 60,
+    'BATCH_SIZE': 10,
+    'POLL_INTERVAL': 1.0,
+}
+
+
+@dataclass(frozen=True)
+class TaskDefinition:
+    name: str
+    func: object
+    max_attempts: int = None
+
+
+task_registry = {}
+
+
+def get_options():
+    return {**TASK_QUEUE_DEFAULTS, **getattr(settings, 'TASK_QUEUE', {})}
+
+
+def task(name=None, max_attempts=None):
+    """
+    Fonksiyonu kuyruk işi olarak kaydet; `func.delay(*args, **kwargs)` ile kuyruğa eklenir.
+
+    Argümanlar JSON'a çevrilebilir olmalıdır (model yerine id gönderin).
+    """
+    def decorator(func):
+        task_name = name or f'{func.__module__}.{func.__name__}'
+        task_registry[task_name] = TaskDefinition(task_name, func, max_attempts)
+        func.task_name = task_name
+        func.delay = lambda *args, **kwargs: enqueue(task_name, args, kwargs)
+        return func
+    return decorator
+
+
+def enqueue(name, args=(), kwargs=None, idempotency_key=None, run_at=None, priority=0):
+    """
+    İşi kuyruğa ekle. Aynı idempotency_key ile eklenmiş iş varsa onu döndürür.
+    """
+    definition = task_registry.get(name)
+    if definition is None:
+        raise KeyError(f'Kayıtlı olmayan iş: {name}')
+
+    if get_options()['MODE'] == 'sync':
+        transaction.on_commit(lambda: definition.func(*args, **(kwargs or {})))
+        return None
+
+    fields = {
+        'name': name,
+        'args': list(args),
+        'kwargs': kwargs or {},
+        'priority': priority,
+        'run_at': run_at or timezone.now(),
+        'max_attempts': definition.max_attempts or get_options()['MAX_ATTEMPTS'],
+    }
+    if idempotency_key is None:
+        return Task.objects.create(**fields)
+
+    existing = Task.objects.filter(idempotency_key=idempotency_key).first()
+    if existing is not None:
+        return existing
+    try:
+        with transaction.atomic():
+            return Task.objects.create(idempotency_key=idempotency_key, **fields)
+    except IntegrityError:
+        # Eşzamanlı aynı anahtarlı ekleme kazandı
+        return Task.objects.get(idempotency_key=idempotency_key)
+
+
+def claim(worker_id, batch_size):
+    """
+    Zamanı gelmiş en fazla batch_size işi bu worker'a ayır.
+
+    Diğer worker'ların kilitlediği satırlar atlanır (SKIP LOCKED), böylece
+    worker'lar birbirini beklemeden farklı işleri alır.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            Task.objects.select_for_update(skip_locked=True)
+            .filter(status=Task.QUEUED, run_at__lte=now)
+            .order_by('priority', 'run_at')
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        if not ids:
+            return []
+        Task.objects.filter(pk__in=ids).update(
+            status=Task.RUNNING, locked_by=worker_id, locked_at=now, attempts=F('attempts') + 1
+        )
+    return list(Task.objects.filter(pk__in=ids).order_by('priority', 'run_at'))
+
+
+def claimed(task_obj):
+    """
+    İşi hâlâ bu worker tutuyorsa eşleşen queryset (tekrar sıraya alınmışsa boş)
+    """
+    return Task.objects.filter(pk=task_obj.pk, status=Task.RUNNING, locked_by=task_obj.locked_by)
+
+
+class Heartbeat:
+    """
+    İş çalışırken ayrı bir thread'de locked_at'i periyodik olarak yeniler
+    """
+    def __init__(self, task_obj, interval):
+        self.task_obj = task_obj
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def beat(self):
+        return claimed(self.task_obj).update(locked_at=timezone.now()) == 1
+
+    def _run(self):
+        try:
+            while not self._stop.wait(self.interval):
+                try:
+                    if not self.beat():
+                        return
+                except Exception:
+                    logger.exception('İş %s #%s için heartbeat yazılamadı', self.task_obj.name, self.task_obj.pk)
+        finally:
+            connection.close()
+
+    def __enter__(self):
+        if self.interval:
+            self._thread = threading.Thread(target=self._run, name=f'task-heartbeat-{self.task_obj.pk}', daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def execute(task_obj):
+    """
+    Ayrılmış işi çalıştırıp sonucunu kaydet; başarılıysa True döndür.
+
+    İş bu arada başka bir worker'a geçtiyse (sonuç 'lost') çalıştırılmaz ya da
+    durumu değiştirilmez.
+    """
+    # Partideki önceki işler VISIBILITY_TIMEOUT'u aşmış olabilir: sahiplik tek UPDATE ile
+    # yenilenir, iş tekrar sıraya alınıp başka bir worker'a geçtiyse burada çalıştırılmaz
+    if not claimed(task_obj).update(locked_at=timezone.now()):
+        logger.warning('İş %s #%s başlamadan başka bir worker\'a geçti; çalıştırılmadı', task_obj.name, task_obj.pk)
+        registry.inc('todocalendar_tasks_total', {'task': task_obj.name, 'outcome': 'lost'},
+                     'Çalıştırılan kuyruk işleri')
+        return False
+
+    definition = task_registry.get(task_obj.name)
+    started = time.perf_counter()
+    try:
+        if definition is None:
+            raise KeyError(f'Kayıtlı olmayan iş: {task_obj.name}')
+        with Heartbeat(task_obj, get_options()['HEARTBEAT_INTERVAL']):
+            definition.func(*task_obj.args, **task_obj.kwargs)
+    except Exception:
+        error = traceback.format_exc()[-4000:]
+        retry = definition is not None and task_obj.attempts < task_obj.max_attempts
+        if retry:
+            delay = get_options()['RETRY_DELAY'] * 2 ** (task_obj.attempts - 1)
+            updated = claimed(task_obj).update(
+                status=Task.QUEUED, run_at=timezone.now() + timedelta(seconds=delay),
+                last_error=error, locked_by='', locked_at=None,
+            )
+        else:
+            updated = claimed(task_obj).update(
+                status=Task.FAILED, last_error=error, finished_at=timezone.now()
+            )
+        outcome = 'retried' if retry else 'failed'
+        logger.warning('İş %s #%s başarısız (%s/%s deneme)', task_obj.name, task_obj.pk,
+                       task_obj.attempts, task_obj.max_attempts)
+    else:
+        updated = claimed(task_obj).update(status=Task.SUCCEEDED, finished_at=timezone.now())
+        outcome = 'succeeded'
+
+    if not updated:
+        logger.warning('İş %s #%s başka bir worker\'a geçti; sonucu yazılmadı', task_obj.name, task_obj.pk)
+        outcome = 'lost'
+
+    registry.inc('todocalendar_tasks_total', {'task': task_obj.name, 'outcome': outcome},
+                 'Çalıştırılan kuyruk işleri')
+    registry.observe_histogram('todocalendar_task_duration_seconds', {'task': task_obj.name},
+                               time.perf_counter() - started, 'Kuyruk işi çalışma süresi (saniye)')
+    return outcome == 'succeeded'
+
+
+def requeue_stale():
+    """
+    VISIBILITY_TIMEOUT boyunca heartbeat yazmayan 'running' işleri (çöken worker) tekrar
+    sıraya al; tekrar sıraya alınan iş sayısını döndür.
+
+    Deneme hakkı biten iş (ör. her seferinde worker'ı OOM/SIGKILL ile düşüren)
+    sonsuza dek dönmemesi için başarısız olarak işaretlenir.
+    """
+    now = timezone.now()
+    stale = Task.objects.filter(
+        status=Task.RUNNING, locked_at__lt=now - timedelta(seconds=get_options()['VISIBILITY_TIMEOUT'])
+    )
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status=Task.FAILED, finished_at=now,
+        last_error='Worker görünürlük süresi içinde heartbeat yazmadı (çöktü veya sonlandırıldı)',
+    )
+    if failed:
+        logger.warning('Deneme hakkı biten %s iş worker kaybı nedeniyle başarısız işaretlendi', failed)
+    return stale.filter(attempts__lt=F('max_attempts')).update(
+        status=Task.QUEUED, locked_by='', locked_at=None
+    )
+
+
+def run_once(worker_id, batch_size=None):
+    """
+    Bir parti iş al ve çalıştır; çalıştırılan iş sayısını döndür
+    """
+    requeue_stale()
+    tasks = claim(worker_id, batch_size or get_options()['BATCH_SIZE'])
+    for task_obj in tasks:
+        execute(task_obj)
+    return len(tasks)
+
+
+def collect_task_metrics():
+    """
+    Sıradaki ve çalışan iş sayılarını gauge olarak yaz (/metrics/ isteğinde)
+    """
+    counts = dict(
+        Task.objects.filter(status__in=[Task.QUEUED, Task.RUNNING])
+        .values_list('status').annotate(total=Count('pk')).order_by()
+    )
+    for status in (Task.QUEUED, Task.RUNNING):
+        registry.set('todocalendar_tasks_pending', {'status': status}, counts.get(status, 0),
+                     'Kuyrukta bekleyen / çalışan iş sayısı')
+
+
+def prune_finished(days):
+    """
+    days günden eski başarılı ve başarısız işleri sil
+    """
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted, _ = Task.objects.filter(
+        status__in=[Task.SUCCEEDED, Task.FAILED], finished_at__lt=cutoff
+    ).delete()
+    return deleted
@@ -0,0 +1,214 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from todocalendar_project.metrics import registry
+from .models import Task
+from .queue import Heartbeat, claim, collect_task_metrics, enqueue, execute, requeue_stale, run_once, task
+
+calls = []
+
+
+@task(name='taskqueue.tests.record')
+def record(value, suffix=''):
+    calls.append(f'{value}{suffix}')
+
+
+@task(name='taskqueue.tests.explode', max_attempts=2)
+def explode():
+    raise RuntimeError('patladı')
+
+
+@override_settings(TASK_QUEUE={'MODE': 'queue', 'RETRY_DELAY': 10})
+class TaskQueueTest(TestCase):
+    """
+    Veritabanı kuyruğu: ekleme, alma, tekrar deneme ve tekillik testleri
+    """
+    def setUp(self):
+        calls.clear()
+        registry.reset()
+
+    def test_delay_and_run(self):
+        """
+        Kuyruğa eklenen iş worker tarafından argümanlarıyla çalıştırılır
+        """
+        record.delay('a', suffix='!')
+        self.assertEqual(calls, [])
+
+        self.assertEqual(run_once('test-worker'), 1)
+        self.assertEqual(calls, ['a!'])
+        finished = Task.objects.get()
+        self.assertEqual(finished.status, Task.SUCCEEDED)
+        self.assertEqual(finished.attempts, 1)
+        self.assertIn('outcome="succeeded"', registry.render())
+
+    def test_idempotency_key_enqueues_once(self):
+        """
+        Aynı anahtarla ikinci ekleme mevcut işi döndürür
+        """
+        first = enqueue('taskqueue.tests.record', args=['x'], idempotency_key='rapor:1')
+        second = enqueue('taskqueue.tests.record', args=['x'], idempotency_key='rapor:1')
+        self.assertEqual(first.pk, second.pk)
+        self.assertEqual(Task.objects.count(), 1)
+
+    def test_claim_order_and_schedule(self):
+        """
+        Zamanı gelmemiş işler alınmaz, öncelikli iş önce alınır
+        """
+        enqueue('taskqueue.tests.record', args=['sonra'], run_at=timezone.now() + timedelta(hours=1))
+        enqueue('taskqueue.tests.record', args=['normal'])
+        enqueue('taskqueue.tests.record', args=['acil'], priority=-1)
+
+        claimed = claim('w1', 10)
+        self.assertEqual([item.args for item in claimed], [['acil'], ['normal']])
+        self.assertEqual(claim('w2', 10), [])
+        self.assertEqual(Task.objects.filter(status=Task.RUNNING, locked_by='w1').count(), 2)
+
+    def test_failed_task_is_retried_then_marked_failed(self):
+        """
+        Hata alan iş artan gecikmeyle tekrar sıraya girer, deneme hakkı bitince başarısız olur
+        """
+        explode.delay()
+        run_once('w1')
+        retried = Task.objects.get()
+        self.assertEqual(retried.status, Task.QUEUED)
+        self.assertIn('patladı', retried.last_error)
+        self.assertGreater(retried.run_at, timezone.now() + timedelta(seconds=5))
+
+        Task.objects.update(run_at=timezone.now())
+        run_once('w1')
+        failed = Task.objects.get()
+        self.assertEqual(failed.status, Task.FAILED)
+        self.assertEqual(failed.attempts, 2)
+        self.assertIsNotNone(failed.finished_at)
+
+    def test_unknown_task_fails_without_retry(self):
+        """
+        Kaydı olmayan iş tekrar denenmeden başarısız olur
+        """
+        Task.objects.create(name='silinmis.is')
+        self.assertFalse(execute(claim('w1', 1)[0]))
+        self.assertEqual(Task.objects.get().status, Task.FAILED)
+
+    def test_stale_running_task_is_requeued(self):
+        """
+        Çöken worker'ın aldığı iş görünürlük süresinden sonra tekrar sıraya girer
+        """
+        record.delay('takılan')
+        claim('olu-worker', 1)
+        Task.objects.update(locked_at=timezone.now() - timedelta(hours=1))
+
+        self.assertEqual(requeue_stale(), 1)
+        self.assertEqual(run_once('w2'), 1)
+        self.assertEqual(calls, ['takılan'])
+        self.assertEqual(Task.objects.get().attempts, 2)
+
+    def test_stale_task_out_of_attempts_marked_failed(self):
+        """
+        Worker'ı her seferinde düşüren iş deneme hakkı bitince tekrar sıraya girmemeli
+        """
+        explode.delay()
+        for _ in range(2):
+            claim('olu-worker', 1)
+            Task.objects.update(locked_at=timezone.now() - timedelta(hours=1))
+            requeue_stale()
+
+        failed = Task.objects.get()
+        self.assertEqual((failed.status, failed.attempts), (Task.FAILED, 2))
+        self.assertIn('heartbeat', failed.last_error)
+        self.assertIsNotNone(failed.finished_at)
+        self.assertEqual(run_once('w2'), 0)
+
+    def test_batch_task_lost_while_waiting_not_run(self):
+        """
+        Partide sırası gelmeden başka bir worker'a geçen iş bu worker'da çalıştırılmamalı
+        """
+        taken = []
+
+        @task(name='taskqueue.tests.long_first')
+        def long_first():
+            # Partideki ilk iş görünürlük süresini aştı; bekleyen iş ikinci worker'a geçti
+            Task.objects.filter(name='taskqueue.tests.record').update(locked_at=timezone.now() - timedelta(hours=1))
+            requeue_stale()
+            taken.extend(claim('w2', 1))
+
+        long_first.delay()
+        record.delay('bir kez')
+        first, waiting = claim('w1', 2)
+
+        self.assertTrue(execute(first))
+        self.assertFalse(execute(waiting))
+        self.assertEqual(calls, [])
+        self.assertTrue(execute(taken[0]))
+        self.assertEqual(calls, ['bir kez'])
+
+    def test_requeued_task_result_not_overwritten(self):
+        """
+        Çalışırken başka bir worker'a geçen işin sonucu yeni sahibinin durumunu ezmemeli
+        """
+        taken = []
+
+        @task(name='taskqueue.tests.slow')
+        def slow():
+            # Görünürlük süresi doldu ve iş ikinci worker'a geçti
+            Task.objects.update(locked_at=timezone.now() - timedelta(hours=1))
+            requeue_stale()
+            taken.extend(claim('w2', 1))
+
+        slow.delay()
+        self.assertFalse(execute(claim('w1', 1)[0]))
+
+        current = Task.objects.get()
+        self.assertEqual(len(taken), 1)
+        self.assertEqual((current.status, current.locked_by), (Task.RUNNING, 'w2'))
+        self.assertIsNone(current.finished_at)
+        self.assertTrue(execute(taken[0]))
+        self.assertEqual(Task.objects.get().status, Task.SUCCEEDED)
+
+    def test_heartbeat_keeps_long_task_claimed(self):
+        """
+        Heartbeat yazan iş görünürlük süresini aşsa da tekrar sıraya alınmamalı
+        """
+        record.delay('uzun')
+        task_obj = claim('w1', 1)[0]
+        Task.objects.update(locked_at=timezone.now() - timedelta(hours=1))
+
+        self.assertTrue(Heartbeat(task_obj, 60).beat())
+        self.assertEqual(requeue_stale(), 0)
+
+        # Sahipliği kaybeden worker heartbeat yazamaz
+        Task.objects.update(locked_by='w2')
+        self.assertFalse(Heartbeat(task_obj, 60).beat())
+
+    def test_queue_depth_metrics(self):
+        """
+        Bekleyen iş sayısı gauge olarak yazılır
+        """
+        record.delay('1')
+        record.delay('2')
+        collect_task_metrics()
+        self.assertIn('todocalendar_tasks_pending{status="queued"} 2', registry.render())
+
+    def test_run_worker_command_once(self):
+        """
+        run_worker --once sıradaki işleri bitirip çıkar
+        """
+        record.delay('komut')
+        out = StringIO()
+        call_command('run_worker', '--once', stdout=out)
+        self.assertEqual(calls, ['komut'])
+        self.assertIn('1 iş çalıştırıldı', out.getvalue())
+
+    @override_settings(TASK_QUEUE={'MODE': 'sync'})
+    def test_sync_mode_runs_after_commit(self):
+        """
+        sync modunda iş tabloya yazılmadan commit sonrasında çalışır
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            record.delay('hemen')
+            self.assertEqual(calls, [])
+        self.assertEqual(calls, ['hemen'])
+        self.assertFalse(Task.objects.exists())
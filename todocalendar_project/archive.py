@@ -0,0 +1,86 @@
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Value
+
+from uploads.pipeline import retain_blobs
+
+ARCHIVE_DEFAULTS = {
+    'TODO_DAYS': 90,
+    'EVENT_DAYS': 30,
+    'BATCH_SIZE': 500,
+}
+
+_ARCHIVE_ONLY_FIELDS = ('related', 'archived_at')
+
+
+def get_options():
+    return {**ARCHIVE_DEFAULTS, **getattr(settings, 'ARCHIVE', {})}
+
+
+def copy_fields(obj, archive_model):
+    """
+    Canlı kaydın arşiv tablosunda da bulunan sütunlarını (aynı id ile) kopyala
+    """
+    return {
+        field.attname: getattr(obj, field.attname)
+        for field in archive_model._meta.concrete_fields
+        if field.name not in _ARCHIVE_ONLY_FIELDS
+    }
+
+
+def archive_in_batches(queryset, archive_model, snapshot, batch_size=None, max_batches=None,
+                       pause=0, progress=None, after_delete=None):
+    """
+    queryset'teki kayıtları id sırasıyla partiler halinde arşiv tablosuna taşı.
+
+    Her parti tek transaction içinde kopyalanıp canlı tablodan silinir; bu
+    nedenle komut yarıda kesilirse tekrar çalıştırıldığında kaldığı yerden
+    devam eder. `snapshot(obj)` ilişkili kayıtları `related` JSON'una çevirir;
+    gereken prefetch'ler queryset'e eklenmiş olmalıdır. Arşivde aynı id ile
+    kayıt varsa parti IntegrityError ile geri alınır (canlı kayıt silinmez).
+    Toplu silme model sinyali göndermediğinden `after_delete(batch)` gerekli
+    yan etkiler için aynı transaction içinde çağrılır.
+    Taşınan kayıt sayısını döndürür.
+    """
+    batch_size = batch_size or get_options()['BATCH_SIZE']
+    moved = batches = 0
+
+    while max_batches is None or batches < max_batches:
+        with transaction.atomic():
+            batch = list(queryset.select_for_update(skip_locked=True, of=('self',)).order_by('pk')[:batch_size])
+            if not batch:
+                break
+            archive_model.objects.bulk_create(
+                [archive_model(**copy_fields(obj, archive_model), related=snapshot(obj)) for obj in batch],
+            )
+            # Arşivlenen kayıtların ek dosyaları `related` içinden erişilebilir kalır
+            with retain_blobs():
+                queryset.model.objects.filter(pk__in=[obj.pk for obj in batch]).delete()
+            if after_delete is not None:
+                after_delete(batch)
+
+        moved += len(batch)
+        batches += 1
+        if progress is not None:
+            progress(moved, batch[-1].pk)
+        if pause:
+            time.sleep(pause)
+    return moved
+
+
+def include_archived(request):
+    """
+    İstek arşivlenmiş kayıtları da istiyor mu (?include_archived=true)
+    """
+    return request.query_params.get('include_archived', '').lower() in ('1', 'true', 'yes')
+
+
+def union_with_archived(live, archived, ordering):
+    """
+    Canlı ve arşiv .values() queryset'lerini is_archived sütunuyla birleştirip sırala
+    """
+    live = live.order_by().annotate(is_archived=Value(False))
+    archived = archived.order_by().annotate(is_archived=Value(True))
+    return live.union(archived, all=True).order_by(*ordering)
@@ -0,0 +1,88 @@
+"""
+Kullanıcının yerel gün / hafta / ay sınırlarını istek başına bir kez UTC
+aralıklarına çeviren yardımcılar.
+
+`start_time__date=...` veya bir `date` ile karşılaştırma veritabanını her
+satırı yerel saate çevirmeye zorlar ve index kullanılamaz. Bunun yerine
+sınırlar burada hesaplanır ve sorgu [başlangıç, bitiş) aralığıyla yapılır:
+`start_time__gte=start, start_time__lt=end` (index range scan, bölüm budama).
+"""
+import datetime
+import zoneinfo
+
+from django.utils import timezone
+
+
+def user_timezone(user):
+    """
+    Kullanıcının seçtiği zaman dilimi; seçilmemiş veya geçersizse aktif zaman dilimi
+    """
+    name = getattr(user, 'timezone', '')
+    if name:
+        try:
+            return zoneinfo.ZoneInfo(name)
+        except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+            pass
+    return timezone.get_current_timezone()
+
+
+def local_midnight(day, tz):
+    """
+    Yerel günün başlangıcı (UTC)
+    """
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min), tz).astimezone(datetime.timezone.utc)
+
+
+def local_day_range(day, tz=None):
+    """
+    Yerel bir günün UTC [başlangıç, bitiş) aralığı
+    """
+    tz = tz or timezone.get_current_timezone()
+    return local_midnight(day, tz), local_midnight(day + datetime.timedelta(days=1), tz)
+
+
+class DateWindow:
+    """
+    Bir kullanıcının yerel takvim sınırları; aralıklar UTC döner.
+
+    `now` ve `today` bir kez hesaplanır, böylece aynı istekteki tüm sorgular
+    aynı anı kullanır.
+    """
+    def __init__(self, tz, now=None):
+        self.tz = tz
+        self.now = now or timezone.now()
+        self.today = timezone.localtime(self.now, tz).date()
+
+    def days(self, count, first=None):
+        """
+        first gününden (varsayılan bugün) başlayan count yerel günün aralığı
+        """
+        first = first or self.today
+        return local_midnight(first, self.tz), local_midnight(first + datetime.timedelta(days=count), self.tz)
+
+    def day(self, day=None):
+        return self.days(1, day)
+
+    def week(self, day=None):
+        """
+        Günün içinde bulunduğu Pazartesi-Pazar haftası
+        """
+        day = day or self.today
+        return self.days(7, day - datetime.timedelta(days=day.weekday()))
+
+    def month(self, day=None):
+        day = day or self.today
+        first = day.replace(day=1)
+        following = (first + datetime.timedelta(days=32)).replace(day=1)
+        return self.days((following - first).days, first)
+
+
+def date_window(request):
+    """
+    İsteğin kullanıcısına ait DateWindow (istek başına bir kez oluşturulur)
+    """
+    window = getattr(request, '_date_window', None)
+    if window is None:
+        window = DateWindow(user_timezone(request.user))
+        request._date_window = window
+    return window
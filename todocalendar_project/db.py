@@ -0,0 +1,61 @@
+import logging
+import time
+
+from django.db import connections
+
+from .metrics import registry
+
+logger = logging.getLogger('todocalendar.db')
+
+# psycopg_pool get_stats() anahtarı -> (metrik adı, açıklama)
+POOL_GAUGES = {
+    'pool_min': ('todocalendar_db_pool_min_size', 'Havuzun en az bağlantı sayısı'),
+    'pool_max': ('todocalendar_db_pool_max_size', 'Havuzun en fazla bağlantı sayısı'),
+    'pool_size': ('todocalendar_db_pool_size', 'Havuzdaki (kullanımdaki + boşta) bağlantı sayısı'),
+    'pool_available': ('todocalendar_db_pool_available', 'Havuzda boşta bekleyen bağlantı sayısı'),
+    'requests_waiting': ('todocalendar_db_pool_requests_waiting', 'Bağlantı bekleyen istek sayısı'),
+}
+
+
+def get_pool(alias):
+    """
+    Bağlantı havuzu yapılandırılmışsa psycopg ConnectionPool nesnesi, değilse None
+    """
+    return getattr(connections[alias], 'pool', None)
+
+
+def pool_stats(alias):
+    pool = get_pool(alias)
+    if pool is None:
+        return None
+    stats = pool.get_stats()
+    return {key: stats.get(key, 0) for key in POOL_GAUGES}
+
+
+def collect_pool_metrics():
+    """
+    Havuz kullanan tüm veritabanları için havuz boyutu metriklerini güncelle
+    """
+    for alias in connections:
+        stats = pool_stats(alias)
+        if stats is None:
+            continue
+        for key, (name, documentation) in POOL_GAUGES.items():
+            registry.set(name, {'database': alias}, stats[key], documentation)
+
+
+def check_database(alias):
+    """
+    Veritabanına SELECT 1 göndererek erişilebilirliği ve gecikmeyi ölç.
+
+    Hata ayrıntısı (sunucu, kullanıcı, veritabanı adı içerebilir) yanıta değil loga yazılır.
+    """
+    started = time.perf_counter()
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+    except Exception:
+        logger.exception('%s veritabanına erişilemedi', alias)
+        return {'ok': False}
+    return {'ok': True, 'latency_ms': round((time.perf_counter() - started) * 1000, 2)}
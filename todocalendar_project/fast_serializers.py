@@ -0,0 +1,102 @@
+import datetime
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.settings import api_settings
+
+# get_builders fonksiyonlarının 'bu alanı çıktıya ekleme' işareti
+SKIP = object()
+
+
+class ValuesReadSerializer:
+    """
+    .values() satırlarından çalışan hafif, salt-okunur liste serializer'ı.
+
+    ModelSerializer'ın satır başına alan nesnesi ağacı kurmasının aksine,
+    zaman dilimi ve `now` istek başına bir kez hesaplanır ve her satır düz
+    bir sözlüğe dönüştürülür. Alt sınıflar `value_fields` ile çekilecek
+    sütunları ve `get_builders` ile çıktı alanlarını (sırasıyla) tanımlar;
+    çıktı karşılık gelen ModelSerializer'ın çıktısıyla bayt düzeyinde aynıdır.
+
+    `fields` verilirse (?fields=) yalnızca o alanlar üretilir ve `values()`
+    yalnızca onların `field_sources` sütunlarını çeker.
+    """
+    value_fields = ()
+    # Çıktı alanı -> okuduğu sütunlar; listede olmayan alan aynı adlı sütunu okur
+    field_sources = {}
+
+    def __init__(self, rows, now=None, fields=None):
+        self.rows = rows
+        self.now = now or timezone.now()
+        self.timezone = timezone.get_current_timezone() if settings.USE_TZ else None
+        self.datetime_format = api_settings.DATETIME_FORMAT
+        self.builders = [
+            (name, build) for name, build in self.get_builders().items()
+            if not fields or name in fields
+        ]
+
+    @classmethod
+    def columns(cls, fields=None):
+        """
+        Seçilen alanların okuduğu sütunlar (value_fields sırasıyla)
+        """
+        if not fields:
+            return cls.value_fields
+        needed = set()
+        for name in fields:
+            needed.update(cls.field_sources.get(name, (name,)))
+        return tuple(column for column in cls.value_fields if column in needed)
+
+    @classmethod
+    def values(cls, queryset, fields=None, extra=()):
+        """
+        Serializer'ın ihtiyaç duyduğu sütunları tek sorguda döndüren queryset.
+
+        `extra` sıralama gibi çıktıda olmayan ama sorguda gereken sütunları ekler.
+        """
+        columns = cls.columns(fields)
+        return queryset.values(*columns, *(column for column in extra if column not in columns))
+
+    def format_datetime(self, value):
+        """
+        DRF DateTimeField.to_representation ile aynı çıktıyı üret
+        """
+        if not value:
+            return None
+        if self.datetime_format is None:
+            return value
+        if self.timezone is not None:
+            value = value.astimezone(self.timezone) if timezone.is_aware(value) else timezone.make_aware(value, self.timezone)
+        elif timezone.is_aware(value):
+            value = timezone.make_naive(value, datetime.timezone.utc)
+        if self.datetime_format.lower() != 'iso-8601':
+            return value.strftime(self.datetime_format)
+        value = value.isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+
+    def get_builders(self):
+        """
+        Çıktı alanı -> satırdan değeri üreten fonksiyon; SKIP dönen alan çıktıya eklenmez
+        """
+        raise NotImplementedError('.get_builders() must be overridden')
+
+    def to_representation(self, row):
+        data = {}
+        for name, build in self.builders:
+            value = build(row)
+            if value is not SKIP:
+                data[name] = value
+        return data
+
+    def represent(self, row):
+        data = self.to_representation(row)
+        # Arşivle birleştirilmiş listelerde (include_archived) satırın kaynağı
+        if 'is_archived' in row:
+            data['is_archived'] = bool(row['is_archived'])
+        return data
+
+    @property
+    def data(self):
+        return [self.represent(row) for row in self.rows]
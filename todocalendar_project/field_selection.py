@@ -0,0 +1,206 @@
+"""
+?fields= ve ?expand= ile seyrek alan seçimi.
+
+`fields=id,title,comments.comment` yalnızca listelenen alanları döndürür;
+noktalı yol iç içe serializer'ın alanlarını seçer. `expand=` gömülecek
+ilişkileri seçer: verilmezse serializer'ın `expandable_fields` alanlarının
+hepsi eskisi gibi gömülür, `expand=` (boş) hiçbirini gömmez; gömülmeyen
+tekil ilişki id olarak döner, çoklu ilişki yanıttan çıkarılır.
+
+GET isteklerinde queryset (only(), select_related, prefetch) aynı seçime göre
+kurulur; istenmeyen sütunlar ve ilişkiler veritabanından okunmaz.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.permissions import SAFE_METHODS
+
+
+def parse_paths(value):
+    """
+    'a,b.c,b.d' -> {'a': {}, 'b': {'c': {}, 'd': {}}}; parametre yoksa None
+    """
+    if value is None:
+        return None
+    tree = {}
+    for path in value.split(','):
+        node = tree
+        for part in path.split('.'):
+            part = part.strip()
+            if part:
+                node = node.setdefault(part, {})
+    return tree
+
+
+class FieldSelection:
+    """
+    İstekten okunan alan ve genişletme seçimi (None: kısıt yok)
+    """
+    def __init__(self, fields=None, expand=None):
+        self.fields = fields
+        self.expand = expand
+
+    @classmethod
+    def from_request(cls, request):
+        if request is None:
+            return None
+        params = request.query_params
+        if 'fields' not in params and 'expand' not in params:
+            return None
+        return cls(parse_paths(params.get('fields')), parse_paths(params.get('expand')))
+
+    @property
+    def field_names(self):
+        """
+        Seçilen üst düzey alan adları; seçim yoksa None
+        """
+        return set(self.fields) if self.fields else None
+
+    def includes(self, name):
+        return not self.fields or name in self.fields
+
+    def expands(self, name):
+        return self.expand is None or name in self.expand
+
+    def child(self, name):
+        """
+        İç içe serializer'a geçen seçim (fields=comments.comment -> comment)
+        """
+        fields = self.fields.get(name) if self.fields else None
+        expand = self.expand.get(name) if self.expand else None
+        if not fields and not expand:
+            return None
+        return FieldSelection(fields or None, expand or None)
+
+
+def requested_fields(request):
+    """
+    Değerler (.values()) tabanlı listeler için seçilen üst düzey alanlar; seçim yoksa None
+    """
+    selection = FieldSelection.from_request(request)
+    return selection.field_names if selection else None
+
+
+class DynamicFieldsMixin:
+    """
+    ?fields= / ?expand= seçimini uygulayan serializer mixin'i.
+
+    `expandable_fields`: ?expand= ile kontrol edilen ilişki alanları.
+    `field_dependencies`: model alanı olmayan çıktı alanlarının okuduğu sütunlar (only() için).
+    `field_annotations`: alan istendiğinde queryset'e eklenen annotate ifadeleri.
+    """
+    expandable_fields = ()
+    field_dependencies = {}
+    field_annotations = {}
+
+    @property
+    def field_selection(self):
+        # İç içe serializer'ın seçimini üst serializer atar
+        if hasattr(self, '_field_selection'):
+            return self._field_selection
+        if self.root is not self and self.root is not self.parent:
+            return None
+        return FieldSelection.from_request(self.context.get('request'))
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selection = self.field_selection
+        if selection is None:
+            return fields
+
+        for name, field in list(fields.items()):
+            if field.write_only:
+                continue
+            if not selection.includes(name):
+                if field.read_only:
+                    del fields[name]
+                else:
+                    # Yanıtta yer almaz ama girdi olarak kabul edilmeye devam eder
+                    field.write_only = True
+                continue
+            if name in self.expandable_fields and not selection.expands(name):
+                if isinstance(field, serializers.ListSerializer):
+                    del fields[name]
+                else:
+                    model_field = self.Meta.model._meta.get_field(field.source or name)
+                    fields[name] = serializers.IntegerField(source=model_field.attname, read_only=True)
+                continue
+            nested = field.child if isinstance(field, serializers.ListSerializer) else field
+            if isinstance(nested, DynamicFieldsMixin):
+                nested._field_selection = selection.child(name)
+        return fields
+
+
+def shape_queryset(queryset, serializer, required=()):
+    """
+    Serializer'ın (seçim uygulandıktan sonra) okuyacağı alanlara göre
+    only(), select_related, prefetch ve annotate ekle.
+
+    Kaynağı çözülemeyen bir çıktı alanı varsa (ör. bağımlılığı tanımlanmamış
+    property) only() uygulanmaz; ilişki yüklemeleri yine de kurulur.
+    """
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    opts = queryset.model._meta
+    columns = {opts.pk.name, *required}
+    related, prefetches, annotations = [], [], {}
+    complete = True
+    dependencies = getattr(serializer, 'field_dependencies', {})
+    field_annotations = getattr(serializer, 'field_annotations', {})
+
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if name in field_annotations:
+            annotations[name] = field_annotations[name]
+            continue
+        if name in dependencies:
+            columns.update(dependencies[name])
+            continue
+        if field.source == '*':
+            complete = False
+            continue
+        try:
+            model_field = opts.get_field(field.source_attrs[0])
+        except FieldDoesNotExist:
+            complete = False
+            continue
+
+        if isinstance(field, serializers.ListSerializer) and model_field.one_to_many:
+            # Çoklu ilişki: alt serializer'ın alanlarına göre şekillenmiş tek prefetch sorgusu
+            child_queryset = shape_queryset(
+                model_field.related_model._default_manager.all(), field.child,
+                required=(model_field.field.name,),
+            )
+            prefetches.append(Prefetch(model_field.name, queryset=child_queryset))
+        elif model_field.many_to_many or model_field.one_to_many:
+            prefetches.append(model_field.name)
+        elif model_field.is_relation and (isinstance(field, serializers.BaseSerializer) or len(field.source_attrs) > 1):
+            related.append(model_field.name)
+            columns.add(model_field.name)
+        else:
+            columns.add(model_field.name)
+
+    if related:
+        queryset = queryset.select_related(*related)
+    if prefetches:
+        queryset = queryset.prefetch_related(*prefetches)
+    if annotations:
+        queryset = queryset.annotate(**annotations)
+    if complete:
+        queryset = queryset.only(*columns)
+    return queryset
+
+
+class FieldSelectionFilter(BaseFilterBackend):
+    """
+    GET isteklerinde queryset'i view serializer'ının seçili alanlarına göre şekillendirir.
+
+    View'ın `required_fields` niteliği izin kontrolü gibi serializer dışında
+    okunan sütunları ekler.
+    """
+    def filter_queryset(self, request, queryset, view):
+        if request.method not in SAFE_METHODS:
+            return queryset
+        return shape_queryset(queryset, view.get_serializer(), getattr(view, 'required_fields', ()))
@@ -0,0 +1,146 @@
+import atexit
+import json
+import logging
+import queue
+import random
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, WatchedFileHandler
+
+from .metrics import registry
+
+# İşlenmekte olan istek; log kayıtlarına istek bağlamını eklemek için kullanılır
+current_request = ContextVar('current_request', default=None)
+
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+_CONTEXT_FIELDS = ('request_id', 'user_id', 'endpoint')
+_SKIPPED_FIELDS = _RECORD_ATTRIBUTES | set(_CONTEXT_FIELDS)
+
+
+class RequestContextFilter(logging.Filter):
+    """
+    Kayda aktif isteğin request_id, user_id ve endpoint bilgilerini ekler.
+
+    Kaydı oluşturan thread'de çalışmalıdır (handler filtresi olarak), çünkü
+    istek bağlamı contextvar içinde tutulur.
+    """
+    def filter(self, record):
+        request = current_request.get()
+        if request is None:
+            return True
+
+        if not hasattr(record, 'request_id'):
+            record.request_id = getattr(request, 'request_id', None)
+        if not hasattr(record, 'endpoint'):
+            match = getattr(request, 'resolver_match', None)
+            record.endpoint = (match.url_name or match.view_name) if match else None
+        if not hasattr(record, 'user_id'):
+            # Tembel kullanıcı nesnesi burada değerlendirilmez (ek sorgu çalışmasın)
+            user = request.__dict__.get('user')
+            wrapped = getattr(user, '_wrapped', user)
+            record.user_id = getattr(wrapped, 'pk', None)
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Logger adına göre kayıtların yalnızca belirli bir oranını geçirir.
+
+    rates en uzun önek eşleşmesiyle uygulanır; WARNING ve üzeri kayıtlar
+    her zaman geçer.
+    """
+    def __init__(self, rates=None, default=1.0):
+        super().__init__()
+        self.rates = sorted((rates or {}).items(), key=lambda item: len(item[0]), reverse=True)
+        self.default = default
+
+    def rate_for(self, name):
+        for prefix, rate in self.rates:
+            if name == prefix or name.startswith(prefix + '.'):
+                return rate
+        return self.default
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rate_for(record.name)
+        return rate >= 1 or random.random() < rate
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Her kaydı tek satırlık JSON olarak biçimlendirir (extra alanları dahil)
+    """
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for field in _CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        for key, value in record.__dict__.items():
+            if key not in _SKIPPED_FIELDS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class QueueFileHandler(QueueHandler):
+    """
+    Kayıtları sınırlı bir kuyruğa bırakıp dosyaya arka plan thread'inde
+    (QueueListener) yazar; istek thread'i diske yazmaz.
+
+    Dosya WatchedFileHandler ile açılır: birden fazla worker süreci aynı dosyaya
+    ekleme yapabilir ve boyuta göre döndürme dışarıdan (saatlik logrotate,
+    `size`) yapılır; dosya taşınınca yeniden açılır. Kuyruk doluysa kayıt bekletilmeden atılır ve
+    todocalendar_log_records_dropped_total sayacı artırılır.
+    """
+    def __init__(self, filename, queue_size=10000):
+        super().__init__(queue.Queue(queue_size))
+        self.target = WatchedFileHandler(filename, encoding='utf-8', delay=True)
+        self.listener = QueueListener(self.queue, self.target, respect_handler_level=True)
+        self.listener.start()
+        self._listening = True
+        atexit.register(self.close)
+
+    def setFormatter(self, fmt):
+        # Biçimlendirme (JSON serileştirme) dinleyici thread'inde yapılır
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            registry.inc('todocalendar_log_records_dropped_total', {'logger': record.name},
+                         'Kuyruk dolu olduğu için atılan log kaydı sayısı')
+
+    def flush(self):
+        """
+        Kuyruktaki kayıtların dosyaya yazılmasını bekle (dinleyici çalışmaya devam eder)
+        """
+        if self._listening:
+            self.queue.join()
+        self.target.flush()
+
+    def close(self):
+        if self._listening:
+            self._listening = False
+            self.listener.stop()
+        self.target.close()
+        super().close()
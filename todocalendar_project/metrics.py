@@ -0,0 +1,111 @@
+import threading
+from collections import defaultdict
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (
+        '%s="%s"' % (key, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for key, value in labels
+    )
+    return '{%s}' % ','.join(escaped)
+
+
+class MetricsRegistry:
+    """
+    Süreç içi Prometheus metrik kaydı (counter, gauge, summary, histogram).
+
+    Her worker süreci kendi değerlerini tutar; Prometheus tüm worker'ları
+    ayrı ayrı toplamalıdır.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._types = {}
+        self._help = {}
+        self._counters = defaultdict(float)
+        self._gauges = {}
+        self._summaries = defaultdict(lambda: [0, 0.0])
+        self._histograms = {}
+
+    def _register(self, name, metric_type, documentation):
+        self._types.setdefault(name, metric_type)
+        self._help.setdefault(name, documentation)
+
+    def inc(self, name, labels, documentation='', value=1):
+        labels = tuple(sorted(labels.items()))
+        with self._lock:
+            self._register(name, 'counter', documentation)
+            self._counters[(name, labels)] += value
+
+    def set(self, name, labels, value, documentation=''):
+        labels = tuple(sorted(labels.items()))
+        with self._lock:
+            self._register(name, 'gauge', documentation)
+            self._gauges[(name, labels)] = value
+
+    def observe(self, name, labels, value, documentation=''):
+        labels = tuple(sorted(labels.items()))
+        with self._lock:
+            self._register(name, 'summary', documentation)
+            summary = self._summaries[(name, labels)]
+            summary[0] += 1
+            summary[1] += value
+
+    def observe_histogram(self, name, labels, value, documentation='', buckets=DURATION_BUCKETS):
+        labels = tuple(sorted(labels.items()))
+        with self._lock:
+            self._register(name, 'histogram', documentation)
+            histogram = self._histograms.get((name, labels))
+            if histogram is None:
+                histogram = self._histograms[(name, labels)] = {
+                    'buckets': buckets, 'counts': [0] * len(buckets), 'count': 0, 'sum': 0.0,
+                }
+            for index, bound in enumerate(buckets):
+                if value <= bound:
+                    histogram['counts'][index] += 1
+            histogram['count'] += 1
+            histogram['sum'] += value
+
+    def render(self):
+        """
+        Prometheus text exposition formatında çıktı üret
+        """
+        lines = []
+        with self._lock:
+            for name in sorted(self._types):
+                lines.append(f'# HELP {name} {self._help[name]}')
+                lines.append(f'# TYPE {name} {self._types[name]}')
+                for (metric, labels), value in sorted(self._counters.items()):
+                    if metric == name:
+                        lines.append(f'{name}{_format_labels(labels)} {value}')
+                for (metric, labels), value in sorted(self._gauges.items()):
+                    if metric == name:
+                        lines.append(f'{name}{_format_labels(labels)} {value}')
+                for (metric, labels), (count, total) in sorted(self._summaries.items()):
+                    if metric == name:
+                        lines.append(f'{name}_count{_format_labels(labels)} {count}')
+                        lines.append(f'{name}_sum{_format_labels(labels)} {total}')
+                for (metric, labels), histogram in sorted(self._histograms.items(), key=lambda item: item[0]):
+                    if metric != name:
+                        continue
+                    for bound, count in zip(histogram['buckets'], histogram['counts']):
+                        lines.append(f'{name}_bucket{_format_labels(labels + (("le", bound),))} {count}')
+                    lines.append(f'{name}_bucket{_format_labels(labels + (("le", "+Inf"),))} {histogram["count"]}')
+                    lines.append(f'{name}_count{_format_labels(labels)} {histogram["count"]}')
+                    lines.append(f'{name}_sum{_format_labels(labels)} {histogram["sum"]}')
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        with self._lock:
+            self._types.clear()
+            self._help.clear()
+            self._counters.clear()
+            self._gauges.clear()
+            self._summaries.clear()
+            self._histograms.clear()
+
+
+registry = MetricsRegistry()
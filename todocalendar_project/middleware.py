@@ -0,0 +1,205 @@
+import logging
+import random
+import time
+import uuid
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from .logging_pipeline import current_request
+from .metrics import registry
+from .query_inspector import QueryInspector, get_options as get_query_inspector_options, report_problems
+from .routers import pin_to_primary, replica_request
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+access_logger = logging.getLogger('todocalendar.request')
+
+METRICS_DEFAULTS = {
+    'ENABLED': True,
+    'SAMPLE_RATE': 0.1,
+    'SERVER_TIMING': False,
+}
+
+
+class RequestSample:
+    """
+    Örneklenen bir isteğin sorgu, veritabanı ve render ölçümleri
+    """
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - started
+
+
+class RequestLoggingMiddleware:
+    """
+    Her isteğe bir request id atar, bunu istek süresince log kayıtlarına
+    taşır ve istek sonunda gecikme ve sorgu sayısıyla bir erişim kaydı yazar.
+
+    Gelen X-Request-ID başlığı (varsa) korunur ve yanıtta geri döndürülür.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.request_id = request.headers.get('X-Request-ID') or uuid.uuid4().hex
+        counter = RequestSample()
+        token = current_request.set(request)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(counter))
+                response = self.get_response(request)
+
+            response['X-Request-ID'] = request.request_id
+            access_logger.info(
+                '%s %s %s', request.method, request.path, response.status_code,
+                extra={
+                    'method': request.method,
+                    'path': request.path,
+                    'status': response.status_code,
+                    'latency_ms': round((time.perf_counter() - started) * 1000, 2),
+                    'query_count': counter.queries,
+                },
+            )
+            return response
+        finally:
+            current_request.reset(token)
+
+
+class RequestMetricsMiddleware:
+    """
+    İstek başına süre, SQL sorgu sayısı, veritabanı süresi, render süresi ve
+    yanıt boyutunu URL adına göre kaydeder.
+
+    Tüm istekler sayılır ve süreleri ölçülür; ayrıntılı ölçümler yalnızca
+    SAMPLE_RATE oranında örneklenen isteklerde yapılır. SERVER_TIMING açıksa
+    örneklenen yanıtlara Server-Timing başlığı eklenir.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.options = {**METRICS_DEFAULTS, **getattr(settings, 'METRICS', {})}
+
+    def __call__(self, request):
+        if not self.options['ENABLED']:
+            return self.get_response(request)
+
+        sample = RequestSample() if random.random() < self.options['SAMPLE_RATE'] else None
+        request._metrics_sample = sample
+        started = time.perf_counter()
+
+        if sample is None:
+            response = self.get_response(request)
+        else:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(sample))
+                response = self.get_response(request)
+
+        duration = time.perf_counter() - started
+        match = getattr(request, 'resolver_match', None)
+        view = (match.url_name or match.view_name) if match else 'unresolved'
+
+        registry.inc('todocalendar_http_requests_total', {
+            'view': view, 'method': request.method, 'status': response.status_code,
+        }, 'Toplam HTTP istek sayısı')
+        registry.observe_histogram(
+            'todocalendar_http_request_duration_seconds', {'view': view}, duration,
+            'İstek işleme süresi (saniye)'
+        )
+
+        if sample is not None:
+            labels = {'view': view}
+            registry.observe('todocalendar_db_queries', labels, sample.queries, 'İstek başına SQL sorgu sayısı (örneklenen)')
+            registry.observe('todocalendar_db_duration_seconds', labels, sample.db_time, 'İstek başına veritabanı süresi (örneklenen)')
+            registry.observe('todocalendar_render_duration_seconds', labels, sample.render_time, 'Yanıt render süresi (örneklenen)')
+            if not response.streaming:
+                registry.observe('todocalendar_response_size_bytes', labels, len(response.content), 'Yanıt boyutu (örneklenen)')
+
+            if self.options['SERVER_TIMING']:
+                response['Server-Timing'] = (
+                    f'db;desc="{sample.queries} sorgu";dur={sample.db_time * 1000:.2f}, '
+                    f'render;dur={sample.render_time * 1000:.2f}, '
+                    f'total;dur={duration * 1000:.2f}'
+                )
+        return response
+
+    def process_template_response(self, request, response):
+        """
+        DRF Response gibi şablon yanıtlarında render süresini ölç
+        """
+        sample = getattr(request, '_metrics_sample', None)
+        if sample is not None:
+            started = time.perf_counter()
+
+            def record_render_time(rendered):
+                sample.render_time += time.perf_counter() - started
+
+            response.add_post_render_callback(record_render_time)
+        return response
+
+
+class QueryInspectorMiddleware:
+    """
+    İstek içinde tekrarlanan (N+1) ve yavaş sorguları tespit eder.
+
+    MODE='raise' (CI/testler) sorunları QueryProblemError olarak fırlatır,
+    MODE='log' (staging) 'todocalendar.queries' logger'ına yapılandırılmış
+    uyarı yazar.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        options = get_query_inspector_options()
+        if not options['ENABLED']:
+            return self.get_response(request)
+
+        with QueryInspector() as inspector:
+            response = self.get_response(request)
+
+        match = getattr(request, 'resolver_match', None)
+        label = (match.url_name or match.view_name) if match else request.path
+        report_problems(label, inspector.problems(), options['MODE'])
+        return response
+
+
+class ReadReplicaMiddleware:
+    """
+    @read_replica ile işaretli view'ların güvenli metotlu isteklerinde
+    okumaları ReadReplicaRouter'a açar; başarılı bir yazma isteğinden sonra
+    kullanıcıyı birincil veritabanına sabitler.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request._replica_token = None
+        try:
+            response = self.get_response(request)
+        finally:
+            if request._replica_token is not None:
+                replica_request.reset(request._replica_token)
+
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            user = getattr(request, 'user', None)
+            if user is not None and user.is_authenticated:
+                pin_to_primary(user.pk)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None)
+        marked = getattr(view_func, 'read_replica', False) or getattr(view_class, 'read_replica', False)
+        if marked and request.method in SAFE_METHODS:
+            request._replica_token = replica_request.set(request)
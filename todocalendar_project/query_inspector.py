@@ -0,0 +1,151 @@
+import functools
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('todocalendar.queries')
+
+QUERY_INSPECTOR_DEFAULTS = {
+    'ENABLED': False,
+    'MODE': 'log',
+    'DUPLICATE_THRESHOLD': 3,
+    'SLOW_QUERY_MS': 100,
+}
+
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_SPACES = re.compile(r'\s+')
+
+
+def get_options():
+    return {**QUERY_INSPECTOR_DEFAULTS, **getattr(settings, 'QUERY_INSPECTOR', {})}
+
+
+def normalize_sql(sql):
+    """
+    Sadece parametreleri farklı olan sorguları aynı metne indir
+    """
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _IN_LIST.sub('IN (...)', sql)
+    return _SPACES.sub(' ', sql).strip()
+
+
+class QueryProblemError(AssertionError):
+    """
+    CI modunda N+1, yavaş sorgu veya sorgu bütçesi aşımında fırlatılır
+    """
+
+
+class QueryInspector:
+    """
+    Bir blok içindeki tüm SQL sorgularını süreleriyle kaydeder.
+
+    Aynı normalize edilmiş sorgu DUPLICATE_THRESHOLD veya daha fazla kez
+    çalıştıysa N+1, SLOW_QUERY_MS süresini aşan sorgular yavaş sayılır.
+    """
+    def __init__(self, duplicate_threshold=None, slow_query_ms=None):
+        options = get_options()
+        self.duplicate_threshold = duplicate_threshold or options['DUPLICATE_THRESHOLD']
+        self.slow_query_ms = slow_query_ms if slow_query_ms is not None else options['SLOW_QUERY_MS']
+        self.queries = []
+        self._stack = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, (time.perf_counter() - started) * 1000))
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    def duplicates(self):
+        counts = Counter(normalize_sql(sql) for sql, _ in self.queries)
+        return [
+            {'sql': sql, 'count': count}
+            for sql, count in counts.most_common()
+            if count >= self.duplicate_threshold
+        ]
+
+    def slow_queries(self):
+        return [
+            {'sql': sql, 'duration_ms': round(duration, 2)}
+            for sql, duration in self.queries
+            if duration >= self.slow_query_ms
+        ]
+
+    def problems(self):
+        problems = [{'type': 'n_plus_one', **item} for item in self.duplicates()]
+        problems.extend({'type': 'slow_query', **item} for item in self.slow_queries())
+        return problems
+
+
+def report_problems(label, problems, mode=None):
+    """
+    Sorunları CI modunda hata olarak fırlat, diğer modlarda yapılandırılmış uyarı olarak logla
+    """
+    if not problems:
+        return
+    mode = mode or get_options()['MODE']
+    if mode == 'raise':
+        details = '\n'.join(
+            f"  [{problem['type']}] {problem.get('count', problem.get('duration_ms'))}: {problem['sql']}"
+            for problem in problems
+        )
+        raise QueryProblemError(f'{label} için sorgu sorunları:\n{details}')
+    logger.warning(
+        'Sorgu sorunu: %s (%d)', label, len(problems),
+        extra={'endpoint': label, 'query_problems': problems},
+    )
+
+
+def query_budget(max_queries):
+    """
+    View'ın çalıştırabileceği en fazla sorgu sayısını bildiren dekoratör.
+
+    Fonksiyon view'lara ve sınıf tabanlı view'lara (dispatch sarılır)
+    uygulanabilir; denetim QUERY_INSPECTOR['ENABLED'] açıkken yapılır.
+    """
+    def decorator(view):
+        if isinstance(view, type):
+            view.dispatch = decorator(view.dispatch)
+            view.query_budget = max_queries
+            return view
+
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if not get_options()['ENABLED']:
+                return view(*args, **kwargs)
+
+            with QueryInspector() as inspector:
+                response = view(*args, **kwargs)
+
+            if inspector.count > max_queries:
+                report_problems(view.__qualname__, [{
+                    'type': 'query_budget',
+                    'count': inspector.count,
+                    'sql': f'bütçe {max_queries} sorgu, çalışan {inspector.count}',
+                }])
+            return response
+
+        wrapper.query_budget = max_queries
+        return wrapper
+    return decorator
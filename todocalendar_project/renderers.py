@@ -0,0 +1,77 @@
+import math
+from decimal import Decimal
+
+from rest_framework.utils import encoders
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # orjson kurulu değilse DRF'in varsayılan renderer'ı kullanılır
+    orjson = None
+
+
+def has_non_finite(data):
+    """
+    Verinin herhangi bir yerinde NaN/Infinity (float ya da Decimal) var mı?
+    """
+    if isinstance(data, float):
+        return not math.isfinite(data)
+    if isinstance(data, Decimal):
+        return not data.is_finite()
+    if isinstance(data, dict):
+        return any(has_non_finite(value) for value in data.values())
+    if isinstance(data, (list, tuple)):
+        return any(has_non_finite(value) for value in data)
+    return False
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    orjson ile JSON üreten renderer.
+
+    Çıktı DRF'in JSONRenderer'ı ile aynıdır: UTC tarihler 'Z' ile biter,
+    orjson'un desteklemediği tipler (timedelta, Decimal, lazy string vb.)
+    DRF'in JSONEncoder'ına devredilir. Girintili çıktı (browsable API,
+    '; indent=4') ve orjson'un kurulu olmadığı durumlar DRF'e bırakılır.
+
+    orjson NaN/Infinity değerlerini sessizce null yazar; DRF ise STRICT_JSON
+    açıkken ValueError verir. Aynı davranış için çıktıda null geçiyorsa veri
+    taranır; STRICT_JSON kapalıysa render DRF'e bırakılır.
+    """
+    encoder = encoders.JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        if (
+            orjson is None
+            or not self.compact
+            or self.ensure_ascii
+            or not self.strict
+            or self.get_indent(accepted_media_type, renderer_context) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(
+            data,
+            default=self.encoder.default,
+            option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+        )
+        if b'null' in ret and has_non_finite(data):
+            raise ValueError('Out of range float values are not JSON compliant')
+
+        # DRF ile aynı şekilde \u2028 ve \u2029 karakterlerini kaçır
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class DownloadRenderer(FastJSONRenderer):
+    """
+    Dosya indirme view'ları için: istemcinin her Accept başlığını kabul eder
+    (406 yerine dosya döner); hata yanıtları yine JSON olarak üretilir.
+    """
+    media_type = '*/*'
+    format = 'download'
@@ -0,0 +1,87 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+
+READ_REPLICAS_DEFAULTS = {
+    'DATABASES': [],
+    'PIN_SECONDS': 10,
+    'CACHE_PREFIX': 'replica-pin',
+}
+
+# Replikadan okunabilecek (güvenli metotlu, işaretli view) aktif istek
+replica_request = ContextVar('replica_request', default=None)
+
+
+def get_options():
+    return {**READ_REPLICAS_DEFAULTS, **getattr(settings, 'READ_REPLICAS', {})}
+
+
+def pin_key(user_id):
+    return f"{get_options()['CACHE_PREFIX']}:{user_id}"
+
+
+def pin_to_primary(user_id):
+    """
+    Kullanıcının okumalarını PIN_SECONDS boyunca birincil veritabanına sabitle
+    (replikasyon gecikmesine rağmen kendi yazdıklarını görsün)
+    """
+    cache.set(pin_key(user_id), True, get_options()['PIN_SECONDS'])
+
+
+def is_pinned(user_id):
+    return bool(cache.get(pin_key(user_id)))
+
+
+def read_replica(view):
+    """
+    View'ın GET/HEAD/OPTIONS isteklerini okuma replikasına yönlendirilebilir olarak işaretler.
+
+    Fonksiyon view'lara ve sınıf tabanlı view'lara uygulanabilir; yönlendirme
+    ReadReplicaMiddleware ve ReadReplicaRouter tarafından yapılır.
+    """
+    view.read_replica = True
+    return view
+
+
+class ReadReplicaRouter:
+    """
+    İşaretli view'ların okumalarını replikalara, diğer tüm sorguları birincil
+    veritabanına yönlendirir.
+
+    Son PIN_SECONDS içinde yazma yapan kullanıcının okumaları birincil
+    veritabanında kalır. Kullanıcı tablosu her zaman birincilden okunur:
+    kayıt ve giriş anonim yazmalar olduğu için sabitleme yapılamaz ve JWT
+    kullanıcı sorgusu gecikmeli replikada yeni kaydolan kullanıcıyı bulamazdı.
+    """
+    def db_for_read(self, model, **hints):
+        request = replica_request.get()
+        if request is None or model._meta.label == settings.AUTH_USER_MODEL:
+            return None
+
+        replicas = get_options()['DATABASES']
+        if not replicas:
+            return None
+
+        if getattr(request, '_replica_pinned', None) is None:
+            user = request.__dict__.get('user')
+            user = getattr(user, '_wrapped', user)
+            if getattr(user, 'is_authenticated', False) is True:
+                request._replica_pinned = is_pinned(user.pk)
+        if getattr(request, '_replica_pinned', False):
+            return 'default'
+
+        # Tek bir istek içindeki okumalar aynı replikadan yapılır
+        if not hasattr(request, '_replica_alias'):
+            request._replica_alias = random.choice(replicas)
+        return request._replica_alias
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {'default', *get_options()['DATABASES']}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
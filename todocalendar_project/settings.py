@@ -12,7 +12,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 
 import os
 from pathlib import Path
-from decouple import config
+from decouple import config, Csv
 from datetime import timedelta
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -44,6 +44,7 @@ INSTALLED_APPS = [
     # Third party apps
     'rest_framework',
     'rest_framework_simplejwt',
+    'rest_framework_simplejwt.token_blacklist',
     'corsheaders',
     'django_filters',
     
@@ -51,9 +52,15 @@ INSTALLED_APPS = [
     'authentication',
     'todos',
     'calendar_app',
+    'uploads',
+    'taskqueue',
+    'benchmarks',
 ]
 
 MIDDLEWARE = [
+    'todocalendar_project.middleware.RequestLoggingMiddleware',
+    'todocalendar_project.middleware.RequestMetricsMiddleware',
+    'todocalendar_project.middleware.QueryInspectorMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -62,6 +69,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'todocalendar_project.middleware.ReadReplicaMiddleware',
 ]
 
 ROOT_URLCONF = 'todocalendar_project.urls'
@@ -88,18 +96,76 @@ WSGI_APPLICATION = 'todocalendar_project.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+DB_POOL = config('DB_POOL', default=False, cast=bool)
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': config('DB_ENGINE', default='django.db.backends.postgresql'),
         'NAME': config('DB_NAME', default='todocalendar_db'),
         'USER': config('DB_USER', default='halilibrahimberk'),
         'PASSWORD': config('DB_PASSWORD', default=''),
         'HOST': config('DB_HOST', default='localhost'),
         'PORT': config('DB_PORT', default='5432'),
+        # Kalıcı bağlantılar: her istekte yeni bağlantı açılmaz (havuz açıkken 0 olmalı)
+        'CONN_MAX_AGE': 0 if DB_POOL else config('DB_CONN_MAX_AGE', default=60, cast=int),
+        # Yeniden kullanılan bağlantı (veya havuzdan alınan bağlantı) önce kontrol edilir
+        'CONN_HEALTH_CHECKS': config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
+    }
+}
+
+# psycopg bağlantı havuzu (yalnızca PostgreSQL; pip install "psycopg[pool]")
+if DB_POOL:
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+            'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+            'timeout': config('DB_POOL_TIMEOUT', default=10.0, cast=float),
+            'max_idle': config('DB_POOL_MAX_IDLE', default=300.0, cast=float),
+        },
+    }
+
+# Okuma replikaları: DB_REPLICAS=replica1.local,replica2.local (her biri 'replicaN' alias'ı alır)
+DB_REPLICAS = config('DB_REPLICAS', default='', cast=Csv())
+for _index, _host in enumerate(DB_REPLICAS, start=1):
+    DATABASES[f'replica{_index}'] = {
+        **DATABASES['default'],
+        'HOST': _host,
+        'TEST': {'MIRROR': 'default'},
     }
+
+DATABASE_ROUTERS = ['todocalendar_project.routers.ReadReplicaRouter']
+
+# Yazma yapan kullanıcının okumaları PIN_SECONDS boyunca birincil veritabanında kalır
+# (sabitleme önbellekte tutulur; birden fazla worker için paylaşılan önbellek gerekir)
+READ_REPLICAS = {
+    'DATABASES': [f'replica{index}' for index in range(1, len(DB_REPLICAS) + 1)],
+    'PIN_SECONDS': config('DB_REPLICA_PIN_SECONDS', default=10, cast=int),
 }
 
 
+# Şifre hash'leme
+# https://docs.djangoproject.com/en/5.1/topics/auth/passwords/
+
+PASSWORD_HASHERS = [
+    'authentication.hashers.ConfigurablePBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+
+# İterasyon sayısı değiştiğinde mevcut şifreler bir sonraki girişte yeniden hash'lenir (0: Django varsayılanı)
+PASSWORD_HASH_ITERATIONS = config('PASSWORD_HASH_ITERATIONS', default=0, cast=int)
+
+# Şifre hash işlemleri için sınırlı worker havuzu
+PASSWORD_HASHING_POOL = {
+    'MAX_WORKERS': config('PASSWORD_HASHING_WORKERS', default=4, cast=int),
+    'MAX_PENDING': config('PASSWORD_HASHING_MAX_PENDING', default=16, cast=int),
+    'ACQUIRE_TIMEOUT': 2.0,
+}
+
+AUTHENTICATION_BACKENDS = [
+    'authentication.backends.PooledModelBackend',
+]
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -159,11 +225,30 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    # orjson tabanlı hızlı JSON renderer/parser (orjson yoksa DRF'e düşer)
+    'DEFAULT_RENDERER_CLASSES': [
+        'todocalendar_project.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'todocalendar_project.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
+    # Token-bucket giriş/kayıt sınırları (authentication.throttling)
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': '30/min',
+        'login_account': '10/min',
+        'register_ip': '20/hour',
+    },
+    # Önündeki güvenilir vekil (load balancer) sayısı; 0 iken X-Forwarded-For yok sayılır
+    # ve throttle'lar REMOTE_ADDR'a göre çalışır (istemci başlığı sahteleyemez)
+    'NUM_PROXIES': config('NUM_PROXIES', default=0, cast=int),
 }
 
 # JWT Ayarları
@@ -191,6 +276,101 @@ SIMPLE_JWT = {
     'SLIDING_TOKEN_REFRESH_EXP_CLAIM': 'refresh_exp',
     'SLIDING_TOKEN_LIFETIME': timedelta(minutes=5),
     'SLIDING_TOKEN_REFRESH_LIFETIME': timedelta(days=1),
+    'TOKEN_REFRESH_SERIALIZER': 'authentication.serializers.CachedTokenRefreshSerializer',
+}
+
+# Önbellek Ayarları (birden fazla worker için Redis/Memcached gibi paylaşılan bir backend kullanın)
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='todocalendar'),
+    }
+}
+
+# Token kara liste önbelleği
+TOKEN_BLACKLIST_CACHE = {
+    'BLOOM_CAPACITY': config('TOKEN_BLACKLIST_BLOOM_CAPACITY', default=100000, cast=int),
+    'BLOOM_ERROR_RATE': 0.001,
+    # Filtre her yenilemede tablodaki yeni kayıtlarla güncellenir; bu süre yalnızca süresi dolanları atmak için tam yeniden kurulum aralığıdır
+    'BLOOM_REFRESH_SECONDS': config('TOKEN_BLACKLIST_BLOOM_REFRESH_SECONDS', default=300, cast=int),
+    'CACHE_PREFIX': 'jwt-blacklist',
+}
+
+# İstek metrikleri (/metrics/ ve Server-Timing)
+METRICS = {
+    'ENABLED': config('METRICS_ENABLED', default=True, cast=bool),
+    # Sorgu sayısı, veritabanı/render süresi ve yanıt boyutu bu oranda örneklenir
+    'SAMPLE_RATE': config('METRICS_SAMPLE_RATE', default=0.1, cast=float),
+    'SERVER_TIMING': config('METRICS_SERVER_TIMING', default=DEBUG, cast=bool),
+    'ALLOWED_IPS': ['127.0.0.1', '::1'],
+}
+
+# N+1 ve yavaş sorgu tespiti: 'raise' CI/testlerde hata verir, 'log' staging'de uyarı yazar
+QUERY_INSPECTOR = {
+    'ENABLED': config('QUERY_INSPECTOR_ENABLED', default=DEBUG, cast=bool),
+    'MODE': config('QUERY_INSPECTOR_MODE', default='log'),
+    'DUPLICATE_THRESHOLD': config('QUERY_INSPECTOR_DUPLICATE_THRESHOLD', default=3, cast=int),
+    'SLOW_QUERY_MS': config('QUERY_INSPECTOR_SLOW_QUERY_MS', default=100, cast=int),
+}
+
+# Arşivleme: bu kadar gün önce tamamlanan todo'lar ve biten tekrarlamayan etkinlikler
+# archive_todos / archive_events komutlarıyla arşiv tablolarına taşınır
+ARCHIVE = {
+    'TODO_DAYS': config('ARCHIVE_TODO_DAYS', default=90, cast=int),
+    'EVENT_DAYS': config('ARCHIVE_EVENT_DAYS', default=30, cast=int),
+    'BATCH_SIZE': config('ARCHIVE_BATCH_SIZE', default=500, cast=int),
+}
+
+# Ek yüklemeleri: parça parça yükleme, içerik adresli tekilleştirme ve kullanıcı kotası
+UPLOADS = {
+    'MAX_FILE_SIZE': config('UPLOAD_MAX_FILE_SIZE', default=25 * 1024 * 1024, cast=int),
+    'QUOTA_BYTES': config('UPLOAD_QUOTA_BYTES', default=200 * 1024 * 1024, cast=int),
+    'MAX_CHUNK_SIZE': config('UPLOAD_MAX_CHUNK_SIZE', default=8 * 1024 * 1024, cast=int),
+    # Yarım yüklemelerin geçici dosyaları (varsayılan MEDIA_ROOT/uploads/partial)
+    'TEMP_DIR': config('UPLOAD_TEMP_DIR', default=None),
+    'SESSION_HOURS': config('UPLOAD_SESSION_HOURS', default=24, cast=int),
+    # Ek indirmeleri: 'django' (FileResponse), 'x-accel-redirect' (nginx internal location)
+    # veya 'x-sendfile' (Apache/lighttpd); son ikisinde aktarımı web sunucusu yapar
+    'SERVE_BACKEND': config('ATTACHMENT_SERVE_BACKEND', default='django'),
+    'INTERNAL_URL': config('ATTACHMENT_INTERNAL_URL', default='/protected-media/'),
+}
+
+# Profil resimleri: yüklenen orijinalden arka planda kare WebP/JPEG boyutları üretilir.
+# MODE 'thread' yerel worker thread'lerinde, 'queue' iş kuyruğunda (run_worker),
+# 'sync' (testler) commit sonrasında hemen çalışır
+AVATARS = {
+    'SIZES': [64, 128, 256],
+    'DEFAULT_SIZE': 128,
+    'QUALITY': config('AVATAR_QUALITY', default=82, cast=int),
+    'MODE': config('AVATAR_PROCESSING_MODE', default='thread'),
+    'MAX_WORKERS': config('AVATAR_WORKERS', default=2, cast=int),
+}
+
+# Veritabanı tabanlı iş kuyruğu (taskqueue): işler `manage.py run_worker` ile çalıştırılır.
+# MODE 'sync' işleri kuyruğa yazmadan commit sonrasında hemen çalıştırır (testler)
+TASK_QUEUE = {
+    'MODE': config('TASK_QUEUE_MODE', default='queue'),
+    'MAX_ATTEMPTS': config('TASK_MAX_ATTEMPTS', default=3, cast=int),
+    'RETRY_DELAY': config('TASK_RETRY_DELAY', default=30, cast=int),
+    'VISIBILITY_TIMEOUT': config('TASK_VISIBILITY_TIMEOUT', default=600, cast=int),
+    'HEARTBEAT_INTERVAL': config('TASK_HEARTBEAT_INTERVAL', default=60, cast=int),
+    'BATCH_SIZE': config('TASK_BATCH_SIZE', default=10, cast=int),
+    'POLL_INTERVAL': config('TASK_POLL_INTERVAL', default=1.0, cast=float),
+}
+
+# Herkese açık takvimlerin .ics yayını: üretilen yayın önbellekte tutulur ve takvim ya da
+# etkinlikleri değişince geçersiz olur; aboneler ETag ile koşullu istek yapar
+CALENDAR_FEEDS = {
+    'CACHE_SECONDS': config('CALENDAR_FEED_CACHE_SECONDS', default=24 * 60 * 60, cast=int),
+    'MAX_AGE': config('CALENDAR_FEED_MAX_AGE', default=300, cast=int),
+    'PAST_DAYS': config('CALENDAR_FEED_PAST_DAYS', default=90, cast=int),
+}
+
+# Yaklaşan todo bildirimleri (notify_due_todos): bitişine LEAD_MINUTES kalan bekleyen
+# todo'lar partiler halinde kullanıcı başına tek e-posta işi olarak kuyruğa eklenir
+DUE_NOTIFICATIONS = {
+    'LEAD_MINUTES': config('DUE_NOTIFICATION_LEAD_MINUTES', default=60, cast=int),
+    'BATCH_SIZE': config('DUE_NOTIFICATION_BATCH_SIZE', default=500, cast=int),
 }
 
 # CORS Ayarları
@@ -201,14 +381,38 @@ CORS_ALLOWED_ORIGINS = [
 
 CORS_ALLOW_CREDENTIALS = True
 
+# Loglama: kayıtlar kuyruğa bırakılır, arka plan thread'i JSON satırı olarak
+# boyuta göre dönen dosyaya yazar (istek thread'i diske yazmaz)
+LOG_SAMPLE_RATES = {
+    'django.server': config('LOG_SAMPLE_RATE_SERVER', default=1.0, cast=float),
+    'todocalendar.request': config('LOG_SAMPLE_RATE_REQUEST', default=1.0, cast=float),
+}
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
+    'formatters': {
+        'json': {
+            '()': 'todocalendar_project.logging_pipeline.JSONFormatter',
+        },
+    },
+    'filters': {
+        'request_context': {
+            '()': 'todocalendar_project.logging_pipeline.RequestContextFilter',
+        },
+        'sampling': {
+            '()': 'todocalendar_project.logging_pipeline.SamplingFilter',
+            'rates': LOG_SAMPLE_RATES,
+        },
+    },
     'handlers': {
         'file': {
             'level': 'INFO',
-            'class': 'logging.FileHandler',
+            'class': 'todocalendar_project.logging_pipeline.QueueFileHandler',
             'filename': os.path.join(BASE_DIR, 'logs', 'django.log'),
+            'queue_size': config('LOG_QUEUE_SIZE', default=10000, cast=int),
+            'formatter': 'json',
+            'filters': ['request_context', 'sampling'],
         },
     },
     'loggers': {
@@ -217,5 +421,10 @@ LOGGING = {
             'level': 'INFO',
             'propagate': True,
         },
+        'todocalendar': {
+            'handlers': ['file'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
@@ -0,0 +1,466 @@
+import io
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connections
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APITestCase
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from todos.models import Category, Todo
+
+from .logging_pipeline import JSONFormatter, QueueFileHandler, RequestContextFilter, SamplingFilter, current_request
+from .metrics import registry
+from .parsers import FastJSONParser
+from .query_inspector import QueryInspector, QueryProblemError, normalize_sql, query_budget
+from .renderers import FastJSONRenderer
+
+User = get_user_model()
+
+
+class FastJSONRendererTest(SimpleTestCase):
+    """
+    orjson tabanlı renderer/parser'ın DRF ile aynı çıktıyı ürettiğini doğrular
+    """
+    def setUp(self):
+        self.data = ReturnList([
+            ReturnDict({
+                'id': 1,
+                'title': 'Şükrü çalışma',
+                'created_at': datetime(2025, 9, 14, 16, 29, 43, 505281, tzinfo=dt_timezone.utc),
+                'start_time': datetime(2025, 9, 14, 10, 0, tzinfo=ZoneInfo('Europe/Istanbul')),
+                'due_date': datetime(2025, 9, 14).date(),
+                'duration': timedelta(hours=1, minutes=30),
+                'estimated_duration': '01:30:00',
+                'price': Decimal('12.50'),
+                'label': gettext_lazy('Todo'),
+                'tags': ('a', 'b'),
+                'nested': {'is_overdue': False, 'days_until_due': None, 'ratio': 0.5},
+            }, serializer=None),
+        ], serializer=None)
+
+    def test_output_identical_to_drf(self):
+        """
+        Tarih, süre, Decimal ve özel karakterler DRF ile bayt düzeyinde aynı olmalı
+        """
+        expected = JSONRenderer().render(self.data)
+        self.assertEqual(FastJSONRenderer().render(self.data), expected)
+
+    def test_indent_falls_back_to_drf(self):
+        """
+        Girintili çıktı istendiğinde DRF renderer'ı kullanılmalı
+        """
+        media_type = 'application/json; indent=4'
+        self.assertEqual(
+            FastJSONRenderer().render(self.data, media_type),
+            JSONRenderer().render(self.data, media_type)
+        )
+
+    def test_non_finite_floats_rejected_like_drf(self):
+        """
+        NaN/Infinity null'a çevrilmemeli, DRF gibi ValueError vermeli
+        """
+        for value in (float('nan'), float('inf'), Decimal('NaN')):
+            data = {'stats': [{'ratio': value, 'note': None}]}
+            with self.assertRaises(ValueError):
+                JSONRenderer().render(data)
+            with self.assertRaises(ValueError):
+                FastJSONRenderer().render(data)
+
+    def test_none_renders_empty(self):
+        """
+        None verisi boş gövde üretmeli
+        """
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+    def test_parser_matches_drf(self):
+        """
+        Parser DRF ile aynı veriyi döndürmeli ve hatalı JSON'da ParseError vermeli
+        """
+        body = '{"title": "Toplantı", "priority": "high", "ids": [1, 2, 3]}'.encode()
+        self.assertEqual(
+            FastJSONParser().parse(io.BytesIO(body)),
+            JSONParser().parse(io.BytesIO(body))
+        )
+
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(io.BytesIO(b'{"title": '))
+
+
+@override_settings(METRICS={'ENABLED': True, 'SAMPLE_RATE': 1.0, 'SERVER_TIMING': True, 'ALLOWED_IPS': ['127.0.0.1']})
+class RequestMetricsMiddlewareTest(TestCase):
+    """
+    İstek metrikleri middleware'i ve /metrics/ endpoint testleri
+    """
+    def setUp(self):
+        registry.reset()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        token = RefreshToken.for_user(self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token.access_token}')
+
+    def test_server_timing_header(self):
+        """
+        Örneklenen yanıtlarda Server-Timing başlığı olmalı
+        """
+        response = self.client.get(reverse('todos:todo-list-create'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('db;desc=', response['Server-Timing'])
+        self.assertIn('render;dur=', response['Server-Timing'])
+
+    def test_metrics_tagged_by_url_name(self):
+        """
+        Metrikler URL adıyla etiketlenmeli ve Prometheus formatında sunulmalı
+        """
+        self.client.get(reverse('todos:todo-list-create'))
+        self.client.get(reverse('calendar_app:today-events'))
+
+        response = self.client.get(reverse('metrics'))
+        body = response.content.decode()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('# TYPE todocalendar_http_requests_total counter', body)
+        self.assertIn('todocalendar_http_requests_total{method="GET",status="200",view="todo-list-create"} 1', body)
+        self.assertIn('todocalendar_db_queries_count{view="today-events"} 1', body)
+        self.assertIn('todocalendar_http_request_duration_seconds_bucket{view="todo-list-create",le="+Inf"} 1', body)
+
+    def test_metrics_forbidden_for_other_ips(self):
+        """
+        İzin verilmeyen IP'lerden /metrics/ erişimi reddedilmeli
+        """
+        response = self.client.get(reverse('metrics'), REMOTE_ADDR='10.0.0.1')
+        self.assertEqual(response.status_code, 403)
+
+
+@override_settings(QUERY_INSPECTOR={'ENABLED': True, 'MODE': 'raise', 'DUPLICATE_THRESHOLD': 3, 'SLOW_QUERY_MS': 1000})
+class QueryInspectorTest(TestCase):
+    """
+    N+1 / yavaş sorgu dedektörü ve sorgu bütçesi testleri
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        for name in ('İş', 'Ev', 'Spor'):
+            Category.objects.create(name=name, user=self.user)
+
+    def test_normalize_sql(self):
+        """
+        Sadece parametreleri farklı sorgular aynı metne indirgenmeli
+        """
+        self.assertEqual(
+            normalize_sql("SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = 'x' LIMIT 21"),
+            normalize_sql("SELECT *  FROM t WHERE id IN (%s) AND name = 'y' LIMIT 5"),
+        )
+
+    def test_detects_n_plus_one(self):
+        """
+        Her kategori için ayrı COUNT sorgusu N+1 olarak işaretlenmeli
+        """
+        with QueryInspector() as inspector:
+            for category in Category.objects.filter(user=self.user):
+                category.todos.count()
+
+        problems = inspector.problems()
+        self.assertEqual(len(problems), 1)
+        self.assertEqual(problems[0]['type'], 'n_plus_one')
+        self.assertEqual(problems[0]['count'], 3)
+
+    def test_detects_slow_queries(self):
+        """
+        Eşiği aşan sorgular yavaş olarak işaretlenmeli
+        """
+        with QueryInspector(slow_query_ms=0) as inspector:
+            list(Category.objects.all())
+
+        self.assertEqual(inspector.problems()[0]['type'], 'slow_query')
+
+    def test_query_budget_raises_in_ci_mode(self):
+        """
+        Bütçeyi aşan view CI modunda hata vermeli
+        """
+        @query_budget(1)
+        def view():
+            for category in Category.objects.all():
+                category.todos.count()
+
+        with self.assertRaises(QueryProblemError):
+            view()
+
+    def test_query_budget_logs_in_staging_mode(self):
+        """
+        Staging modunda bütçe aşımı yapılandırılmış uyarı olarak loglanmalı
+        """
+        @query_budget(1)
+        def view():
+            return Category.objects.count() + Category.objects.count()
+
+        with self.settings(QUERY_INSPECTOR={'ENABLED': True, 'MODE': 'log'}):
+            with self.assertLogs('todocalendar.queries', 'WARNING') as logs:
+                self.assertEqual(view(), 6)
+
+        self.assertEqual(logs.records[0].query_problems[0]['type'], 'query_budget')
+
+
+class LoggingPipelineTest(TestCase):
+    """
+    Kuyruk tabanlı JSON loglama hattı testleri
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        token = RefreshToken.for_user(self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token.access_token}')
+
+    def make_record(self, name='todocalendar.test', level=logging.INFO, **extra):
+        record = logging.LogRecord(name, level, __file__, 1, 'mesaj %s', ('1',), None)
+        record.__dict__.update(extra)
+        return record
+
+    def test_json_formatter_includes_context_and_extra(self):
+        """
+        JSON satırı istek bağlamını ve extra alanlarını içermeli
+        """
+        request = RequestFactory().get('/api/todos/')
+        request.request_id = 'abc'
+        request.user = self.user
+        token = current_request.set(request)
+        try:
+            record = self.make_record(latency_ms=12.5)
+            RequestContextFilter().filter(record)
+        finally:
+            current_request.reset(token)
+
+        entry = json.loads(JSONFormatter().format(record))
+        self.assertEqual(entry['message'], 'mesaj 1')
+        self.assertEqual(entry['request_id'], 'abc')
+        self.assertEqual(entry['user_id'], self.user.pk)
+        self.assertEqual(entry['latency_ms'], 12.5)
+
+    def test_sampling_filter_per_logger(self):
+        """
+        Örnekleme logger önekine göre uygulanmalı, uyarılar her zaman geçmeli
+        """
+        sampling = SamplingFilter(rates={'django.server': 0.0, 'django': 1.0})
+
+        self.assertFalse(sampling.filter(self.make_record('django.server')))
+        self.assertTrue(sampling.filter(self.make_record('django.request')))
+        self.assertTrue(sampling.filter(self.make_record('django.server', logging.WARNING)))
+
+    def test_queue_handler_flush_and_external_rotation(self):
+        """
+        flush kuyruktaki tüm kayıtları yazmalı; dosya dışarıdan taşınınca yeni dosya açılmalı
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'app.log')
+            handler = QueueFileHandler(filename)
+            handler.setFormatter(JSONFormatter())
+            try:
+                for _ in range(10):
+                    handler.handle(self.make_record())
+                handler.flush()
+                with open(filename, encoding='utf-8') as log_file:
+                    self.assertEqual(len(log_file.read().splitlines()), 10)
+
+                # logrotate dosyayı taşır; dinleyici durdurulmadan yazmaya devam edilir
+                os.rename(filename, filename + '.1')
+                handler.handle(self.make_record(rotated=True))
+                handler.flush()
+            finally:
+                handler.close()
+
+            with open(filename, encoding='utf-8') as log_file:
+                lines = log_file.read().splitlines()
+            self.assertEqual(len(lines), 1)
+            self.assertTrue(json.loads(lines[0])['rotated'])
+
+    def test_access_log_and_request_id(self):
+        """
+        Her istek için request id döndürülmeli ve gecikme/sorgu sayısıyla erişim kaydı yazılmalı
+        """
+        with self.assertLogs('todocalendar.request', 'INFO') as logs:
+            response = self.client.get(reverse('todos:todo-list-create'), HTTP_X_REQUEST_ID='req-1')
+
+        self.assertEqual(response['X-Request-ID'], 'req-1')
+        record = logs.records[0]
+        self.assertEqual(record.status, 200)
+        self.assertGreater(record.query_count, 0)
+        self.assertIn('latency_ms', record.__dict__)
+
+
+class DatabaseHealthTest(TestCase):
+    """
+    Veritabanı sağlık kontrolü ve bağlantı havuzu metrikleri testleri
+    """
+    def test_health_endpoint(self):
+        """
+        Erişilebilir veritabanı için sağlık kontrolü 200 dönmeli
+        """
+        response = self.client.get(reverse('database_health'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], 'ok')
+        self.assertTrue(response.json()['databases']['default']['ok'])
+
+    def test_health_endpoint_reports_failure(self):
+        """
+        Veritabanına erişilemezse sağlık kontrolü 503 dönmeli
+        """
+        with mock.patch('todocalendar_project.views.check_database', return_value={'ok': False}):
+            response = self.client.get(reverse('database_health'))
+
+        self.assertEqual(response.status_code, 503)
+
+    def test_health_endpoint_hides_error_details(self):
+        """
+        Bağlantı hatasının metni yanıta değil loga yazılmalı
+        """
+        with mock.patch.object(connections['default'], 'cursor', side_effect=Exception('host=db.internal user=app')):
+            with self.assertLogs('todocalendar.db', level='ERROR'):
+                response = self.client.get(reverse('database_health'))
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['databases']['default'], {'ok': False})
+        self.assertNotIn('db.internal', response.content.decode())
+
+    @override_settings(METRICS={'ALLOWED_IPS': ['10.0.0.1']})
+    def test_health_endpoint_restricted_to_allowed_ips(self):
+        """
+        İzin verilen IP listesi dışından gelen istek 403 almalı
+        """
+        response = self.client.get(reverse('database_health'))
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_pool_metrics_rendered_as_gauges(self):
+        """
+        Havuz istatistikleri veritabanı etiketli gauge olarak sunulmalı
+        """
+        pool = mock.Mock()
+        pool.get_stats.return_value = {'pool_min': 2, 'pool_max': 10, 'pool_size': 4, 'pool_available': 3}
+        registry.reset()
+        with mock.patch('todocalendar_project.db.get_pool', return_value=pool):
+            response = self.client.get(reverse('metrics'))
+
+        body = response.content.decode()
+        self.assertIn('# TYPE todocalendar_db_pool_size gauge', body)
+        self.assertIn('todocalendar_db_pool_size{database="default"} 4', body)
+        self.assertIn('todocalendar_db_pool_requests_waiting{database="default"} 0', body)
+
+
+
+@override_settings(READ_REPLICAS={'DATABASES': ['replica_test'], 'PIN_SECONDS': 10})
+class ReadReplicaRoutingTest(APITestCase):
+    """
+    İki veritabanlı kurulumda replika yönlendirmesi ve read-your-writes testleri.
+
+    Replika, test sırasında oluşturulan ayrı bir veritabanıdır; birincile
+    yazılan ama replikaya kopyalanmayan satırlar replikasyon gecikmesini
+    temsil eder.
+    """
+    replica = 'replica_test'
+
+    @classmethod
+    def setUpClass(cls):
+        default = connections['default'].settings_dict
+        database = {**default, 'TEST': {**default['TEST'], 'NAME': None, 'MIRROR': None}}
+        if database['NAME'] != ':memory:' and 'sqlite' not in database['ENGINE']:
+            database['TEST']['NAME'] = f"{database['NAME']}_replica"
+        connections.settings[cls.replica] = database
+        connections[cls.replica].creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        # Test çalıştırıcı yalnızca yapılandırılmış veritabanlarını bildiği için
+        # replika alias'ı burada eklenir
+        cls.databases = {'default', cls.replica}
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[cls.replica].creation.destroy_test_db(
+            connections[cls.replica].settings_dict['NAME'], verbosity=0
+        )
+        del connections[cls.replica]
+        del connections.settings[cls.replica]
+        cls.databases = {'default'}
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        # Kullanıcı replikaya kopyalanmış, todo henüz kopyalanmamış
+        self.user.save(using=self.replica, force_insert=True)
+        self.todo = Todo.objects.create(title='Birincil', user=self.user)
+
+        token = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token.access_token}')
+        self.url = reverse('todos:todo-list-create')
+
+    def test_marked_reads_go_to_replica(self):
+        """
+        İşaretli liste ve istatistik endpoint'leri replikadan okumalı
+        """
+        self.assertEqual(self.client.get(self.url).data['count'], 0)
+        self.assertEqual(self.client.get(reverse('todos:todo-statistics')).data['total_todos'], 0)
+
+    def test_read_your_writes_after_write(self):
+        """
+        Yazma yapan kullanıcı sabitleme süresince birincilden okumalı
+        """
+        response = self.client.post(self.url, {'title': 'Yeni', 'priority': 'low'})
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(Todo.objects.using(self.replica).exists())
+
+        self.assertEqual(self.client.get(self.url).data['count'], 2)
+
+        cache.clear()
+        self.assertEqual(self.client.get(self.url).data['count'], 0)
+
+    def test_new_user_authenticates_before_replication(self):
+        """
+        Replikaya henüz kopyalanmamış yeni kullanıcının JWT doğrulaması birincilden yapılmalı
+        """
+        user = User.objects.create_user(email='new@example.com', username='newuser', password='testpass123')
+        token = RefreshToken.for_user(user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token.access_token}')
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 0)
+
+    def test_unmarked_views_and_orm_use_primary(self):
+        """
+        İşaretsiz view'lar ve istek dışı ORM kullanımı birincil veritabanını kullanmalı
+        """
+        response = self.client.get(reverse('todos:todo-detail', args=[self.todo.pk]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Todo.objects.all().db, 'default')
@@ -14,22 +14,32 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+import os
+
 from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
-from .views import HomeView, dashboard_view, api_info_view
+from .views import HomeView, dashboard_view, api_info_view, metrics_view, database_health_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', HomeView.as_view(), name='home'),
     path('dashboard/', dashboard_view, name='dashboard'),
     path('api-info/', api_info_view, name='api_info'),
+    path('metrics/', metrics_view, name='metrics'),
+    path('health/db/', database_health_view, name='database_health'),
     path('api/auth/', include('authentication.urls')),
     path('api/todos/', include('todos.urls')),
     path('api/calendar/', include('calendar_app.urls')),
+    path('api/uploads/', include('uploads.urls')),
 ]
 
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    # Ekler /media/ altından değil, yetki kontrollü indirme endpoint'lerinden sunulur;
+    # profil resimlerinin de yalnızca metadata'sı temizlenmiş boyutları sunulur
+    urlpatterns += static(
+        f'{settings.MEDIA_URL}avatars/',
+        document_root=os.path.join(settings.MEDIA_ROOT, 'avatars')
+    )
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
@@ -2,8 +2,13 @@ from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
 from django.utils.decorators import method_decorator
 from django.views.generic import TemplateView
-from django.http import JsonResponse
+from django.conf import settings
+from django.http import JsonResponse, HttpResponse, HttpResponseForbidden
 from django.contrib.auth import get_user_model
+from django.db import connections
+from taskqueue.queue import collect_task_metrics
+from .db import check_database, collect_pool_metrics
+from .metrics import registry
 
 User = get_user_model()
 
@@ -62,4 +67,42 @@ def api_info_view(request):
         }
     }
     
-    return JsonResponse(api_info) 
\ No newline at end of file
+    return JsonResponse(api_info) 
+
+
+def is_internal_request(request):
+    """
+    İstek METRICS['ALLOWED_IPS'] listesindeki bir adresten mi geliyor (liste boşsa herkese açık)
+    """
+    allowed_ips = getattr(settings, 'METRICS', {}).get('ALLOWED_IPS')
+    return not allowed_ips or request.META.get('REMOTE_ADDR') in allowed_ips
+
+
+def metrics_view(request):
+    """
+    Prometheus formatında istek metrikleri
+    """
+    if not is_internal_request(request):
+        return HttpResponseForbidden()
+
+    collect_pool_metrics()
+    collect_task_metrics()
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+def database_health_view(request):
+    """
+    Veritabanı sağlık kontrolü (yük dengeleyici / orkestratör için).
+
+    Yalnızca erişilebilirlik ve gecikme döner; havuz ayrıntıları /metrics/ altındadır.
+    """
+    if not is_internal_request(request):
+        return HttpResponseForbidden()
+
+    databases = {alias: check_database(alias) for alias in connections}
+
+    healthy = all(result['ok'] for result in databases.values())
+    return JsonResponse(
+        {'status': 'ok' if healthy else 'error', 'databases': databases},
+        status=200 if healthy else 503
+    )
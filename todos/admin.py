@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import Category, Todo, TodoAttachment, TodoComment
+from .models import ArchivedTodo, Category, Todo, TodoAttachment, TodoComment
 
 
 @admin.register(Category)
@@ -102,3 +102,20 @@ class TodoCommentAdmin(admin.ModelAdmin):
     def comment_preview(self, obj):
         return obj.comment[:50] + '...' if len(obj.comment) > 50 else obj.comment
     comment_preview.short_description = 'Yorum Önizleme'
+
+
+@admin.register(ArchivedTodo)
+class ArchivedTodoAdmin(admin.ModelAdmin):
+    """
+    Arşivlenmiş todo'lar admin paneli (salt okunur)
+    """
+    list_display = ('title', 'user', 'category', 'priority', 'completed_at', 'archived_at')
+    list_filter = ('priority', 'archived_at', 'user')
+    search_fields = ('title', 'description', 'user__username', 'user__email')
+    ordering = ('-archived_at',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,50 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from todocalendar_project.archive import archive_in_batches, get_options
+from .models import ArchivedTodo, Todo
+
+
+def archivable_todos(days=None, now=None):
+    """
+    `days` günden daha önce tamamlanmış todo'lar
+    """
+    days = get_options()['TODO_DAYS'] if days is None else days
+    cutoff = (now or timezone.now()) - timedelta(days=days)
+    return Todo.objects.filter(is_completed=True, completed_at__lt=cutoff)
+
+
+def snapshot_todo(todo):
+    """
+    Todo'nun yorum ve ek bilgilerini arşiv JSON'una çevir
+    """
+    return {
+        'comments': [
+            {
+                'user': comment.user_id,
+                'comment': comment.comment,
+                'created_at': comment.created_at.isoformat(),
+            }
+            for comment in todo.comments.all()
+        ],
+        'attachments': [
+            {
+                'filename': attachment.filename,
+                'file': attachment.file.name,
+                'file_size': attachment.file_size,
+                'sha256': attachment.blob.sha256 if attachment.blob_id else None,
+                'uploaded_by': attachment.uploaded_by_id,
+                'uploaded_at': attachment.uploaded_at.isoformat(),
+            }
+            for attachment in todo.attachments.all()
+        ],
+    }
+
+
+def archive_todos(days=None, **options):
+    """
+    Eski tamamlanmış todo'ları ArchivedTodo tablosuna taşı
+    """
+    queryset = archivable_todos(days).prefetch_related('comments', 'attachments__blob')
+    return archive_in_batches(queryset, ArchivedTodo, snapshot_todo, **options)
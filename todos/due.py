@@ -0,0 +1,194 @@
+"""
+Bitiş tarihi motoru: süresi geçmiş / bugün / bu hafta kovaları ve yaklaşan
+todo bildirimleri.
+
+Kova sınırları (şimdi, yerel gün sonu, yerel hafta sonu) istek başına bir kez
+DateWindow'dan hesaplanır; her kova bekleyen todo'lar üzerinde düz bir
+`due_date` aralığıdır ve `todo_user_pending_due_idx` ile taranır. Kovalar
+ayrıktır: `today` şu andan gün sonuna, `this_week` yarından hafta sonuna
+(Pazar) kadardır.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import send_mail
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from todocalendar_project.dates import date_window, user_timezone
+from todocalendar_project.metrics import registry
+from .models import Todo
+
+logger = logging.getLogger('todocalendar.due')
+
+OVERDUE = 'overdue'
+TODAY = 'today'
+THIS_WEEK = 'this_week'
+BUCKETS = (OVERDUE, TODAY, THIS_WEEK)
+
+DUE_NOTIFICATIONS_DEFAULTS = {
+    # Bitişine bu kadar dakika kalan bekleyen todo'lar bildirilir
+    'LEAD_MINUTES': 60,
+    'BATCH_SIZE': 500,
+}
+
+
+def get_options():
+    return {**DUE_NOTIFICATIONS_DEFAULTS, **getattr(settings, 'DUE_NOTIFICATIONS', {})}
+
+
+def days_until_due(due_date, is_completed, now):
+    """
+    Bitiş tarihine kalan tam gün; bitiş tarihi yoksa veya todo tamamlandıysa None
+    """
+    if due_date is None or is_completed:
+        return None
+    return (due_date - now).days
+
+
+def is_overdue(due_date, is_completed, now):
+    if due_date is None or is_completed:
+        return False
+    return now > due_date
+
+
+def pending_due(queryset):
+    """
+    Bitiş tarihi olan bekleyen todo'lar (kısmi index'lerin koşuluyla aynı)
+    """
+    return queryset.filter(is_completed=False, due_date__isnull=False)
+
+
+class DueBuckets:
+    """
+    Bir DateWindow'dan hesaplanan kova sınırları
+    """
+    def __init__(self, window):
+        self.now = window.now
+        self.today_end = window.day()[1]
+        self.week_end = window.week()[1]
+
+    def ranges(self):
+        return {
+            OVERDUE: (None, self.now),
+            TODAY: (self.now, self.today_end),
+            THIS_WEEK: (self.today_end, self.week_end),
+        }
+
+    def q(self, name):
+        start, end = self.ranges()[name]
+        condition = Q(is_completed=False, due_date__lt=end)
+        if start is not None:
+            condition &= Q(due_date__gte=start)
+        return condition
+
+    def filter(self, queryset, name):
+        return pending_due(queryset).filter(self.q(name))
+
+    def counts(self, queryset):
+        """
+        Tüm kovaların sayıları tek sorguda: {'overdue': 2, 'today': 1, 'this_week': 4}
+        """
+        return pending_due(queryset).aggregate(
+            **{name: Count('pk', filter=self.q(name)) for name in BUCKETS}
+        )
+
+
+class DueBucketFilter(BaseFilterBackend):
+    """
+    ?due=overdue|today|this_week ile listeyi bitiş tarihi kovasına göre filtreler
+    """
+    def filter_queryset(self, request, queryset, view):
+        name = request.query_params.get('due')
+        if not name:
+            return queryset
+        if name not in BUCKETS:
+            raise ValidationError({'due': f"Geçerli değerler: {', '.join(BUCKETS)}"})
+        return DueBuckets(date_window(request)).filter(queryset, name)
+
+
+def due_soon(now, lead_minutes):
+    """
+    Bitişi [now, now + lead) aralığında olan ve bu bitiş tarihi için henüz
+    bildirilmemiş todo'lar.
+
+    Bitiş tarihi değişen todo `due_notified_for` ile eşleşmediği için tekrar
+    bildirilir.
+    """
+    return pending_due(Todo.objects.all()).filter(
+        due_date__gte=now, due_date__lt=now + timedelta(minutes=lead_minutes),
+    ).exclude(due_notified_for=F('due_date'))
+
+
+def notify_due_soon(now=None, lead_minutes=None, batch_size=None):
+    """
+    Yaklaşan todo'ları partiler halinde bildirim kuyruğuna ekle; eklenen todo sayısını döndür.
+
+    Her parti tek transaction'dır: satırlar SKIP LOCKED ile alınır, bildirildi
+    olarak işaretlenir ve kullanıcı başına bir bildirim işi aynı commit ile
+    kuyruğa girer. Eşzamanlı çalışan kopyalar aynı todo'yu iki kez bildirmez.
+    """
+    from .tasks import send_due_notifications
+
+    options = get_options()
+    now = now or timezone.now()
+    lead_minutes = options['LEAD_MINUTES'] if lead_minutes is None else lead_minutes
+    batch_size = batch_size or options['BATCH_SIZE']
+    notified = 0
+
+    while True:
+        with transaction.atomic():
+            rows = list(
+                due_soon(now, lead_minutes).select_for_update(skip_locked=True)
+                .order_by('due_date', 'pk').values_list('pk', 'user_id')[:batch_size]
+            )
+            if not rows:
+                break
+            Todo.objects.filter(pk__in=[pk for pk, _ in rows]).update(due_notified_for=F('due_date'))
+
+            by_user = {}
+            for pk, user_id in rows:
+                by_user.setdefault(user_id, []).append(pk)
+            for user_id, todo_ids in by_user.items():
+                send_due_notifications.delay(user_id, todo_ids)
+
+        notified += len(rows)
+        registry.inc('todocalendar_due_notifications_total', {'stage': 'queued'}, 'Yaklaşan todo bildirimleri', len(rows))
+        if len(rows) < batch_size:
+            break
+
+    if notified:
+        logger.info('%s yaklaşan todo bildirim kuyruğuna eklendi', notified)
+    return notified
+
+
+def send_due_notification(user_id, todo_ids):
+    """
+    Kullanıcıya hâlâ bekleyen todo'ları için tek bir e-posta gönder
+    """
+    todos = list(
+        Todo.objects.filter(pk__in=todo_ids, user_id=user_id, is_completed=False)
+        .select_related('user').only('title', 'due_date', 'user__email', 'user__timezone')
+        .order_by('due_date')
+    )
+    if not todos:
+        return 0
+
+    user = todos[0].user
+    tz = user_timezone(user)
+    lines = [
+        f"- {todo.title} ({timezone.localtime(todo.due_date, tz):%d.%m.%Y %H:%M})"
+        for todo in todos
+    ]
+    send_mail(
+        subject=f"{len(todos)} todo'nun bitiş tarihi yaklaşıyor",
+        message='\n'.join(["Aşağıdaki todo'ların bitiş tarihi yaklaşıyor:", *lines]),
+        from_email=None,
+        recipient_list=[user.email],
+    )
+    registry.inc('todocalendar_due_notifications_total', {'stage': 'sent'}, 'Yaklaşan todo bildirimleri', len(todos))
+    return len(todos)
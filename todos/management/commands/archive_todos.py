@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from todocalendar_project.archive import get_options
+from todos.archive import archivable_todos, archive_todos
+
+
+class Command(BaseCommand):
+    """
+    Eski tamamlanmış todo'ları partiler halinde arşiv tablosuna taşır.
+    Her parti ayrı bir transaction'dır; yarıda kesilen çalıştırma tekrar
+    başlatıldığında kaldığı yerden devam eder.
+    """
+    help = "Eski tamamlanmış todo'ları arşivler"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=get_options()['TODO_DAYS'], help='Bu kadar gün önce tamamlananlar')
+        parser.add_argument('--batch-size', type=int, default=get_options()['BATCH_SIZE'])
+        parser.add_argument('--max-batches', type=int, help='En fazla çalıştırılacak parti sayısı')
+        parser.add_argument('--pause', type=float, default=0, help='Partiler arası bekleme (sn)')
+        parser.add_argument('--dry-run', action='store_true', help='Sadece arşivlenecek kayıt sayısını göster')
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            self.stdout.write(f"{archivable_todos(options['days']).count()} todo arşivlenecek.")
+            return
+
+        moved = archive_todos(
+            options['days'],
+            batch_size=options['batch_size'],
+            max_batches=options['max_batches'],
+            pause=options['pause'],
+            progress=lambda moved, last_id: self.stdout.write(f'{moved} todo taşındı (son id: {last_id})'),
+        )
+        self.stdout.write(self.style.SUCCESS(f'Toplam {moved} todo arşivlendi.'))
@@ -0,0 +1,98 @@
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from calendar_app.models import Calendar, Event
+from calendar_app.serializers import EventListSerializer
+from todocalendar_project.renderers import FastJSONRenderer
+from todos.models import Category, Todo, TodoComment
+from todos.serializers import TodoCommentSerializer, TodoDetailSerializer
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    """
+    20 öğelik liste sayfaları için DRF JSONRenderer ile FastJSONRenderer'ı karşılaştırır.
+    Veriler tek bir transaction içinde oluşturulur ve geri alınır.
+    """
+    help = 'Liste sayfası başına JSON render süresini DRF ve orjson renderer ile karşılaştırır'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=2000, help='Her renderer için render sayısı')
+        parser.add_argument('--page-size', type=int, default=20, help='Sayfadaki öğe sayısı')
+        parser.add_argument('--comments', type=int, default=5, help='Todo başına yorum sayısı')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            payloads = self._build_payloads(options['page_size'], options['comments'])
+            transaction.set_rollback(True)
+
+        for name, data in payloads.items():
+            self.stdout.write(f'{name}:')
+            results = {
+                label: self._measure(renderer, data, options['iterations'])
+                for label, renderer in (('DRF', JSONRenderer()), ('orjson', FastJSONRenderer()))
+            }
+            for label, elapsed in results.items():
+                self.stdout.write(f'  {label:<8} {elapsed * 1e6:9.1f} µs/sayfa')
+            saving = results['DRF'] - results['orjson']
+            self.stdout.write(f'  kazanç   {saving * 1e6:9.1f} µs/istek (%{saving / results["DRF"] * 100:.0f})')
+
+    def _build_payloads(self, page_size, comments):
+        user = User.objects.create_user(
+            email='benchmark-json@example.com',
+            username='benchmark-json',
+            password='benchmark-pass-123',
+        )
+        category = Category.objects.create(name='Benchmark', user=user)
+        now = timezone.now()
+        todos = []
+        for i in range(page_size):
+            todo = Todo.objects.create(
+                title=f'Benchmark todo {i} - çalışma planı',
+                description='Açıklama ' * 10,
+                user=user,
+                category=category,
+                due_date=now + timedelta(days=i),
+                estimated_duration=timedelta(hours=1, minutes=i),
+            )
+            TodoComment.objects.bulk_create(
+                TodoComment(todo=todo, user=user, comment=f'Yorum {j}') for j in range(comments)
+            )
+            todos.append(todo)
+
+        # Etkinlikler kaydedilmeden serialize edilir; duration alanı timedelta döner
+        calendar = Calendar.objects.create(name='Benchmark', user=user)
+        events = [
+            Event(
+                id=i + 1,
+                title=f'Benchmark etkinlik {i}',
+                description='Açıklama ' * 10,
+                calendar=calendar,
+                user=user,
+                start_time=now + timedelta(hours=i),
+                end_time=now + timedelta(hours=i, minutes=45),
+                location='İstanbul',
+            )
+            for i in range(page_size)
+        ]
+
+        return {
+            'TodoDetailSerializer': TodoDetailSerializer(todos, many=True).data,
+            'TodoCommentSerializer': TodoCommentSerializer(
+                TodoComment.objects.filter(todo__user=user).select_related('user')[:page_size], many=True
+            ).data,
+            'EventListSerializer': EventListSerializer(events, many=True).data,
+        }
+
+    def _measure(self, renderer, data, iterations):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            renderer.render(data)
+        return (time.perf_counter() - started) / iterations
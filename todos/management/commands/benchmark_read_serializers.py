@@ -0,0 +1,85 @@
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from calendar_app.models import Calendar, Event
+from calendar_app.serializers import EventListSerializer, EventListReadSerializer
+from todos.models import Category, Todo
+from todos.serializers import TodoListSerializer, TodoListReadSerializer
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    """
+    ModelSerializer tabanlı liste serializer'ları ile .values() tabanlı hızlı
+    serializer'ları karşılaştırır. Veriler tek bir transaction içinde oluşturulur
+    ve geri alınır.
+    """
+    help = 'Liste serializer\'larını .values() tabanlı hızlı serializer\'larla karşılaştırır'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help='Todo ve etkinlik sayısı')
+        parser.add_argument('--repeat', type=int, default=3, help='Ölçüm tekrarı (en iyi sonuç alınır)')
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        with transaction.atomic():
+            user = self._seed(rows)
+            todos = Todo.objects.filter(user=user).select_related('category')
+            events = Event.objects.filter(user=user).select_related('calendar')
+
+            self.stdout.write(f'{rows} satır, en iyi {options["repeat"]} ölçüm (sorgu dahil):')
+            for label, func in (
+                ('TodoListSerializer', lambda: TodoListSerializer(todos.all(), many=True).data),
+                ('TodoListReadSerializer', lambda: TodoListReadSerializer(TodoListReadSerializer.values(todos.all())).data),
+                ('EventListSerializer', lambda: EventListSerializer(events.all(), many=True).data),
+                ('EventListReadSerializer', lambda: EventListReadSerializer(EventListReadSerializer.values(events.all())).data),
+            ):
+                elapsed = min(self._measure(func) for _ in range(options['repeat']))
+                self.stdout.write(
+                    f'  {label:<24} {elapsed * 1000:8.1f} ms  {elapsed / rows * 1e6:6.2f} µs/satır'
+                )
+
+            transaction.set_rollback(True)
+
+    def _seed(self, rows):
+        user = User.objects.create_user(
+            email='benchmark-read@example.com',
+            username='benchmark-read',
+            password='benchmark-pass-123',
+        )
+        category = Category.objects.create(name='Benchmark', user=user)
+        calendar = Calendar.objects.create(name='Benchmark', user=user)
+        now = timezone.now()
+
+        Todo.objects.bulk_create(
+            Todo(
+                title=f'Benchmark todo {i}',
+                user=user,
+                category=category if i % 2 else None,
+                due_date=now + timedelta(hours=i - rows // 2) if i % 3 else None,
+                is_completed=not i % 5,
+            )
+            for i in range(rows)
+        )
+        Event.objects.bulk_create(
+            Event(
+                title=f'Benchmark etkinlik {i}',
+                calendar=calendar,
+                user=user,
+                start_time=now + timedelta(hours=i - rows // 2),
+                end_time=now + timedelta(hours=i - rows // 2, minutes=90),
+            )
+            for i in range(rows)
+        )
+        return user
+
+    def _measure(self, func):
+        started = time.perf_counter()
+        func()
+        return time.perf_counter() - started
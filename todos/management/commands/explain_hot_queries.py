@@ -0,0 +1,140 @@
+import re
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from calendar_app.models import Calendar, Event, EventReminder
+from calendar_app.agenda import agenda_queryset
+from calendar_app.serializers import AgendaReadSerializer, EventListReadSerializer
+from todos.models import Category, Todo, Priority
+from todos.due import OVERDUE, DueBuckets, due_soon
+from todos.serializers import TodoListReadSerializer
+from todocalendar_project.dates import DateWindow, user_timezone
+
+User = get_user_model()
+
+# Sıralı tarama satırları: PostgreSQL "Seq Scan on <tablo>", SQLite "SCAN <tablo>"
+SEQ_SCAN_PATTERNS = {
+    'postgresql': re.compile(r'Seq Scan on (\w+)'),
+    'sqlite': re.compile(r'\bSCAN (\w+)(?! USING)'),
+}
+
+
+class Command(BaseCommand):
+    """
+    Sık kullanılan endpoint sorgularını büyük bir örnek veri üzerinde EXPLAIN ile
+    inceler; sıralı taramaya düşen sorgu varsa hata ile çıkar. Veriler tek bir
+    transaction içinde oluşturulur ve geri alınır.
+    """
+    help = 'Sık kullanılan endpoint sorgularının index kullandığını EXPLAIN ile doğrular'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50, help='Örnek kullanıcı sayısı')
+        parser.add_argument('--rows', type=int, default=2000, help='Kullanıcı başına todo/etkinlik sayısı')
+        parser.add_argument('--verbose-plans', action='store_true', help='Tüm sorgu planlarını yazdır')
+
+    def handle(self, *args, **options):
+        pattern = SEQ_SCAN_PATTERNS.get(connection.vendor)
+        if pattern is None:
+            raise CommandError(f'{connection.vendor} veritabanı desteklenmiyor.')
+
+        failures = []
+        with transaction.atomic():
+            user = self._seed(options['users'], options['rows'])
+
+            for name, queryset in self._hot_queries(user):
+                plan = queryset.explain()
+                scanned = [table for table in pattern.findall(plan) if table == queryset.model._meta.db_table]
+                if scanned:
+                    failures.append(name)
+                    self.stdout.write(self.style.ERROR(f'SEQ SCAN  {name}'))
+                else:
+                    self.stdout.write(self.style.SUCCESS(f'INDEX     {name}'))
+                if scanned or options['verbose_plans']:
+                    self.stdout.write('    ' + plan.replace('\n', '\n    '))
+
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError(f'Sıralı taramaya düşen sorgular: {", ".join(failures)}')
+
+    def _hot_queries(self, user):
+        window = DateWindow(user_timezone(user))
+        now = window.now
+        week = now + timedelta(days=7)
+        day_start, day_end = window.day()
+        todo_start, todo_end = window.days(8)
+        todos = Todo.objects.filter(user=user)
+        events = Event.objects.filter(user=user)
+
+        return [
+            ('todo-list-create', TodoListReadSerializer.values(todos.order_by('-created_at'))[:20]),
+            ('todo-statistics:completed', todos.filter(is_completed=True)),
+            ('todo-statistics:high_priority', todos.filter(priority=Priority.HIGH)),
+            ('todo-statistics:overdue', DueBuckets(window).filter(todos, OVERDUE)),
+            ('upcoming-todos', TodoListReadSerializer.values(
+                todos.filter(due_date__gte=todo_start, due_date__lt=todo_end, is_completed=False).order_by('due_date')
+            )),
+            ('event-list-create', EventListReadSerializer.values(events.order_by('-start_time'))[:20]),
+            ('today-events', EventListReadSerializer.values(events.filter(start_time__gte=day_start, start_time__lt=day_end).order_by('start_time'))),
+            ('upcoming-events', EventListReadSerializer.values(
+                events.filter(start_time__range=[now, week]).order_by('start_time')
+            )),
+            ('calendar-statistics:upcoming', events.filter(start_time__gte=day_end)),
+            ('agenda', agenda_queryset(user, *window.days(7), AgendaReadSerializer)),
+            ('due-soon-notifications', due_soon(now, 60).order_by('due_date', 'pk')),
+            ('unsent-reminders', EventReminder.objects.filter(is_sent=False, reminder_time__lte=now).order_by('reminder_time')),
+        ]
+
+    def _seed(self, users, rows):
+        now = timezone.now()
+        priorities = list(Priority.values)
+        target = None
+
+        for u in range(users):
+            user = User.objects.create_user(
+                email=f'explain-{u}@example.com',
+                username=f'explain-{u}',
+                password=None,
+            )
+            category = Category.objects.create(name='Explain', user=user)
+            calendar = Calendar.objects.create(name='Explain', user=user)
+            Todo.objects.bulk_create(
+                Todo(
+                    title=f'Todo {i}',
+                    user=user,
+                    category=category if i % 2 else None,
+                    priority=priorities[i % len(priorities)],
+                    is_completed=i % 4 != 0,
+                    due_date=now + timedelta(hours=i - rows // 2) if i % 3 else None,
+                )
+                for i in range(rows)
+            )
+            created = Event.objects.bulk_create(
+                Event(
+                    title=f'Etkinlik {i}',
+                    calendar=calendar,
+                    user=user,
+                    start_time=now + timedelta(hours=i - rows // 2),
+                    end_time=now + timedelta(hours=i - rows // 2, minutes=30),
+                )
+                for i in range(rows)
+            )
+            if connection.features.can_return_rows_from_bulk_insert:
+                EventReminder.objects.bulk_create(
+                    EventReminder(
+                        event=event,
+                        reminder_time=event.start_time - timedelta(minutes=15),
+                        is_sent=event.start_time < now,
+                    )
+                    for event in created
+                )
+            target = user
+
+        # Planlayıcının güncel istatistiklerle çalışması için
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        return target
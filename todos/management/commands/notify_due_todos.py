@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from todos.due import get_options, notify_due_soon
+
+
+class Command(BaseCommand):
+    """
+    Bitişi yaklaşan bekleyen todo'lar için kullanıcı başına bildirim işlerini
+    kuyruğa ekler (cron ile periyodik çalıştırın; e-postaları run_worker gönderir).
+    """
+    help = "Bitişi yaklaşan todo'ları bildirir"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lead-minutes', type=int, default=get_options()['LEAD_MINUTES'], help='Bitişine bu kadar dakika kalanlar')
+        parser.add_argument('--batch-size', type=int, default=get_options()['BATCH_SIZE'])
+
+    def handle(self, *args, **options):
+        count = notify_due_soon(lead_minutes=options['lead_minutes'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'{count} todo bildirim kuyruğuna eklendi.'))
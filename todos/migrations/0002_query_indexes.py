@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='todo',
+            index=models.Index(fields=['user', '-created_at'], name='todo_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='todo',
+            index=models.Index(fields=['user', 'is_completed'], name='todo_user_completed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='todo',
+            index=models.Index(fields=['user', 'priority'], name='todo_user_priority_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='todo',
+            index=models.Index(condition=models.Q(('due_date__isnull', False), ('is_completed', False)), fields=['user', 'due_date'], name='todo_user_pending_due_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:33
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0002_query_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedTodo',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=200, verbose_name='Başlık')),
+                ('description', models.TextField(blank=True, null=True, verbose_name='Açıklama')),
+                ('is_completed', models.BooleanField(default=True, verbose_name='Tamamlandı')),
+                ('priority', models.CharField(choices=[('low', 'Düşük'), ('medium', 'Orta'), ('high', 'Yüksek'), ('urgent', 'Acil')], default='medium', max_length=10, verbose_name='Öncelik')),
+                ('due_date', models.DateTimeField(blank=True, null=True, verbose_name='Bitiş Tarihi')),
+                ('completed_at', models.DateTimeField(blank=True, null=True, verbose_name='Tamamlanma Tarihi')),
+                ('created_at', models.DateTimeField(verbose_name='Oluşturulma Tarihi')),
+                ('updated_at', models.DateTimeField(verbose_name='Güncellenme Tarihi')),
+                ('is_important', models.BooleanField(default=False, verbose_name='Önemli')),
+                ('is_starred', models.BooleanField(default=False, verbose_name='Yıldızlı')),
+                ('estimated_duration', models.DurationField(blank=True, null=True, verbose_name='Tahmini Süre')),
+                ('actual_duration', models.DurationField(blank=True, null=True, verbose_name='Gerçek Süre')),
+                ('related', models.JSONField(blank=True, default=dict, verbose_name='Yorumlar ve Ekler')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='Arşivlenme Tarihi')),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_todos', to='todos.category', verbose_name='Kategori')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_todos', to=settings.AUTH_USER_MODEL, verbose_name='Kullanıcı')),
+            ],
+            options={
+                'verbose_name': 'Arşivlenmiş Todo',
+                'verbose_name_plural': "Arşivlenmiş Todo'lar",
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['user', '-created_at'], name='archived_todo_user_created_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0003_archived_todo'),
+        ('uploads', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='todoattachment',
+            name='blob',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='todo_attachments', to='uploads.storedblob', verbose_name='Saklanan Dosya'),
+        ),
+        migrations.AddField(
+            model_name='todoattachment',
+            name='uploaded_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Yükleyen'),
+        ),
+    ]
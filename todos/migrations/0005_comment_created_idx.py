@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0004_attachment_blob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='todocomment',
+            index=models.Index(fields=['todo', '-created_at'], name='todo_comment_created_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0005_comment_created_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='todo',
+            name='due_notified_for',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Bildirilen Bitiş Tarihi'),
+        ),
+        migrations.AddIndex(
+            model_name='todo',
+            index=models.Index(condition=models.Q(('due_date__isnull', False), ('is_completed', False)), fields=['due_date'], name='todo_pending_due_idx'),
+        ),
+    ]
@@ -58,11 +58,32 @@ class Todo(models.Model):
     is_starred = models.BooleanField(default=False, verbose_name="Yıldızlı")
     estimated_duration = models.DurationField(null=True, blank=True, verbose_name="Tahmini Süre")
     actual_duration = models.DurationField(null=True, blank=True, verbose_name="Gerçek Süre")
+    # Yaklaşan bildirimi gönderilen bitiş tarihi; bitiş tarihi değişince tekrar bildirilir
+    due_notified_for = models.DateTimeField(null=True, blank=True, editable=False, verbose_name="Bildirilen Bitiş Tarihi")
 
     class Meta:
         verbose_name = "Todo"
         verbose_name_plural = "Todos"
         ordering = ['-created_at']
+        indexes = [
+            # Liste: filter(user=...).order_by('-created_at')
+            models.Index(fields=['user', '-created_at'], name='todo_user_created_idx'),
+            # İstatistikler: tamamlanan/bekleyen ve öncelik sayıları
+            models.Index(fields=['user', 'is_completed'], name='todo_user_completed_idx'),
+            models.Index(fields=['user', 'priority'], name='todo_user_priority_idx'),
+            # Yaklaşan ve süresi geçmiş todo'lar: sadece bitiş tarihi olan bekleyen todo'lar
+            models.Index(
+                fields=['user', 'due_date'],
+                name='todo_user_pending_due_idx',
+                condition=models.Q(is_completed=False, due_date__isnull=False),
+            ),
+            # Yaklaşan todo bildirimleri: tüm kullanıcılarda bitiş tarihine göre tek tarama
+            models.Index(
+                fields=['due_date'],
+                name='todo_pending_due_idx',
+                condition=models.Q(is_completed=False, due_date__isnull=False),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.user.username}"
@@ -82,19 +103,16 @@ class Todo(models.Model):
         """
         Todo'nun süresi geçmiş mi kontrol et
         """
-        if self.due_date and not self.is_completed:
-            return timezone.now() > self.due_date
-        return False
+        from .due import is_overdue
+        return is_overdue(self.due_date, self.is_completed, timezone.now())
 
     @property
     def days_until_due(self):
         """
         Bitiş tarihine kaç gün kaldığını hesapla
         """
-        if self.due_date and not self.is_completed:
-            delta = self.due_date - timezone.now()
-            return delta.days
-        return None
+        from .due import days_until_due
+        return days_until_due(self.due_date, self.is_completed, timezone.now())
 
 
 class TodoAttachment(models.Model):
@@ -106,6 +124,9 @@ class TodoAttachment(models.Model):
     filename = models.CharField(max_length=255, verbose_name="Dosya Adı")
     file_size = models.PositiveIntegerField(verbose_name="Dosya Boyutu")
     uploaded_at = models.DateTimeField(auto_now_add=True, verbose_name="Yüklenme Tarihi")
+    # Yükleme hattıyla eklenen dosyalar içerik adresli blob'a bağlanır
+    blob = models.ForeignKey('uploads.StoredBlob', on_delete=models.PROTECT, null=True, blank=True, related_name='todo_attachments', verbose_name="Saklanan Dosya")
+    uploaded_by = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='+', verbose_name="Yükleyen")
 
     class Meta:
         verbose_name = "Todo Eki"
@@ -129,6 +150,47 @@ class TodoComment(models.Model):
         verbose_name = "Todo Yorumu"
         verbose_name_plural = "Todo Yorumları"
         ordering = ['-created_at']
+        indexes = [
+            # Yorum sayfaları: filter(todo=...).order_by('-created_at', '-id')
+            models.Index(fields=['todo', '-created_at'], name='todo_comment_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.todo.title}"
+
+
+class ArchivedTodo(models.Model):
+    """
+    Arşivlenmiş (uzun süre önce tamamlanmış) todo'lar.
+
+    Canlı tablodan aynı id ile taşınır; yorum ve ek bilgileri `related`
+    alanında salt-okunur olarak saklanır.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=200, verbose_name="Başlık")
+    description = models.TextField(blank=True, null=True, verbose_name="Açıklama")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_todos', verbose_name="Kullanıcı")
+    category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True, related_name='archived_todos', verbose_name="Kategori")
+    is_completed = models.BooleanField(default=True, verbose_name="Tamamlandı")
+    priority = models.CharField(max_length=10, choices=Priority.choices, default=Priority.MEDIUM, verbose_name="Öncelik")
+    due_date = models.DateTimeField(null=True, blank=True, verbose_name="Bitiş Tarihi")
+    completed_at = models.DateTimeField(null=True, blank=True, verbose_name="Tamamlanma Tarihi")
+    created_at = models.DateTimeField(verbose_name="Oluşturulma Tarihi")
+    updated_at = models.DateTimeField(verbose_name="Güncellenme Tarihi")
+    is_important = models.BooleanField(default=False, verbose_name="Önemli")
+    is_starred = models.BooleanField(default=False, verbose_name="Yıldızlı")
+    estimated_duration = models.DurationField(null=True, blank=True, verbose_name="Tahmini Süre")
+    actual_duration = models.DurationField(null=True, blank=True, verbose_name="Gerçek Süre")
+    related = models.JSONField(default=dict, blank=True, verbose_name="Yorumlar ve Ekler")
+    archived_at = models.DateTimeField(auto_now_add=True, verbose_name="Arşivlenme Tarihi")
+
+    class Meta:
+        verbose_name = "Arşivlenmiş Todo"
+        verbose_name_plural = "Arşivlenmiş Todo'lar"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='archived_todo_user_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.title} - {self.user.username}"
@@ -0,0 +1,14 @@
+from rest_framework.pagination import CursorPagination
+
+
+class TodoCommentPagination(CursorPagination):
+    """
+    Yorumlar için keyset (cursor) sayfalama.
+
+    OFFSET yerine son görülen created_at değerinden devam edilir; binlerce
+    yorumu olan todo'larda da her sayfa (todo, created_at) indeksinden okunur.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
@@ -11,7 +11,7 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
             return True
         
         # Yazma izni sadece objenin sahibine
-        return obj.user == request.user
+        return obj.user_id == request.user.pk
 
 
 class IsOwner(permissions.BasePermission):
@@ -19,4 +19,4 @@ class IsOwner(permissions.BasePermission):
     Sadece sahibi erişebilir
     """
     def has_object_permission(self, request, view, obj):
-        return obj.user == request.user
+        return obj.user_id == request.user.pk
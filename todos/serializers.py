@@ -1,15 +1,27 @@
+from functools import cached_property
+from operator import itemgetter
+
+from django.db.models import Count
+from django.urls import reverse
+from django.utils import timezone
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from .models import Category, Todo, TodoAttachment, TodoComment
+from todocalendar_project.dates import date_window
+from todocalendar_project.fast_serializers import SKIP, ValuesReadSerializer
+from todocalendar_project.field_selection import DynamicFieldsMixin
+from .due import days_until_due, is_overdue
+from .models import Category, Priority, Todo, TodoAttachment, TodoComment
 
 User = get_user_model()
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Kategori serializer'ı
     """
     todo_count = serializers.SerializerMethodField()
+    # Listede istendiğinde satır başına COUNT yerine tek sorguda annotate edilir
+    field_annotations = {'todo_count': Count('todos')}
 
     class Meta:
         model = Category
@@ -20,20 +32,31 @@ class CategorySerializer(serializers.ModelSerializer):
         """
         Kategoriye ait todo sayısını getir
         """
+        if hasattr(obj, 'todo_count'):
+            return obj.todo_count
         return obj.todos.count()
 
 
-class TodoAttachmentSerializer(serializers.ModelSerializer):
+class TodoAttachmentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Todo eki serializer'ı
     """
+    # Dosya /media/ yerine yetki kontrollü indirme endpoint'inden sunulur
+    file = serializers.SerializerMethodField()
+    field_dependencies = {'file': ()}
+
     class Meta:
         model = TodoAttachment
         fields = ('id', 'filename', 'file', 'file_size', 'uploaded_at')
         read_only_fields = ('id', 'filename', 'file_size', 'uploaded_at')
 
+    def get_file(self, obj):
+        url = reverse('todos:todo-attachment-download', kwargs={'pk': obj.pk})
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
 
-class TodoCommentSerializer(serializers.ModelSerializer):
+
+class TodoCommentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Todo yorumu serializer'ı
     """
@@ -46,7 +69,7 @@ class TodoCommentSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'user', 'created_at', 'updated_at')
 
 
-class TodoCreateSerializer(serializers.ModelSerializer):
+class TodoCreateSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Todo oluşturma için basit serializer
     """
@@ -66,14 +89,35 @@ class TodoCreateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class TodoListSerializer(serializers.ModelSerializer):
+class DueStateMixin:
+    """
+    days_until_due / is_overdue alanları: `now` satır başına değil, isteğin
+    DateWindow'undan serializer başına bir kez alınır
+    """
+    @cached_property
+    def due_now(self):
+        request = self.context.get('request')
+        return date_window(request).now if request is not None else timezone.now()
+
+    def get_days_until_due(self, obj):
+        return days_until_due(obj.due_date, obj.is_completed, self.due_now)
+
+    def get_is_overdue(self, obj):
+        return is_overdue(obj.due_date, obj.is_completed, self.due_now)
+
+
+class TodoListSerializer(DueStateMixin, DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Todo listesi için basit serializer
     """
     category_name = serializers.CharField(source='category.name', read_only=True)
     category_color = serializers.CharField(source='category.color', read_only=True)
-    days_until_due = serializers.ReadOnlyField()
-    is_overdue = serializers.ReadOnlyField()
+    days_until_due = serializers.SerializerMethodField()
+    is_overdue = serializers.SerializerMethodField()
+    field_dependencies = {
+        'days_until_due': ('due_date', 'is_completed'),
+        'is_overdue': ('due_date', 'is_completed'),
+    }
 
     class Meta:
         model = Todo
@@ -84,17 +128,69 @@ class TodoListSerializer(serializers.ModelSerializer):
         )
 
 
-class TodoDetailSerializer(serializers.ModelSerializer):
+class TodoListReadSerializer(ValuesReadSerializer):
+    """
+    TodoListSerializer ile aynı çıktıyı .values() satırlarından üreten hızlı serializer
+    """
+    value_fields = (
+        'id', 'title', 'description', 'category', 'category__name', 'category__color',
+        'is_completed', 'priority', 'due_date', 'is_important', 'is_starred',
+        'created_at', 'updated_at'
+    )
+
+    field_sources = {
+        'category_name': ('category', 'category__name'),
+        'category_color': ('category', 'category__color'),
+        'days_until_due': ('due_date', 'is_completed'),
+        'is_overdue': ('due_date', 'is_completed'),
+    }
+
+    def get_builders(self):
+        now = self.now
+        format_datetime = self.format_datetime
+
+        # DRF, kategori yokken category.name kaynaklı alanları çıktıya eklemez
+        def category_value(column):
+            return lambda row: row[column] if row['category'] is not None else SKIP
+
+        return {
+            'id': itemgetter('id'),
+            'title': itemgetter('title'),
+            'description': itemgetter('description'),
+            'category': itemgetter('category'),
+            'category_name': category_value('category__name'),
+            'category_color': category_value('category__color'),
+            'is_completed': itemgetter('is_completed'),
+            'priority': itemgetter('priority'),
+            'due_date': lambda row: format_datetime(row['due_date']),
+            'is_important': itemgetter('is_important'),
+            'is_starred': itemgetter('is_starred'),
+            'days_until_due': lambda row: days_until_due(row['due_date'], row['is_completed'], now),
+            'is_overdue': lambda row: is_overdue(row['due_date'], row['is_completed'], now),
+            'created_at': lambda row: format_datetime(row['created_at']),
+            'updated_at': lambda row: format_datetime(row['updated_at']),
+        }
+
+
+class TodoDetailSerializer(DueStateMixin, DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Todo detayı için kapsamlı serializer
     """
     category = CategorySerializer(read_only=True)
     category_id = serializers.IntegerField(write_only=True, required=False)
     attachments = TodoAttachmentSerializer(many=True, read_only=True)
-    comments = TodoCommentSerializer(many=True, read_only=True)
-    days_until_due = serializers.ReadOnlyField()
-    is_overdue = serializers.ReadOnlyField()
+    # Yorumlar sınırsız büyüyebilir; liste /api/todos/<pk>/comments/ üzerinden sayfalanır
+    comment_count = serializers.SerializerMethodField()
+    days_until_due = serializers.SerializerMethodField()
+    is_overdue = serializers.SerializerMethodField()
     duration = serializers.SerializerMethodField()
+    expandable_fields = ('category', 'attachments')
+    field_annotations = {'comment_count': Count('comments')}
+    field_dependencies = {
+        'days_until_due': ('due_date', 'is_completed'),
+        'is_overdue': ('due_date', 'is_completed'),
+        'duration': ('actual_duration', 'estimated_duration'),
+    }
 
     class Meta:
         model = Todo
@@ -103,10 +199,18 @@ class TodoDetailSerializer(serializers.ModelSerializer):
             'is_completed', 'priority', 'due_date', 'completed_at',
             'is_important', 'is_starred', 'estimated_duration', 'actual_duration',
             'days_until_due', 'is_overdue', 'duration',
-            'attachments', 'comments', 'created_at', 'updated_at'
+            'attachments', 'comment_count', 'created_at', 'updated_at'
         )
         read_only_fields = ('id', 'completed_at', 'created_at', 'updated_at')
 
+    def get_comment_count(self, obj):
+        """
+        Todo'ya yapılan yorum sayısını getir
+        """
+        if hasattr(obj, 'comment_count'):
+            return obj.comment_count
+        return obj.comments.count()
+
     def get_duration(self, obj):
         """
         Todo'nun süresini hesapla
@@ -125,7 +229,7 @@ class TodoDetailSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class TodoCommentCreateSerializer(serializers.ModelSerializer):
+class TodoCommentCreateSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Todo yorumu oluşturma serializer'ı
     """
@@ -140,3 +244,26 @@ class TodoCommentCreateSerializer(serializers.ModelSerializer):
         """
         validated_data['user'] = self.context['request'].user
         return super().create(validated_data)
+
+
+class TodoBulkCompleteSerializer(serializers.Serializer):
+    """
+    Toplu tamamlama isteği: id listesi veya filtre (kategori, öncelik, bitiş tarihi)
+    """
+    MAX_IDS = 1000
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False, allow_empty=False, max_length=MAX_IDS
+    )
+    category = serializers.IntegerField(required=False, allow_null=True)
+    priority = serializers.ChoiceField(choices=Priority.choices, required=False)
+    due_before = serializers.DateTimeField(required=False)
+    is_completed = serializers.BooleanField(default=True)
+
+    def validate(self, attrs):
+        """
+        Filtresiz istek tüm todo'ları değiştirmesin
+        """
+        if not {'ids', 'category', 'priority', 'due_before'} & attrs.keys():
+            raise serializers.ValidationError("ids veya en az bir filtre (category, priority, due_before) gerekli.")
+        return attrs
@@ -0,0 +1,27 @@
+from taskqueue.queue import task
+from .archive import archive_todos
+from .due import notify_due_soon, send_due_notification
+
+
+@task(name='todos.archive_todos')
+def archive_todos_task(days=None, batch_size=None):
+    """
+    Eski tamamlanmış todo'ları arka planda arşivle
+    """
+    return archive_todos(days, batch_size=batch_size)
+
+
+@task(name='todos.notify_due_soon')
+def notify_due_soon_task(lead_minutes=None, batch_size=None):
+    """
+    Yaklaşan todo'ları bildirim kuyruğuna ekle (periyodik)
+    """
+    return notify_due_soon(lead_minutes=lead_minutes, batch_size=batch_size)
+
+
+@task(name='todos.send_due_notifications')
+def send_due_notifications(user_id, todo_ids):
+    """
+    Kullanıcıya yaklaşan todo'ları için e-posta gönder
+    """
+    return send_due_notification(user_id, todo_ids)
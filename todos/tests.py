@@ -1,12 +1,25 @@
-from django.test import TestCase
+from django.db import IntegrityError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from django.utils import timezone
-from datetime import timedelta
+from datetime import datetime, timedelta
+from io import StringIO
+from unittest import mock
+from django.core import mail
+from django.core.management import call_command
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 from rest_framework_simplejwt.tokens import RefreshToken
-from .models import Category, Todo, TodoComment
+from taskqueue.models import Task
+from taskqueue.queue import run_once
+from todocalendar_project.dates import DateWindow
+from .archive import archive_todos
+from .due import OVERDUE, THIS_WEEK, TODAY, DueBuckets, notify_due_soon
+from .models import ArchivedTodo, Category, Todo, TodoComment
+from .serializers import TodoListSerializer, TodoListReadSerializer
 
 User = get_user_model()
 
@@ -130,6 +143,7 @@ class TodoModelTest(TestCase):
         self.assertEqual(todo.days_until_due, 3)
 
 
+@override_settings(QUERY_INSPECTOR={'ENABLED': True, 'MODE': 'raise', 'DUPLICATE_THRESHOLD': 3, 'SLOW_QUERY_MS': 1000})
 class TodoAPITest(APITestCase):
     """
     Todo API testleri
@@ -316,3 +330,480 @@ class TodoAPITest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 1)
         self.assertEqual(response.data['results'][0]['title'], 'My Todo')
+
+
+class TodoListReadSerializerParityTest(APITestCase):
+    """
+    Hızlı liste serializer'ının TodoListSerializer ile aynı çıktıyı ürettiğini doğrular
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        self.category = Category.objects.create(name='İş', color='#ff0000', user=self.user)
+        self.now = timezone.now()
+
+        Todo.objects.create(title='Kategorisiz', user=self.user)
+        Todo.objects.create(
+            title='Süresi geçmiş', description='Açıklama', user=self.user,
+            category=self.category, priority='high', due_date=self.now - timedelta(days=2, hours=3)
+        )
+        Todo.objects.create(
+            title='Yaklaşan', user=self.user, category=self.category,
+            due_date=self.now + timedelta(days=3, minutes=1), is_important=True, is_starred=True
+        )
+        Todo.objects.create(
+            title='Tamamlanmış', user=self.user, is_completed=True,
+            due_date=self.now - timedelta(days=1)
+        )
+        Todo.objects.create(title='Tam şimdi', user=self.user, due_date=self.now)
+
+    def render(self, data):
+        return JSONRenderer().render(data)
+
+    def test_output_identical_to_model_serializer(self):
+        """
+        Aynı `now` ile iki serializer bayt düzeyinde aynı JSON'u üretmeli
+        """
+        queryset = Todo.objects.filter(user=self.user).order_by('-created_at')
+
+        with mock.patch('django.utils.timezone.now', return_value=self.now):
+            expected = self.render(TodoListSerializer(queryset, many=True).data)
+            actual = self.render(TodoListReadSerializer(TodoListReadSerializer.values(queryset)).data)
+
+        self.assertEqual(actual, expected)
+
+    def test_list_endpoint_matches_model_serializer(self):
+        """
+        Liste endpoint'i filtre ve sıralamayla birlikte aynı çıktıyı vermeli
+        """
+        token = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token.access_token}')
+        url = reverse('todos:todo-list-create')
+
+        with mock.patch('django.utils.timezone.now', return_value=self.now):
+            response = self.client.get(url, {'is_completed': False, 'ordering': 'due_date'})
+            queryset = Todo.objects.filter(user=self.user, is_completed=False).order_by('due_date')
+            expected = self.render(TodoListSerializer(queryset, many=True).data)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 4)
+        self.assertEqual(self.render(response.data['results']), expected)
+
+
+class HotQueryIndexTest(TestCase):
+    """
+    Sık kullanılan sorguların index kullandığını doğrular
+    """
+    def test_hot_queries_use_indexes(self):
+        """
+        explain_hot_queries komutu sıralı tarama bulmamalı
+        """
+        output = StringIO()
+        call_command('explain_hot_queries', users=5, rows=200, stdout=output)
+        self.assertNotIn('SEQ SCAN', output.getvalue())
+
+
+class TodoArchiveTest(APITestCase):
+    """
+    Eski tamamlanmış todo'ların arşivlenmesi testleri
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        token = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token.access_token}')
+
+        old = timezone.now() - timedelta(days=200)
+        self.old_todos = [
+            Todo.objects.create(title=f'Eski rapor {index}', user=self.user, is_completed=True)
+            for index in range(3)
+        ]
+        Todo.objects.filter(pk__in=[todo.pk for todo in self.old_todos]).update(completed_at=old)
+        TodoComment.objects.create(todo=self.old_todos[0], user=self.user, comment='Bitti')
+
+        self.recent = Todo.objects.create(title='Yeni tamamlanan', user=self.user, is_completed=True)
+        self.pending = Todo.objects.create(title='Bekleyen', user=self.user)
+
+    def test_archive_moves_old_completed_todos(self):
+        """
+        Sadece süresi geçmiş tamamlanmış todo'lar aynı id ve yorumlarıyla taşınmalı
+        """
+        call_command('archive_todos', days=90, batch_size=2, stdout=StringIO())
+
+        self.assertEqual(set(Todo.objects.values_list('pk', flat=True)), {self.recent.pk, self.pending.pk})
+        archived = ArchivedTodo.objects.get(pk=self.old_todos[0].pk)
+        self.assertEqual(archived.title, 'Eski rapor 0')
+        self.assertEqual(archived.related['comments'][0]['comment'], 'Bitti')
+        self.assertFalse(TodoComment.objects.exists())
+
+    def test_archive_is_resumable(self):
+        """
+        Yarıda kesilen arşivleme tekrar çalıştırıldığında kalan kayıtlardan devam etmeli
+        """
+        call_command('archive_todos', days=90, batch_size=1, max_batches=1, stdout=StringIO())
+        self.assertEqual(ArchivedTodo.objects.count(), 1)
+
+        call_command('archive_todos', days=90, batch_size=1, stdout=StringIO())
+        self.assertEqual(ArchivedTodo.objects.count(), 3)
+
+    def test_conflicting_archive_row_keeps_live_todo(self):
+        """
+        Arşivde aynı id varsa parti geri alınmalı, canlı todo silinmemeli
+        """
+        todo = self.old_todos[0]
+        ArchivedTodo.objects.create(
+            id=todo.pk, title='Çakışan', user=self.user,
+            created_at=todo.created_at, updated_at=todo.updated_at
+        )
+
+        with self.assertRaises(IntegrityError):
+            archive_todos(days=90)
+
+        self.assertTrue(Todo.objects.filter(pk=todo.pk).exists())
+        self.assertEqual(TodoComment.objects.filter(todo=todo).count(), 1)
+        self.assertEqual(ArchivedTodo.objects.get(pk=todo.pk).title, 'Çakışan')
+
+    def test_list_includes_archived_on_request(self):
+        """
+        Liste varsayılan olarak arşivi içermemeli; include_archived ile arama dahil içermeli
+        """
+        call_command('archive_todos', days=90, stdout=StringIO())
+        url = reverse('todos:todo-list-create')
+
+        self.assertEqual(self.client.get(url).data['count'], 2)
+
+        response = self.client.get(url, {'include_archived': 'true', 'search': 'rapor', 'ordering': 'title'})
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(response.data['results'][0]['title'], 'Eski rapor 0')
+        self.assertTrue(all(todo['is_archived'] for todo in response.data['results']))
+
+        response = self.client.get(url, {'include_archived': 'true'})
+        self.assertEqual(response.data['count'], 5)
+        self.assertFalse(response.data['results'][0]['is_archived'])
+
+
+class TodoBulkCompleteTest(APITestCase):
+    """
+    Toplu tamamlama ve tek sorguluk durum değiştirme testleri
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        token = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token.access_token}')
+        self.url = reverse('todos:todo-bulk-complete')
+
+        self.category = Category.objects.create(name='İş', user=self.user)
+        soon = timezone.now() + timedelta(days=1)
+        self.work = Todo.objects.create(title='Rapor', user=self.user, category=self.category, priority='high', due_date=soon)
+        self.work_low = Todo.objects.create(title='Dosyala', user=self.user, category=self.category, priority='low')
+        self.home = Todo.objects.create(title='Alışveriş', user=self.user, priority='high')
+
+        other = User.objects.create_user(email='other@example.com', username='other', password='testpass123')
+        self.foreign = Todo.objects.create(title='Başkasının', user=other)
+
+    def test_complete_by_ids(self):
+        """
+        Sadece kullanıcının seçtiği todo'lar tek istekte tamamlanmalı
+        """
+        response = self.client.post(
+            self.url, {'ids': [self.work.pk, self.home.pk, self.foreign.pk]}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['updated'], 2)
+        self.assertEqual(
+            set(Todo.objects.filter(is_completed=True).values_list('pk', flat=True)),
+            {self.work.pk, self.home.pk}
+        )
+        self.assertIsNotNone(Todo.objects.get(pk=self.work.pk).completed_at)
+
+    def test_complete_by_filter(self):
+        """
+        Kategori, öncelik ve bitiş tarihi filtreleri birlikte uygulanmalı
+        """
+        response = self.client.post(self.url, {'category': self.category.pk, 'priority': 'high'}, format='json')
+        self.assertEqual(response.data['updated'], 1)
+        self.assertTrue(Todo.objects.get(pk=self.work.pk).is_completed)
+
+        due_before = (timezone.now() + timedelta(days=2)).isoformat()
+        response = self.client.post(self.url, {'due_before': due_before}, format='json')
+        # Rapor zaten tamamlanmış; tekrar sayılmaz
+        self.assertEqual(response.data['updated'], 0)
+
+    def test_reopen_and_requires_filter(self):
+        """
+        is_completed=false geri alır; filtresiz istek reddedilir
+        """
+        Todo.objects.filter(user=self.user).update(is_completed=True, completed_at=timezone.now())
+        response = self.client.post(self.url, {'ids': [self.home.pk], 'is_completed': False}, format='json')
+        self.assertEqual(response.data['updated'], 1)
+        self.assertIsNone(Todo.objects.get(pk=self.home.pk).completed_at)
+
+        response = self.client.post(self.url, {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_toggle_returns_compact_payload(self):
+        """
+        Durum değiştirme kısa yanıt döner ve iki kez çağrılınca eski haline gelir
+        """
+        url = reverse('todos:todo-toggle', kwargs={'pk': self.work.pk})
+        response = self.client.post(url)
+        self.assertEqual(set(response.data), {'id', 'title', 'is_completed', 'completed_at'})
+        self.assertTrue(response.data['is_completed'])
+        self.assertIsNotNone(response.data['completed_at'])
+
+        response = self.client.post(url)
+        self.assertFalse(response.data['is_completed'])
+        self.assertIsNone(response.data['completed_at'])
+
+        url = reverse('todos:todo-toggle', kwargs={'pk': self.foreign.pk})
+        self.assertEqual(self.client.post(url).status_code, status.HTTP_404_NOT_FOUND)
+
+
+class FieldSelectionTest(APITestCase):
+    """
+    ?fields= ve ?expand= ile seyrek yanıt ve buna göre kurulan sorgu testleri
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        token = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token.access_token}')
+
+        self.category = Category.objects.create(name='İş', user=self.user)
+        self.todo = Todo.objects.create(
+            title='Rapor', description='Uzun açıklama', user=self.user, category=self.category,
+            due_date=timezone.now() + timedelta(days=2)
+        )
+        TodoComment.objects.create(todo=self.todo, user=self.user, comment='İlk yorum')
+        TodoComment.objects.create(todo=self.todo, user=self.user, comment='İkinci yorum')
+        self.url = reverse('todos:todo-detail', kwargs={'pk': self.todo.pk})
+
+    def capture(self, *args, **kwargs):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(*args, **kwargs)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, [query['sql'] for query in queries.captured_queries]
+
+    def test_default_detail_embeds_relations(self):
+        """
+        Parametre verilmezse ilişkiler gömülür; yorumlar yerine yorum sayısı döner
+        """
+        response, _ = self.capture(self.url)
+        self.assertEqual(response.data['category']['name'], 'İş')
+        self.assertEqual(response.data['comment_count'], 2)
+        self.assertNotIn('comments', response.data)
+
+    def test_sparse_fields_skip_relations(self):
+        """
+        İstenmeyen ilişkiler ve sütunlar veritabanından okunmaz
+        """
+        response, queries = self.capture(self.url, {'fields': 'id,title,is_overdue'})
+        self.assertEqual(set(response.data), {'id', 'title', 'is_overdue'})
+        self.assertFalse(response.data['is_overdue'])
+        self.assertFalse([sql for sql in queries if 'todocomment' in sql or 'todoattachment' in sql])
+        todo_query = next(sql for sql in queries if 'FROM "todos_todo"' in sql)
+        self.assertNotIn('"description"', todo_query)
+
+    def test_nested_fields_and_collapsed_expand(self):
+        """
+        Noktalı yol iç içe alanları seçer; expand dışında kalan kategori id olarak döner
+        """
+        response, _ = self.capture(self.url, {'fields': 'title,category.name'})
+        self.assertEqual(response.data, {'title': 'Rapor', 'category': {'name': 'İş'}})
+
+        response, queries = self.capture(self.url, {'fields': 'title,category,attachments', 'expand': ''})
+        self.assertEqual(response.data, {'title': 'Rapor', 'category': self.category.pk})
+        self.assertFalse([sql for sql in queries if 'todos_category' in sql or 'todoattachment' in sql])
+
+    def test_write_keeps_unselected_inputs(self):
+        """
+        Yanıtta seçilmeyen yazılabilir alanlar girdi olarak kabul edilmeye devam eder
+        """
+        response = self.client.patch(f'{self.url}?fields=id', {'title': 'Yeni başlık'}, format='json')
+        self.assertEqual(response.data, {'id': self.todo.pk})
+        self.assertEqual(Todo.objects.get(pk=self.todo.pk).title, 'Yeni başlık')
+
+    def test_category_count_is_annotated(self):
+        """
+        Kategori listesinde todo sayısı satır başına COUNT yerine tek sorguda hesaplanır
+        """
+        Category.objects.create(name='Ev', user=self.user)
+        response, queries = self.capture(reverse('todos:category-list-create'), {'fields': 'name,todo_count'})
+        self.assertEqual(
+            {item['name']: item['todo_count'] for item in response.data['results']}, {'İş': 1, 'Ev': 0}
+        )
+        # Kimlik doğrulama, sayfalama sayımı ve liste
+        self.assertEqual(len(queries), 3)
+
+    def test_list_fields_select_only_needed_columns(self):
+        """
+        Hızlı liste serializer'ı yalnızca seçilen alanların sütunlarını çeker
+        """
+        response, queries = self.capture(reverse('todos:todo-list-create'), {'fields': 'id,category_name'})
+        self.assertEqual(response.data['results'], [{'id': self.todo.pk, 'category_name': 'İş'}])
+        list_query = next(sql for sql in queries if 'FROM "todos_todo"' in sql and 'COUNT' not in sql)
+        self.assertNotIn('"description"', list_query)
+
+        response = self.client.get(
+            reverse('todos:todo-list-create'), {'fields': 'title', 'include_archived': 'true', 'ordering': 'due_date'}
+        )
+        self.assertEqual(response.data['results'], [{'title': 'Rapor', 'is_archived': False}])
+
+
+class TodoCommentListTest(APITestCase):
+    """
+    Keyset sayfalı yorum listesi testleri
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        token = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token.access_token}')
+
+        self.todo = Todo.objects.create(title='Paylaşılan', user=self.user)
+        TodoComment.objects.bulk_create(
+            TodoComment(todo=self.todo, user=self.user, comment=f'Yorum {index}') for index in range(5)
+        )
+        # Sıralamanın created_at'e göre olduğunu doğrulamak için zamanları ayır
+        base = timezone.now()
+        for offset, comment in enumerate(TodoComment.objects.order_by('pk')):
+            TodoComment.objects.filter(pk=comment.pk).update(created_at=base + timedelta(minutes=offset))
+        self.url = reverse('todos:todo-add-comment', kwargs={'pk': self.todo.pk})
+
+    def test_pages_follow_cursor(self):
+        """
+        Yorumlar en yeniden eskiye sayfalanır ve cursor ile kalan sayfa alınır
+        """
+        response = self.client.get(self.url, {'page_size': 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['comment'] for item in response.data['results']], ['Yorum 4', 'Yorum 3', 'Yorum 2'])
+        self.assertIsNone(response.data['previous'])
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual([item['comment'] for item in response.data['results']], ['Yorum 1', 'Yorum 0'])
+        self.assertIsNone(response.data['next'])
+
+    def test_page_query_uses_single_select(self):
+        """
+        Sayfa kullanıcı adlarıyla birlikte tek sorguda okunur
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'fields': 'comment,user_username'})
+        self.assertEqual(response.data['results'][0], {'comment': 'Yorum 4', 'user_username': 'testuser'})
+        comment_queries = [query['sql'] for query in queries.captured_queries if 'todos_todocomment' in query['sql']]
+        self.assertEqual(len(comment_queries), 1)
+
+    def test_other_users_todo_is_not_found(self):
+        """
+        Başka kullanıcının todo'sunun yorumları listelenemez ve yorum eklenemez
+        """
+        other = User.objects.create_user(email='other@example.com', username='other', password='testpass123')
+        foreign = Todo.objects.create(title='Gizli', user=other)
+        url = reverse('todos:todo-add-comment', kwargs={'pk': foreign.pk})
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.post(url, {'comment': 'x'}, format='json').status_code, status.HTTP_404_NOT_FOUND)
+
+
+@override_settings(TASK_QUEUE={'MODE': 'queue'})
+class DueEngineTest(APITestCase):
+    """
+    Bitiş tarihi kovaları ve yaklaşan todo bildirimleri testleri
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        token = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token.access_token}')
+
+    def test_bucket_counts(self):
+        """
+        Kovalar ayrıktır ve yerel gün / hafta sınırlarına göre sayılır
+        """
+        # 17 Eylül 2025 Çarşamba 10:00 (İstanbul)
+        now = timezone.make_aware(datetime(2025, 9, 17, 10))
+        for title, due_date, completed in [
+            ('Geçmiş', now - timedelta(hours=1), False),
+            ('Bugün', now + timedelta(hours=2), False),
+            ('Pazar', now + timedelta(days=4), False),
+            ('Gelecek hafta', now + timedelta(days=5), False),
+            ('Tamamlanmış', now - timedelta(days=1), True),
+            ('Tarihsiz', None, False),
+        ]:
+            Todo.objects.create(title=title, user=self.user, due_date=due_date, is_completed=completed)
+
+        buckets = DueBuckets(DateWindow(timezone.get_current_timezone(), now=now))
+        with self.assertNumQueries(1):
+            counts = buckets.counts(Todo.objects.filter(user=self.user))
+        self.assertEqual(counts, {OVERDUE: 1, TODAY: 1, THIS_WEEK: 1})
+        self.assertEqual(
+            list(buckets.filter(Todo.objects.filter(user=self.user), TODAY).values_list('title', flat=True)),
+            ['Bugün'],
+        )
+
+    def test_list_filter_and_statistics(self):
+        """
+        ?due= listeyi kovaya göre filtreler, istatistikler aynı kovaları kullanır
+        """
+        now = timezone.now()
+        Todo.objects.create(title='Geçmiş', user=self.user, due_date=now - timedelta(days=1))
+        Todo.objects.create(title='Uzak', user=self.user, due_date=now + timedelta(days=30))
+
+        response = self.client.get(reverse('todos:todo-list-create'), {'due': 'overdue'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([todo['title'] for todo in response.data['results']], ['Geçmiş'])
+        self.assertTrue(response.data['results'][0]['is_overdue'])
+
+        response = self.client.get(reverse('todos:todo-list-create'), {'due': 'yarin'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(reverse('todos:todo-statistics'))
+        self.assertEqual(response.data['overdue_todos'], 1)
+        self.assertEqual(response.data['due_today_todos'], 0)
+
+    def test_notify_due_soon_batches_per_user(self):
+        """
+        Yaklaşan todo'lar kullanıcı başına tek işle bir kez bildirilir, ertelenen tekrar bildirilir
+        """
+        other = User.objects.create_user(email='other@example.com', username='other', password='testpass123')
+        now = timezone.now()
+        first = Todo.objects.create(title='Rapor', user=self.user, due_date=now + timedelta(minutes=20))
+        Todo.objects.create(title='Sunum', user=self.user, due_date=now + timedelta(minutes=40))
+        Todo.objects.create(title='Fatura', user=other, due_date=now + timedelta(minutes=30))
+        Todo.objects.create(title='Sonra', user=self.user, due_date=now + timedelta(hours=3))
+        Todo.objects.create(title='Bitti', user=self.user, due_date=now + timedelta(minutes=10), is_completed=True)
+
+        self.assertEqual(notify_due_soon(now, lead_minutes=60, batch_size=2), 3)
+        tasks = Task.objects.filter(name='todos.send_due_notifications').order_by('pk')
+        self.assertEqual(sorted(len(task.args[1]) for task in tasks), [1, 1, 1])
+        self.assertEqual(notify_due_soon(now, lead_minutes=60), 0)
+
+        Todo.objects.filter(pk=first.pk).update(due_date=now + timedelta(minutes=50))
+        self.assertEqual(notify_due_soon(now, lead_minutes=60), 1)
+
+        # Gönderim anında tamamlanmış todo e-postaya eklenmez
+        Todo.objects.filter(title='Sunum').update(is_completed=True)
+        self.assertEqual(run_once('test-worker'), 4)
+        bodies = {message.body for message in mail.outbox}
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox),
+                         ['other@example.com', 'test@example.com', 'test@example.com'])
+        self.assertFalse(any('Sunum' in body for body in bodies))
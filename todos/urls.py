@@ -1,8 +1,8 @@
 from django.urls import path
 from .views import (
     CategoryListCreateView, CategoryDetailView,
-    TodoListCreateView, TodoDetailView,
-    toggle_todo, add_todo_comment,
+    TodoListCreateView, TodoDetailView, TodoCommentListCreateView,
+    toggle_todo, bulk_complete_todos, start_todo_attachment_upload, download_todo_attachment,
     todo_statistics, upcoming_todos
 )
 
@@ -17,7 +17,10 @@ urlpatterns = [
     path('', TodoListCreateView.as_view(), name='todo-list-create'),
     path('<int:pk>/', TodoDetailView.as_view(), name='todo-detail'),
     path('<int:pk>/toggle/', toggle_todo, name='todo-toggle'),
-    path('<int:pk>/comments/', add_todo_comment, name='todo-add-comment'),
+    path('complete/', bulk_complete_todos, name='todo-bulk-complete'),
+    path('<int:pk>/comments/', TodoCommentListCreateView.as_view(), name='todo-add-comment'),
+    path('<int:pk>/attachments/', start_todo_attachment_upload, name='todo-attachment-upload'),
+    path('attachments/<int:pk>/download/', download_todo_attachment, name='todo-attachment-download'),
     
     # İstatistik ve özel endpoints
     path('statistics/', todo_statistics, name='todo-statistics'),
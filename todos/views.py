@@ -1,16 +1,27 @@
 from django.shortcuts import render
 from rest_framework import generics, status, permissions, filters
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
+from django.db.models import Case, DateTimeField, Q, Value, When
 from django.utils import timezone
-from datetime import timedelta
-from .models import Category, Todo, TodoComment
+from .models import ArchivedTodo, Category, Todo, TodoAttachment, TodoComment
 from .serializers import (
     CategorySerializer, TodoListSerializer, TodoDetailSerializer, 
-    TodoCreateSerializer, TodoCommentCreateSerializer
+    TodoCreateSerializer, TodoCommentCreateSerializer, TodoListReadSerializer,
+    TodoBulkCompleteSerializer, TodoCommentSerializer
 )
+from todocalendar_project.archive import include_archived, union_with_archived
+from todocalendar_project.dates import date_window
+from todocalendar_project.field_selection import FieldSelectionFilter, requested_fields
+from todocalendar_project.query_inspector import query_budget
+from todocalendar_project.renderers import DownloadRenderer, FastJSONRenderer
+from todocalendar_project.routers import read_replica
+from uploads.serving import serve_attachment
+from uploads.views import start_upload_response
+from .due import OVERDUE, THIS_WEEK, TODAY, DueBucketFilter, DueBuckets, pending_due
+from .pagination import TodoCommentPagination
 from .permissions import IsOwnerOrReadOnly, IsOwner
 
 
@@ -20,7 +31,7 @@ class CategoryListCreateView(generics.ListCreateAPIView):
     """
     serializer_class = CategorySerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [filters.SearchFilter, filters.OrderingFilter, FieldSelectionFilter]
     search_fields = ['name']
     ordering_fields = ['name', 'created_at']
     ordering = ['-created_at']
@@ -38,17 +49,22 @@ class CategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
     serializer_class = CategorySerializer
     permission_classes = [permissions.IsAuthenticated, IsOwner]
+    filter_backends = [FieldSelectionFilter]
+    # IsOwner izni için only() ile birlikte yüklenir
+    required_fields = ('user',)
 
     def get_queryset(self):
         return Category.objects.filter(user=self.request.user)
 
 
+@read_replica
+@query_budget(4)
 class TodoListCreateView(generics.ListCreateAPIView):
     """
     Todo listesi ve oluşturma
     """
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, DueBucketFilter, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['is_completed', 'priority', 'is_important', 'category']
     search_fields = ['title', 'description']
     ordering_fields = ['title', 'created_at', 'due_date', 'priority']
@@ -62,6 +78,32 @@ class TodoListCreateView(generics.ListCreateAPIView):
             return TodoCreateSerializer
         return TodoListSerializer
 
+    def list(self, request, *args, **kwargs):
+        """
+        Liste .values() satırlarından hızlı serializer ile üretilir;
+        ?fields= ile yalnızca seçilen alanların sütunları çekilir,
+        ?include_archived=true ile arşivlenmiş kayıtlar da eklenir
+        """
+        fields = requested_fields(request)
+        now = date_window(request).now
+        live = self.filter_queryset(self.get_queryset())
+        if include_archived(request):
+            archived = ArchivedTodo.objects.filter(user=request.user)
+            ordering = filters.OrderingFilter().get_ordering(request, archived, self)
+            # UNION sonucu yalnızca seçilen sütunlarla sıralanabilir
+            extra = [field.lstrip('-') for field in ordering]
+            queryset = union_with_archived(
+                TodoListReadSerializer.values(live, fields, extra),
+                TodoListReadSerializer.values(self.filter_queryset(archived), fields, extra),
+                ordering,
+            )
+        else:
+            queryset = TodoListReadSerializer.values(live, fields)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(TodoListReadSerializer(page, now=now, fields=fields).data)
+        return Response(TodoListReadSerializer(queryset, now=now, fields=fields).data)
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
@@ -72,56 +114,131 @@ class TodoDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
     serializer_class = TodoDetailSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwner]
+    filter_backends = [FieldSelectionFilter]
+    # IsOwner izni için only() ile birlikte yüklenir
+    required_fields = ('user',)
 
     def get_queryset(self):
         return Todo.objects.filter(user=self.request.user)
 
 
+@query_budget(3)
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def toggle_todo(request, pk):
     """
     Todo tamamlama durumunu değiştir
     """
-    try:
-        todo = Todo.objects.get(pk=pk, user=request.user)
-        todo.is_completed = not todo.is_completed
-        if todo.is_completed:
-            todo.completed_at = timezone.now()
-        else:
-            todo.completed_at = None
-        todo.save()
-        
-        serializer = TodoDetailSerializer(todo)
-        return Response(serializer.data)
-    except Todo.DoesNotExist:
+    # Okuma-değiştirme-yazma yerine tek UPDATE: SET ifadeleri satırın eski değerini görür
+    now = timezone.now()
+    updated = Todo.objects.filter(pk=pk, user=request.user).update(
+        is_completed=Case(When(is_completed=True, then=Value(False)), default=Value(True)),
+        completed_at=Case(
+            When(is_completed=True, then=Value(None, output_field=DateTimeField())),
+            default=Value(now),
+        ),
+        updated_at=now,
+    )
+    if not updated:
         return Response(
             {'error': 'Todo bulunamadı'}, 
             status=status.HTTP_404_NOT_FOUND
         )
+    return Response(
+        Todo.objects.filter(pk=pk).values('id', 'title', 'is_completed', 'completed_at').get()
+    )
+
+
+@query_budget(2)
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def bulk_complete_todos(request):
+    """
+    Seçilen todo'ları tek UPDATE ile tamamla (veya is_completed=false ile geri al)
+    """
+    serializer = TodoBulkCompleteSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    data = serializer.validated_data
+    is_completed = data['is_completed']
+
+    # Zaten istenen durumda olanlar değişmez; böylece completed_at korunur
+    queryset = Todo.objects.filter(user=request.user, is_completed=not is_completed)
+    if 'ids' in data:
+        queryset = queryset.filter(pk__in=data['ids'])
+    if 'category' in data:
+        queryset = queryset.filter(category_id=data['category'])
+    if 'priority' in data:
+        queryset = queryset.filter(priority=data['priority'])
+    if 'due_before' in data:
+        queryset = queryset.filter(due_date__lt=data['due_before'])
+
+    now = timezone.now()
+    completed_at = now if is_completed else None
+    updated = queryset.update(is_completed=is_completed, completed_at=completed_at, updated_at=now)
+    return Response({'updated': updated, 'is_completed': is_completed, 'completed_at': completed_at})
+
+
+@query_budget(3)
+class TodoCommentListCreateView(generics.ListCreateAPIView):
+    """
+    Todo yorumları (keyset sayfalı, en yeniden eskiye) ve yorum ekleme
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = TodoCommentPagination
+    filter_backends = [FieldSelectionFilter]
+    # Sonraki sayfanın cursor'ı son yorumun created_at değerinden üretilir
+    required_fields = ('created_at',)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if not Todo.objects.filter(pk=self.kwargs['pk'], user=request.user).exists():
+            raise NotFound('Todo bulunamadı')
+
+    def get_queryset(self):
+        return TodoComment.objects.filter(todo_id=self.kwargs['pk'])
+
+    def get_serializer_class(self):
+        if self.request.method == 'POST':
+            return TodoCommentCreateSerializer
+        return TodoCommentSerializer
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user, todo_id=self.kwargs['pk'])
 
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
-def add_todo_comment(request, pk):
+def start_todo_attachment_upload(request, pk):
     """
-    Todo'ya yorum ekle
+    Todo'ya parça parça ek yüklemeyi başlat
+    """
+    if not Todo.objects.filter(pk=pk, user=request.user).exists():
+        return Response(
+            {'error': 'Todo bulunamadı'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    return start_upload_response(request, 'todo', pk)
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+@renderer_classes([FastJSONRenderer, DownloadRenderer])
+def download_todo_attachment(request, pk):
+    """
+    Todo ekini indir (Range ve ETag destekli)
     """
     try:
-        todo = Todo.objects.get(pk=pk, user=request.user)
-        serializer = TodoCommentCreateSerializer(data=request.data)
-        
-        if serializer.is_valid():
-            serializer.save(user=request.user, todo=todo)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-    except Todo.DoesNotExist:
+        attachment = TodoAttachment.objects.select_related('blob').get(pk=pk, todo__user=request.user)
+    except TodoAttachment.DoesNotExist:
         return Response(
-            {'error': 'Todo bulunamadı'}, 
+            {'error': 'Ek bulunamadı'},
             status=status.HTTP_404_NOT_FOUND
         )
+    return serve_attachment(request, attachment)
 
 
+@read_replica
+@query_budget(6)
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def todo_statistics(request):
@@ -129,35 +246,38 @@ def todo_statistics(request):
     Todo istatistikleri
     """
     user_todos = Todo.objects.filter(user=request.user)
+    due_counts = DueBuckets(date_window(request)).counts(user_todos)
     
     stats = {
         'total_todos': user_todos.count(),
         'completed_todos': user_todos.filter(is_completed=True).count(),
         'pending_todos': user_todos.filter(is_completed=False).count(),
         'high_priority_todos': user_todos.filter(priority='high').count(),
-        'overdue_todos': user_todos.filter(
-            due_date__lt=timezone.now().date(),
-            is_completed=False
-        ).count(),
+        'overdue_todos': due_counts[OVERDUE],
+        'due_today_todos': due_counts[TODAY],
+        'due_this_week_todos': due_counts[THIS_WEEK],
     }
     
     return Response(stats)
 
 
+@read_replica
+@query_budget(2)
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def upcoming_todos(request):
     """
     Yaklaşan todo'lar
     """
-    now = timezone.now()
-    upcoming_date = now + timedelta(days=7)
+    window = date_window(request)
+    # Bugün ve sonraki 7 yerel gün
+    start, end = window.days(8)
     
-    todos = Todo.objects.filter(
-        user=request.user,
-        due_date__range=[now.date(), upcoming_date.date()],
-        is_completed=False
+    todos = pending_due(Todo.objects.filter(user=request.user)).filter(
+        due_date__gte=start,
+        due_date__lt=end,
     ).order_by('due_date')
     
-    serializer = TodoListSerializer(todos, many=True)
+    fields = requested_fields(request)
+    serializer = TodoListReadSerializer(TodoListReadSerializer.values(todos, fields), now=window.now, fields=fields)
     return Response(serializer.data)
@@ -0,0 +1,36 @@
+from django.contrib import admin
+
+from .models import StorageUsage, StoredBlob, UploadSession
+
+
+@admin.register(StoredBlob)
+class StoredBlobAdmin(admin.ModelAdmin):
+    """
+    İçerik adresli dosyalar admin paneli
+    """
+    list_display = ('sha256', 'size', 'ref_count', 'created_at')
+    search_fields = ('sha256',)
+    readonly_fields = ('sha256', 'file', 'size', 'ref_count', 'created_at')
+    ordering = ('-created_at',)
+
+
+@admin.register(UploadSession)
+class UploadSessionAdmin(admin.ModelAdmin):
+    """
+    Yükleme oturumları admin paneli
+    """
+    list_display = ('filename', 'user', 'target', 'target_id', 'received', 'size', 'updated_at')
+    list_filter = ('target', 'updated_at')
+    search_fields = ('filename', 'user__username', 'user__email')
+    ordering = ('-updated_at',)
+
+
+@admin.register(StorageUsage)
+class StorageUsageAdmin(admin.ModelAdmin):
+    """
+    Kullanıcı depolama kullanımı admin paneli
+    """
+    list_display = ('user', 'bytes_used')
+    search_fields = ('user__username', 'user__email')
+    readonly_fields = ('bytes_used',)
+    ordering = ('-bytes_used',)
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from uploads.pipeline import get_options, purge_stale_sessions
+
+
+class Command(BaseCommand):
+    """
+    Tamamlanmadan bırakılmış yükleme oturumlarını ve geçici dosyalarını siler
+    (cron ile periyodik çalıştırın).
+    """
+    help = 'Yarım kalmış eski yükleme oturumlarını temizler'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=get_options()['SESSION_HOURS'], help='Bu kadar saattir ilerlemeyenler')
+
+    def handle(self, *args, **options):
+        count = purge_stale_sessions(options['hours'])
+        self.stdout.write(self.style.SUCCESS(f'{count} yükleme oturumu silindi.'))
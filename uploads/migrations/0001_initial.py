@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:42
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('authentication', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StorageUsage',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='storage_usage', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='Kullanıcı')),
+                ('bytes_used', models.BigIntegerField(default=0, verbose_name='Kullanılan (Byte)')),
+            ],
+            options={
+                'verbose_name': 'Depolama Kullanımı',
+                'verbose_name_plural': 'Depolama Kullanımları',
+            },
+        ),
+        migrations.CreateModel(
+            name='StoredBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True, verbose_name='SHA-256')),
+                ('file', models.FileField(max_length=255, upload_to='', verbose_name='Dosya')),
+                ('size', models.BigIntegerField(verbose_name='Boyut (Byte)')),
+                ('ref_count', models.PositiveIntegerField(default=0, verbose_name='Referans Sayısı')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Oluşturulma Tarihi')),
+            ],
+            options={
+                'verbose_name': 'Saklanan Dosya',
+                'verbose_name_plural': 'Saklanan Dosyalar',
+            },
+        ),
+        migrations.CreateModel(
+            name='UploadSession',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('target', models.CharField(choices=[('todo', 'Todo'), ('event', 'Etkinlik')], max_length=10, verbose_name='Hedef')),
+                ('target_id', models.BigIntegerField(verbose_name='Hedef ID')),
+                ('filename', models.CharField(max_length=255, verbose_name='Dosya Adı')),
+                ('size', models.BigIntegerField(verbose_name='Boyut (Byte)')),
+                ('received', models.BigIntegerField(default=0, verbose_name='Alınan (Byte)')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Oluşturulma Tarihi')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Güncellenme Tarihi')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to=settings.AUTH_USER_MODEL, verbose_name='Kullanıcı')),
+            ],
+            options={
+                'verbose_name': 'Yükleme Oturumu',
+                'verbose_name_plural': 'Yükleme Oturumları',
+            },
+        ),
+    ]
@@ -0,0 +1,73 @@
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.db import models
+
+User = get_user_model()
+
+
+class StoredBlob(models.Model):
+    """
+    İçerik adresli dosya: aynı içerik (SHA-256) kullanıcılar arasında tek kez saklanır.
+
+    ref_count bu dosyayı kullanan ek sayısıdır; sıfıra indiğinde dosya silinir.
+    """
+    sha256 = models.CharField(max_length=64, unique=True, verbose_name="SHA-256")
+    file = models.FileField(max_length=255, verbose_name="Dosya")
+    size = models.BigIntegerField(verbose_name="Boyut (Byte)")
+    ref_count = models.PositiveIntegerField(default=0, verbose_name="Referans Sayısı")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Oluşturulma Tarihi")
+
+    class Meta:
+        verbose_name = "Saklanan Dosya"
+        verbose_name_plural = "Saklanan Dosyalar"
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.size} byte, {self.ref_count} referans)"
+
+
+class UploadSession(models.Model):
+    """
+    Parça parça (devam ettirilebilir) yükleme oturumu.
+
+    Alınan baytlar geçici bir dosyaya eklenir; received == size olduğunda
+    dosya StoredBlob'a taşınır, hedef ek oluşturulur ve oturum silinir.
+    """
+    TARGET_CHOICES = [
+        ('todo', 'Todo'),
+        ('event', 'Etkinlik'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='upload_sessions', verbose_name="Kullanıcı")
+    target = models.CharField(max_length=10, choices=TARGET_CHOICES, verbose_name="Hedef")
+    target_id = models.BigIntegerField(verbose_name="Hedef ID")
+    filename = models.CharField(max_length=255, verbose_name="Dosya Adı")
+    size = models.BigIntegerField(verbose_name="Boyut (Byte)")
+    received = models.BigIntegerField(default=0, verbose_name="Alınan (Byte)")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Oluşturulma Tarihi")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Güncellenme Tarihi")
+
+    class Meta:
+        verbose_name = "Yükleme Oturumu"
+        verbose_name_plural = "Yükleme Oturumları"
+
+    def __str__(self):
+        return f"{self.filename} ({self.received}/{self.size})"
+
+
+class StorageUsage(models.Model):
+    """
+    Kullanıcının eklerinin toplam boyutu; her ek eklenip silindiğinde artımlı güncellenir.
+
+    Tekilleştirilmiş dosyalar da her kullanıcının kotasına kendi boyutuyla sayılır.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='storage_usage', verbose_name="Kullanıcı")
+    bytes_used = models.BigIntegerField(default=0, verbose_name="Kullanılan (Byte)")
+
+    class Meta:
+        verbose_name = "Depolama Kullanımı"
+        verbose_name_plural = "Depolama Kullanımları"
+
+    def __str__(self):
+        return f"{self.user_id}: {self.bytes_used} byte"
@@ -0,0 +1,352 @@
+"""
+Ek yükleme hattı: parça parça akışla yükleme, içerik adresli tekilleştirme
+ve artımlı kota hesabı.
+
+Alınan baytlar belleğe alınmadan geçici dosyaya eklenir ve SHA-256 özeti
+yazarken hesaplanır; aynı özetli bir StoredBlob varsa yalnızca referans
+sayısı artırılır, yoksa dosya depolamaya `attachments/ab/cd/<sha256>` adıyla
+taşınır.
+
+Özet durumu (hashlib nesnesi) süreçler arasında taşınamadığından süreç içinde
+tutulur: yüklemenin parçaları aynı süreçte sırayla geldiği sürece özet akışla
+sürer; parçalardan biri başka bir sürece düştüyse (ör. sticky olmayan yük
+dengeleyici) ya da süreç yeniden başladıysa özet tamamlamada dosya yeniden
+okunarak hesaplanır.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import OperationalError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from todocalendar_project.metrics import registry
+from .models import StorageUsage, StoredBlob, UploadSession
+
+UPLOADS_DEFAULTS = {
+    'MAX_FILE_SIZE': 25 * 1024 * 1024,
+    'QUOTA_BYTES': 200 * 1024 * 1024,
+    'MAX_CHUNK_SIZE': 8 * 1024 * 1024,
+    'TEMP_DIR': None,
+    'SESSION_HOURS': 24,
+    # İndirmeler: 'django' (FileResponse), 'x-accel-redirect' (nginx) veya 'x-sendfile'
+    'SERVE_BACKEND': 'django',
+    'INTERNAL_URL': '/protected-media/',
+}
+
+# Akıştan okuma / diske yazma birimi
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Süreç içinde sürdürülen özetler: oturum id -> (özetlenen bayt sayısı, sha256)
+MAX_TRACKED_DIGESTS = 1024
+_digests = OrderedDict()
+_digests_lock = threading.Lock()
+
+# Yükleme hedefi -> ek modeli (hedef alan adı hedefle aynıdır)
+ATTACHMENT_MODELS = {
+    'todo': 'todos.TodoAttachment',
+    'event': 'calendar_app.EventAttachment',
+}
+
+# Arşivleme sırasında silinen ekler blob referansını ve kotayı bırakmaz
+retaining_blobs = ContextVar('retaining_blobs', default=False)
+
+
+class QuotaExceeded(Exception):
+    pass
+
+
+class OffsetMismatch(Exception):
+    """
+    İstemcinin gönderdiği offset sunucudaki alınan bayt sayısıyla uyuşmuyor
+    """
+    def __init__(self, offset):
+        super().__init__(f'Beklenen offset {offset}')
+        self.offset = offset
+
+
+class UploadInProgress(Exception):
+    pass
+
+
+class TargetNotFound(Exception):
+    pass
+
+
+def get_options():
+    return {**UPLOADS_DEFAULTS, **getattr(settings, 'UPLOADS', {})}
+
+
+def temp_dir():
+    return get_options()['TEMP_DIR'] or os.path.join(settings.MEDIA_ROOT, 'uploads', 'partial')
+
+
+def temp_path(session):
+    return os.path.join(temp_dir(), f'{session.pk}.part')
+
+
+def blob_name(digest):
+    return f'attachments/{digest[:2]}/{digest[2:4]}/{digest}'
+
+
+def bytes_used(user):
+    return StorageUsage.objects.filter(user=user).values_list('bytes_used', flat=True).first() or 0
+
+
+def reserve_quota(user_id, size):
+    """
+    Kota yetiyorsa kullanımı size kadar artır; tek koşullu UPDATE olduğu için
+    eşzamanlı yüklemeler kotayı aşamaz.
+    """
+    StorageUsage.objects.get_or_create(user_id=user_id)
+    limit = get_options()['QUOTA_BYTES'] - size
+    return StorageUsage.objects.filter(user_id=user_id, bytes_used__lte=limit).update(
+        bytes_used=F('bytes_used') + size
+    ) == 1
+
+
+def attachment_model(target):
+    return apps.get_model(ATTACHMENT_MODELS[target])
+
+
+def start_upload(user, target, target_id, filename, size):
+    """
+    Yükleme oturumu aç. Dosya boyut sınırını aşıyorsa ValueError, kota
+    yetmiyorsa QuotaExceeded fırlatır (kesin kontrol tamamlamada yapılır).
+    """
+    if size > get_options()['MAX_FILE_SIZE']:
+        raise ValueError(f"Dosya en fazla {get_options()['MAX_FILE_SIZE']} byte olabilir.")
+    if bytes_used(user) + size > get_options()['QUOTA_BYTES']:
+        raise QuotaExceeded()
+    return UploadSession.objects.create(
+        user=user, target=target, target_id=target_id, filename=filename, size=size
+    )
+
+
+def take_digest(session_id, offset):
+    """
+    offset'e kadar özetlenmiş sha256 nesnesini al; baştan başlayan yüklemede yenisi,
+    özet bu süreçte sürdürülmüyorsa None döner
+    """
+    with _digests_lock:
+        tracked = _digests.pop(session_id, None)
+    if offset == 0:
+        return hashlib.sha256()
+    if tracked is not None and tracked[0] == offset:
+        return tracked[1]
+    return None
+
+
+def keep_digest(session_id, received, digest):
+    with _digests_lock:
+        _digests[session_id] = (received, digest)
+        while len(_digests) > MAX_TRACKED_DIGESTS:
+            _digests.popitem(last=False)
+
+
+def forget_digest(session_id):
+    with _digests_lock:
+        _digests.pop(session_id, None)
+
+
+def write_chunk(session, offset, stream, length):
+    """
+    stream'den length baytı geçici dosyanın offset konumuna akışla yaz.
+
+    Bağlantı erken koparsa o ana kadar yazılanlar kaydedilir; istemci
+    yüklemeye GET ile öğrendiği offset'ten devam eder. Yükleme tamamlandıysa
+    ve özet bu süreçte sürdürülebildiyse yazarken hesaplanan SHA-256 özeti de
+    döner.
+
+    Oturum satırı yazma boyunca kilitlenir (SELECT ... FOR UPDATE NOWAIT);
+    aynı oturuma başka bir süreçte yazılıyorsa UploadInProgress fırlatılır.
+    Offset kilit altında veritabanındaki güncel değerle karşılaştırılır.
+    """
+    if offset != session.received:
+        raise OffsetMismatch(session.received)
+
+    with transaction.atomic():
+        try:
+            received = UploadSession.objects.select_for_update(nowait=True).filter(
+                pk=session.pk
+            ).values_list('received', flat=True).first()
+        except OperationalError:
+            raise UploadInProgress()
+        if received is None:
+            # Oturum bu arada tamamlandı veya iptal edildi
+            raise UploadInProgress()
+        session.received = received
+        if offset != received:
+            raise OffsetMismatch(received)
+
+        path = temp_path(session)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        digest = take_digest(session.pk, offset)
+        written = 0
+        with open(path, 'r+b' if os.path.exists(path) else 'wb') as destination:
+            # Önceki yarım kalmış yazmadan artakalan baytlar atılır
+            destination.seek(offset)
+            destination.truncate()
+            while written < length:
+                chunk = stream.read(min(STREAM_CHUNK_SIZE, length - written)) if stream else b''
+                if not chunk:
+                    break
+                destination.write(chunk)
+                if digest is not None:
+                    digest.update(chunk)
+                written += len(chunk)
+
+        UploadSession.objects.filter(pk=session.pk).update(received=offset + written, updated_at=timezone.now())
+        session.received = offset + written
+
+    if digest is None:
+        return None
+    if session.received == session.size:
+        return digest.hexdigest()
+    keep_digest(session.pk, session.received, digest)
+    return None
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as source:
+        for chunk in iter(lambda: source.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def finalize(session, digest=None):
+    """
+    Tamamlanan yüklemeyi blob'a bağlayıp hedef eki oluştur; (ek, tekilleştirildi_mi) döndür
+    """
+    path = temp_path(session)
+    digest = digest or file_digest(path)
+    model = attachment_model(session.target)
+    target_model = model._meta.get_field(session.target).related_model
+
+    with transaction.atomic():
+        if not target_model.objects.filter(pk=session.target_id, user_id=session.user_id).exists():
+            raise TargetNotFound()
+        if not reserve_quota(session.user_id, session.size):
+            raise QuotaExceeded()
+
+        blob, created = StoredBlob.objects.select_for_update().get_or_create(
+            sha256=digest, defaults={'size': session.size, 'file': blob_name(digest)}
+        )
+        # Geri alınan bir önceki denemeden kalan dosya aynı içeriğe sahiptir
+        if created and not default_storage.exists(blob.file.name):
+            with open(path, 'rb') as source:
+                default_storage.save(blob.file.name, File(source))
+        StoredBlob.objects.filter(pk=blob.pk).update(ref_count=F('ref_count') + 1)
+
+        attachment = model.objects.create(
+            **{f'{session.target}_id': session.target_id},
+            filename=session.filename,
+            file=blob.file.name,
+            file_size=session.size,
+            blob=blob,
+            uploaded_by_id=session.user_id,
+        )
+        forget_digest(session.pk)
+        session.delete()
+
+    os.remove(path)
+    registry.inc('todocalendar_attachment_uploads_total', {'deduplicated': str(not created).lower()},
+                 'Tamamlanan ek yüklemeleri')
+    return attachment, not created
+
+
+def abort(session):
+    path = temp_path(session)
+    forget_digest(session.pk)
+    session.delete()
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def delete_unreferenced_blob(blob_id):
+    """
+    Referansı kalmayan blob'u ve dosyasını sil
+    """
+    with transaction.atomic():
+        blob = StoredBlob.objects.select_for_update().filter(pk=blob_id, ref_count=0).first()
+        if blob is None:
+            return
+        name = blob.file.name
+        blob.delete()
+        # Satır kilidi altında silinir; aynı özetle eşzamanlı yükleme commit'i bekler
+        default_storage.delete(name)
+
+
+@contextmanager
+def retain_blobs():
+    """
+    Blok içinde silinen eklerin dosyaları (ör. arşive taşınanlar) saklanmaya devam eder.
+
+    Referans ve kota, arşiv kaydı silinince release_archived_attachments ile bırakılır.
+    """
+    token = retaining_blobs.set(True)
+    try:
+        yield
+    finally:
+        retaining_blobs.reset(token)
+
+
+def release_reference(user_id, size, blob_id):
+    """
+    Kullanıcının kota kullanımını ve blob'un referans sayısını geri al;
+    referansı kalmayan blob commit sonrasında silinir
+    """
+    StorageUsage.objects.filter(user_id=user_id).update(bytes_used=F('bytes_used') - size)
+    StoredBlob.objects.filter(pk=blob_id).update(ref_count=F('ref_count') - 1)
+    transaction.on_commit(lambda: delete_unreferenced_blob(blob_id))
+
+
+def release_attachment(attachment):
+    """
+    Silinen ekin kota kullanımını ve blob referansını geri al
+    """
+    release_reference(attachment.uploaded_by_id, attachment.file_size, attachment.blob_id)
+
+
+def release_archived_attachments(archived):
+    """
+    Silinen arşiv kaydının `related['attachments']` içinde tuttuğu blob
+    referanslarını ve kotayı geri al.
+
+    Yükleyeni kaydedilmemiş eski arşivlerde kota arşiv kaydının sahibinden düşülür.
+    """
+    attachments = [item for item in (archived.related or {}).get('attachments', []) if item.get('sha256')]
+    if not attachments:
+        return
+    blob_ids = dict(
+        StoredBlob.objects.filter(sha256__in={item['sha256'] for item in attachments}).values_list('sha256', 'pk')
+    )
+    for item in attachments:
+        blob_id = blob_ids.get(item['sha256'])
+        if blob_id is not None:
+            release_reference(item.get('uploaded_by') or archived.user_id, item['file_size'], blob_id)
+
+
+def purge_stale_sessions(hours=None):
+    """
+    hours saatten uzun süredir ilerlemeyen yükleme oturumlarını ve geçici dosyalarını sil
+    """
+    hours = get_options()['SESSION_HOURS'] if hours is None else hours
+    stale = UploadSession.objects.filter(updated_at__lt=timezone.now() - timedelta(hours=hours))
+    count = 0
+    for session in stale.iterator():
+        abort(session)
+        count += 1
+    return count
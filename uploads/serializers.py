@@ -0,0 +1,9 @@
+from rest_framework import serializers
+
+
+class UploadStartSerializer(serializers.Serializer):
+    """
+    Yükleme oturumu başlatma isteği
+    """
+    filename = serializers.CharField(max_length=255)
+    size = serializers.IntegerField(min_value=1)
@@ -0,0 +1,137 @@
+"""
+Ek indirme: içerik özetine bağlı güçlü önbellek başlıkları, HTTP Range ile
+devam ettirme ve dosya aktarımının web sunucusuna devredilmesi.
+
+SERVE_BACKEND 'x-accel-redirect' (nginx) veya 'x-sendfile' (Apache/lighttpd)
+olduğunda Python yalnızca yetkiyi kontrol edip başlıkları döndürür; baytları
+ve Range isteklerini web sunucusu aktarır. 'django' yalnızca geliştirme ve
+küçük kurulumlar içindir.
+"""
+import mimetypes
+import re
+from urllib.parse import quote
+
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified
+from django.utils.http import content_disposition_header, parse_etags
+
+from .pipeline import get_options
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+# İçerik adresli dosyalar değişmez; önbellek yeniden doğrulama yapmadan kullanabilir
+IMMUTABLE_CACHE_CONTROL = 'private, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'private, no-cache'
+
+
+class RangeFile:
+    """
+    Dosyanın [start, start + length) bölümünü okuyan salt-okunur sarmalayıcı.
+
+    fileno sunulmaz; böylece WSGI sunucusu sendfile ile tüm dosyayı göndermez.
+    """
+    def __init__(self, file, start, length):
+        self.file = file
+        self.remaining = length
+        file.seek(start)
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def attachment_etag(attachment):
+    """
+    Yükleme hattıyla gelen eklerde SHA-256 özeti (güçlü), eski eklerde zayıf ETag
+    """
+    if attachment.blob_id:
+        return f'"{attachment.blob.sha256}"'
+    return f'W/"{attachment.pk}-{attachment.file_size}"'
+
+
+def parse_range(header, size):
+    """
+    Tek aralıklı Range başlığını (start, end) olarak döndür.
+
+    Başlık yoksa veya desteklenmeyen biçimdeyse (çoklu aralık gibi) None
+    döner ve dosyanın tamamı gönderilir; karşılanamayan aralıkta ValueError.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if match is None:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # bytes=-N: son N bayt
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+def serve_attachment(request, attachment):
+    """
+    Eki yetki kontrolü yapılmış istek için döndür (304 / 206 / 200 veya sunucuya devir)
+    """
+    options = get_options()
+    etag = attachment_etag(attachment)
+    cache_control = IMMUTABLE_CACHE_CONTROL if attachment.blob_id else REVALIDATE_CACHE_CONTROL
+
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match and (if_none_match.strip() == '*' or etag in parse_etags(if_none_match)):
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        response['Cache-Control'] = cache_control
+        return response
+
+    content_type = mimetypes.guess_type(attachment.filename)[0] or 'application/octet-stream'
+    backend = options['SERVE_BACKEND']
+
+    if backend in ('x-accel-redirect', 'x-sendfile'):
+        response = HttpResponse(content_type=content_type)
+        if backend == 'x-accel-redirect':
+            response['X-Accel-Redirect'] = options['INTERNAL_URL'] + quote(attachment.file.name)
+        else:
+            response['X-Sendfile'] = attachment.file.path
+        response['Content-Disposition'] = content_disposition_header(True, attachment.filename)
+    else:
+        byte_range = None
+        if_range = request.headers.get('If-Range')
+        if not if_range or if_range.strip() == etag:
+            try:
+                byte_range = parse_range(request.headers.get('Range'), attachment.file_size)
+            except ValueError:
+                response = HttpResponse(status=416)
+                response['Content-Range'] = f'bytes */{attachment.file_size}'
+                return response
+
+        file = attachment.file.storage.open(attachment.file.name, 'rb')
+        if byte_range is None:
+            response = FileResponse(
+                file, as_attachment=True, filename=attachment.filename, content_type=content_type
+            )
+        else:
+            start, end = byte_range
+            response = FileResponse(
+                RangeFile(file, start, end - start + 1), status=206,
+                as_attachment=True, filename=attachment.filename, content_type=content_type
+            )
+            response['Content-Length'] = end - start + 1
+            response['Content-Range'] = f'bytes {start}-{end}/{attachment.file_size}'
+
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Cache-Control'] = cache_control
+    return response
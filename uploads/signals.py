@@ -0,0 +1,25 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from calendar_app.models import ArchivedEvent, EventAttachment
+from todos.models import ArchivedTodo, TodoAttachment
+from .pipeline import release_archived_attachments, release_attachment, retaining_blobs
+
+
+@receiver(post_delete, sender=TodoAttachment)
+@receiver(post_delete, sender=EventAttachment)
+def attachment_deleted(sender, instance, **kwargs):
+    """
+    Yükleme hattıyla eklenen ek silinince kota ve blob referansını geri al
+    """
+    if instance.blob_id and not retaining_blobs.get():
+        release_attachment(instance)
+
+
+@receiver(post_delete, sender=ArchivedTodo)
+@receiver(post_delete, sender=ArchivedEvent)
+def archive_deleted(sender, instance, **kwargs):
+    """
+    Arşiv kaydı silinince (ör. kullanıcı silindiğinde) eklerinin blob referansını ve kotayı geri al
+    """
+    release_archived_attachments(instance)
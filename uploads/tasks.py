@@ -0,0 +1,10 @@
+from taskqueue.queue import task
+from .pipeline import purge_stale_sessions
+
+
+@task(name='uploads.purge_stale_sessions')
+def purge_stale_sessions_task(hours=None):
+    """
+    Yarım kalmış eski yükleme oturumlarını temizle
+    """
+    return purge_stale_sessions(hours)
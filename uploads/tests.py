@@ -0,0 +1,411 @@
+import hashlib
+import io
+import shutil
+import tempfile
+import threading
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.db import connection, connections, transaction
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+from unittest import mock, skipUnless
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from calendar_app.models import Calendar, Event, EventAttachment, EventParticipant
+from todos.archive import archive_todos
+from todos.models import ArchivedTodo, Todo, TodoAttachment
+from . import pipeline
+from .models import StorageUsage, StoredBlob, UploadSession
+
+User = get_user_model()
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(
+    MEDIA_ROOT=MEDIA_ROOT,
+    UPLOADS={'QUOTA_BYTES': 1000, 'MAX_FILE_SIZE': 600, 'MAX_CHUNK_SIZE': 100},
+)
+class AttachmentUploadTest(APITestCase):
+    """
+    Parça parça yükleme, tekilleştirme ve kota testleri
+    """
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='upload@example.com', username='upload', password='testpass123')
+        self.other = User.objects.create_user(email='other@example.com', username='other', password='testpass123')
+        self.todo = Todo.objects.create(title='Ekli todo', user=self.user)
+        self.other_todo = Todo.objects.create(title='Diğer todo', user=self.other)
+        self.client = self.client_for(self.user)
+
+    def client_for(self, user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+        return client
+
+    def start(self, client, todo, content, filename='rapor.pdf'):
+        url = reverse('todos:todo-attachment-upload', kwargs={'pk': todo.pk})
+        response = client.post(url, {'filename': filename, 'size': len(content)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data['upload_url']
+
+    def put_chunk(self, client, upload_url, offset, chunk):
+        return client.put(
+            upload_url, data=chunk, content_type='application/offset+octet-stream', HTTP_UPLOAD_OFFSET=str(offset)
+        )
+
+    def upload(self, client, todo, content):
+        upload_url = self.start(client, todo, content)
+        for offset in range(0, len(content), 100):
+            response = self.put_chunk(client, upload_url, offset, content[offset:offset + 100])
+        return response
+
+    def test_chunked_upload_creates_attachment(self):
+        """
+        Parçalar birleştirilip içerik özetli blob'a bağlanan ek oluşturulur
+        """
+        content = bytes(range(256)) + b'x' * 44
+        response = self.upload(self.client, self.todo, content)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['sha256'], hashlib.sha256(content).hexdigest())
+        self.assertFalse(response.data['deduplicated'])
+        attachment = TodoAttachment.objects.get(pk=response.data['id'])
+        self.assertEqual(attachment.file_size, 300)
+        with default_storage.open(attachment.file.name) as stored:
+            self.assertEqual(stored.read(), content)
+        self.assertEqual(StorageUsage.objects.get(user=self.user).bytes_used, 300)
+        self.assertFalse(UploadSession.objects.exists())
+
+    def test_resume_after_offset_mismatch(self):
+        """
+        Yanlış offset 409 ile sunucudaki offset'i döndürür; yükleme oradan sürer
+        """
+        content = b'a' * 150
+        upload_url = self.start(self.client, self.todo, content)
+        self.put_chunk(self.client, upload_url, 0, content[:100])
+
+        response = self.put_chunk(self.client, upload_url, 0, content[:100])
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response['Upload-Offset'], '100')
+        self.assertEqual(self.client.get(upload_url).data['offset'], 100)
+
+        response = self.put_chunk(self.client, upload_url, 100, content[100:])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['sha256'], hashlib.sha256(content).hexdigest())
+
+    def test_stale_offset_rechecked_under_lock(self):
+        """
+        Kilit beklerken başka bir isteğin ilerlettiği oturuma eski offset'le yazılmamalı
+        """
+        content = b'a' * 150
+        upload_url = self.start(self.client, self.todo, content)
+        stale = UploadSession.objects.get()
+        self.put_chunk(self.client, upload_url, 0, content[:100])
+
+        with self.assertRaises(pipeline.OffsetMismatch) as raised:
+            pipeline.write_chunk(stale, 0, io.BytesIO(b'b' * 100), 100)
+
+        self.assertEqual(raised.exception.offset, 100)
+        self.assertEqual(stale.received, 100)
+        with open(pipeline.temp_path(stale), 'rb') as partial:
+            self.assertEqual(partial.read(), content[:100])
+
+    def test_digest_streamed_across_chunks(self):
+        """
+        Parçalar aynı süreçte geldiğinde özet yazarken hesaplanmalı, dosya yeniden okunmamalı
+        """
+        content = bytes(range(256)) + b'x' * 44
+        with mock.patch.object(pipeline, 'file_digest', side_effect=AssertionError('dosya yeniden okundu')):
+            response = self.upload(self.client, self.todo, content)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['sha256'], hashlib.sha256(content).hexdigest())
+        self.assertFalse(pipeline._digests)
+
+    def test_digest_recomputed_when_chunk_lands_elsewhere(self):
+        """
+        Özet bu süreçte sürdürülmüyorsa (başka worker) tamamlamada dosyadan hesaplanmalı
+        """
+        content = b'a' * 100 + b'b' * 50
+        upload_url = self.start(self.client, self.todo, content)
+        self.put_chunk(self.client, upload_url, 0, content[:100])
+        pipeline._digests.clear()
+
+        response = self.put_chunk(self.client, upload_url, 100, content[100:])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['sha256'], hashlib.sha256(content).hexdigest())
+
+    def test_identical_files_are_deduplicated_across_users(self):
+        """
+        Aynı içerik tek blob olarak saklanır, her kullanıcının kotasına ayrı sayılır
+        """
+        content = b'ortak dosya' * 10
+        self.upload(self.client, self.todo, content)
+        response = self.upload(self.client_for(self.other), self.other_todo, content)
+
+        self.assertTrue(response.data['deduplicated'])
+        blob = StoredBlob.objects.get()
+        self.assertEqual(blob.ref_count, 2)
+        self.assertEqual(StorageUsage.objects.get(user=self.other).bytes_used, len(content))
+
+    def test_deleting_last_reference_removes_blob(self):
+        """
+        Ek silinince kota geri verilir; son referans da silinince dosya kaldırılır
+        """
+        content = b'silinecek' * 10
+        self.upload(self.client, self.todo, content)
+        self.upload(self.client_for(self.other), self.other_todo, content)
+        name = StoredBlob.objects.get().file.name
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.todo.delete()
+        self.assertEqual(StoredBlob.objects.get().ref_count, 1)
+        self.assertEqual(StorageUsage.objects.get(user=self.user).bytes_used, 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other_todo.delete()
+        self.assertFalse(StoredBlob.objects.exists())
+        self.assertFalse(default_storage.exists(name))
+
+    def test_archiving_keeps_blob_reference(self):
+        """
+        Arşive taşınan todo'nun ek dosyası silinmez, özeti arşivde saklanır
+        """
+        content = b'arsiv' * 10
+        self.upload(self.client, self.todo, content)
+        Todo.objects.filter(pk=self.todo.pk).update(
+            is_completed=True, completed_at=timezone.now() - timedelta(days=400)
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(archive_todos(days=90), 1)
+        self.assertEqual(StoredBlob.objects.get().ref_count, 1)
+        archived = ArchivedTodo.objects.get(pk=self.todo.pk)
+        self.assertEqual(archived.related['attachments'][0]['sha256'], hashlib.sha256(content).hexdigest())
+
+    def test_deleting_archive_releases_blob_and_quota(self):
+        """
+        Arşiv kaydı (kullanıcıyla birlikte) silinince blob referansı ve kota bırakılmalı
+        """
+        content = b'arsiv' * 10
+        self.upload(self.client, self.todo, content)
+        self.upload(self.client_for(self.other), self.other_todo, content)
+        Todo.objects.filter(pk__in=[self.todo.pk, self.other_todo.pk]).update(
+            is_completed=True, completed_at=timezone.now() - timedelta(days=400)
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(archive_todos(days=90), 2)
+        blob = StoredBlob.objects.get()
+        self.assertEqual(blob.ref_count, 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ArchivedTodo.objects.filter(pk=self.todo.pk).delete()
+        self.assertEqual(StoredBlob.objects.get().ref_count, 1)
+        self.assertEqual(StorageUsage.objects.get(user=self.user).bytes_used, 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other.delete()
+        self.assertFalse(StoredBlob.objects.exists())
+        self.assertFalse(default_storage.exists(blob.file.name))
+
+    def test_quota_is_enforced(self):
+        """
+        Kotayı aşacak yükleme başlatılamaz
+        """
+        StorageUsage.objects.create(user=self.user, bytes_used=900)
+        url = reverse('todos:todo-attachment-upload', kwargs={'pk': self.todo.pk})
+        response = self.client.post(url, {'filename': 'büyük.zip', 'size': 200}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+    def test_quota_checked_again_on_completion(self):
+        """
+        Yükleme sürerken kota dolarsa tamamlama reddedilir ve oturum silinir
+        """
+        content = b'q' * 100
+        upload_url = self.start(self.client, self.todo, content)
+        StorageUsage.objects.update_or_create(user=self.user, defaults={'bytes_used': 950})
+
+        response = self.put_chunk(self.client, upload_url, 0, content)
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        self.assertFalse(TodoAttachment.objects.exists())
+        self.assertFalse(UploadSession.objects.exists())
+
+    def test_other_users_cannot_upload_or_resume(self):
+        """
+        Başkasının todo'suna yükleme başlatılamaz, başkasının oturumu görülemez
+        """
+        url = reverse('todos:todo-attachment-upload', kwargs={'pk': self.other_todo.pk})
+        response = self.client.post(url, {'filename': 'x.txt', 'size': 10}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        upload_url = self.start(self.client, self.todo, b'gizli')
+        response = self.client_for(self.other).get(upload_url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_event_upload_and_stale_session_purge(self):
+        """
+        Etkinliğe yükleme ve yarım kalan oturumların temizlenmesi
+        """
+        calendar = Calendar.objects.create(name='Takvim', user=self.user)
+        now = timezone.now()
+        event = Event.objects.create(
+            title='Toplantı', calendar=calendar, user=self.user,
+            start_time=now, end_time=now + timedelta(hours=1)
+        )
+        url = reverse('calendar_app:event-attachment-upload', kwargs={'pk': event.pk})
+        response = self.client.post(url, {'filename': 'gündem.txt', 'size': 5}, format='json')
+        response = self.put_chunk(self.client, response.data['upload_url'], 0, b'hello')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(EventAttachment.objects.get().file_size, 5)
+
+        session = pipeline.start_upload(self.user, 'todo', self.todo.pk, 'yarım.txt', 50)
+        UploadSession.objects.filter(pk=session.pk).update(updated_at=now - timedelta(days=2))
+        self.assertEqual(pipeline.purge_stale_sessions(hours=24), 1)
+        self.assertFalse(UploadSession.objects.exists())
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Satır kilidi SQLite üzerinde uygulanmaz')
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class UploadChunkLockTest(TransactionTestCase):
+    """
+    Aynı oturuma eşzamanlı parça yazımının veritabanı satır kilidiyle engellenmesi
+    """
+    def test_concurrent_chunk_rejected_while_row_locked(self):
+        """
+        Oturum satırı başka bir bağlantıda kilitliyken parça yazılmamalı
+        """
+        user = User.objects.create_user(email='lock@example.com', username='lock', password='testpass123')
+        todo = Todo.objects.create(title='Kilitli', user=user)
+        session = pipeline.start_upload(user, 'todo', todo.pk, 'rapor.pdf', 10)
+        locked, release = threading.Event(), threading.Event()
+
+        def hold_lock():
+            # Başka bir worker'ın yazma sürerken tuttuğu kilit
+            try:
+                with transaction.atomic():
+                    UploadSession.objects.select_for_update().get(pk=session.pk)
+                    locked.set()
+                    release.wait(5)
+            finally:
+                connections.close_all()
+
+        worker = threading.Thread(target=hold_lock)
+        worker.start()
+        try:
+            self.assertTrue(locked.wait(5))
+            with self.assertRaises(pipeline.UploadInProgress):
+                pipeline.write_chunk(session, 0, io.BytesIO(b'a' * 10), 10)
+        finally:
+            release.set()
+            worker.join()
+
+        pipeline.write_chunk(session, 0, io.BytesIO(b'a' * 10), 10)
+        self.assertEqual(UploadSession.objects.get(pk=session.pk).received, 10)
+        pipeline.abort(session)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class AttachmentDownloadTest(APITestCase):
+    """
+    Ek indirme: ETag/önbellek başlıkları, Range ve sunucuya devir testleri
+    """
+    content = b'0123456789' * 10
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='down@example.com', username='down', password='testpass123')
+        self.other = User.objects.create_user(email='guest@example.com', username='guest', password='testpass123')
+        self.todo = Todo.objects.create(title='İndirilecek', user=self.user)
+        session = pipeline.start_upload(self.user, 'todo', self.todo.pk, 'notlar.txt', len(self.content))
+        digest = pipeline.write_chunk(session, 0, io.BytesIO(self.content), len(self.content))
+        self.attachment, _ = pipeline.finalize(session, digest)
+        self.url = reverse('todos:todo-attachment-download', kwargs={'pk': self.attachment.pk})
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+    def test_full_download_with_cache_headers(self):
+        """
+        Dosyanın tamamı içerik özetli ETag ve değişmez önbellek başlığıyla döner
+        """
+        response = self.client.get(self.url, HTTP_ACCEPT='text/plain')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+        self.assertEqual(response['ETag'], f'"{hashlib.sha256(self.content).hexdigest()}"')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('notlar.txt', response['Content-Disposition'])
+
+    def test_if_none_match_returns_not_modified(self):
+        """
+        Önbellekteki ETag eşleşirse gövde gönderilmez
+        """
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_range_requests(self):
+        """
+        Tek aralıklı Range 206 ile ilgili baytları, karşılanamayan aralık 416 döndürür
+        """
+        response = self.client.get(self.url, HTTP_RANGE='bytes=10-19')
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(b''.join(response.streaming_content), self.content[10:20])
+        self.assertEqual(response['Content-Range'], 'bytes 10-19/100')
+        self.assertEqual(response['Content-Length'], '10')
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=-5')
+        self.assertEqual(b''.join(response.streaming_content), self.content[-5:])
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=500-')
+        self.assertEqual(response.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+
+        # If-Range eşleşmezse dosyanın tamamı gönderilir
+        response = self.client.get(self.url, HTTP_RANGE='bytes=10-19', HTTP_IF_RANGE='"eski"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(UPLOADS={'SERVE_BACKEND': 'x-accel-redirect', 'INTERNAL_URL': '/protected-media/'})
+    def test_accel_redirect_offloads_transfer(self):
+        """
+        nginx modunda gövde yerine dahili yönlendirme başlığı döner
+        """
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected-media/{self.attachment.file.name}')
+        self.assertEqual(response.content, b'')
+        self.assertIn('notlar.txt', response['Content-Disposition'])
+
+    def test_other_users_cannot_download(self):
+        """
+        Başka kullanıcının eki 404 döner
+        """
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.other).access_token}')
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_event_participant_can_download(self):
+        """
+        Etkinlik katılımcısı etkinlik ekini indirebilir
+        """
+        now = timezone.now()
+        calendar = Calendar.objects.create(name='Takvim', user=self.user)
+        event = Event.objects.create(
+            title='Toplantı', calendar=calendar, user=self.user, start_time=now, end_time=now + timedelta(hours=1)
+        )
+        session = pipeline.start_upload(self.user, 'event', event.pk, 'sunum.txt', 3)
+        pipeline.write_chunk(session, 0, io.BytesIO(b'abc'), 3)
+        attachment, _ = pipeline.finalize(session)
+        url = reverse('calendar_app:event-attachment-download', kwargs={'pk': attachment.pk})
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.other).access_token}')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        EventParticipant.objects.create(event=event, user=self.other)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b''.join(response.streaming_content), b'abc')
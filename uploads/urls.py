@@ -0,0 +1,8 @@
+from django.urls import path
+from .views import upload_session
+
+app_name = 'uploads'
+
+urlpatterns = [
+    path('<uuid:pk>/', upload_session, name='upload-session'),
+]
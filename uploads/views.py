@@ -0,0 +1,113 @@
+from django.urls import reverse
+from rest_framework import permissions, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+
+from . import pipeline
+from .models import UploadSession
+from .serializers import UploadStartSerializer
+
+
+def session_payload(session):
+    return {
+        'id': str(session.pk),
+        'filename': session.filename,
+        'size': session.size,
+        'offset': session.received,
+        'max_chunk_size': pipeline.get_options()['MAX_CHUNK_SIZE'],
+    }
+
+
+def quota_exceeded_response():
+    return Response(
+        {'error': 'Depolama kotası aşıldı', 'quota_bytes': pipeline.get_options()['QUOTA_BYTES']},
+        status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    )
+
+
+def start_upload_response(request, target, target_id):
+    """
+    Hedef (todo/etkinlik) için yükleme oturumu açıp yükleme adresini döndür
+    """
+    serializer = UploadStartSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        session = pipeline.start_upload(request.user, target, target_id, **serializer.validated_data)
+    except ValueError as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+    except pipeline.QuotaExceeded:
+        return quota_exceeded_response()
+
+    upload_url = reverse('uploads:upload-session', kwargs={'pk': session.pk})
+    return Response(
+        {**session_payload(session), 'upload_url': upload_url},
+        status=status.HTTP_201_CREATED,
+        headers={'Location': upload_url, 'Upload-Offset': str(session.received)}
+    )
+
+
+@api_view(['GET', 'PUT', 'DELETE'])
+@permission_classes([permissions.IsAuthenticated])
+def upload_session(request, pk):
+    """
+    Yükleme oturumu: GET kaldığı offset'i döndürür, PUT bir parçayı
+    (Upload-Offset başlığıyla, ham gövde olarak) ekler, DELETE iptal eder
+    """
+    try:
+        session = UploadSession.objects.get(pk=pk, user=request.user)
+    except UploadSession.DoesNotExist:
+        return Response({'error': 'Yükleme oturumu bulunamadı'}, status=status.HTTP_404_NOT_FOUND)
+
+    if request.method == 'GET':
+        return Response(session_payload(session), headers={'Upload-Offset': str(session.received)})
+
+    if request.method == 'DELETE':
+        pipeline.abort(session)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    # Gövde request.data ile ayrıştırılmaz; akıştan parça parça okunur
+    try:
+        offset = int(request.headers['Upload-Offset'])
+    except (KeyError, ValueError):
+        return Response({'error': 'Upload-Offset başlığı gerekli'}, status=status.HTTP_400_BAD_REQUEST)
+    length = int(request.META.get('CONTENT_LENGTH') or 0)
+    if length > pipeline.get_options()['MAX_CHUNK_SIZE']:
+        return Response(
+            {'error': f"Parça en fazla {pipeline.get_options()['MAX_CHUNK_SIZE']} byte olabilir"},
+            status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        )
+    if offset + length > session.size:
+        return Response({'error': 'Parça dosya boyutunu aşıyor'}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        digest = pipeline.write_chunk(session, offset, request.stream, length)
+    except pipeline.OffsetMismatch as exc:
+        return Response(
+            {'error': 'Offset uyuşmuyor', 'offset': exc.offset},
+            status=status.HTTP_409_CONFLICT,
+            headers={'Upload-Offset': str(exc.offset)}
+        )
+    except pipeline.UploadInProgress:
+        return Response({'error': 'Bu oturuma başka bir parça yazılıyor'}, status=status.HTTP_409_CONFLICT)
+
+    if session.received < session.size:
+        return Response(session_payload(session), headers={'Upload-Offset': str(session.received)})
+
+    try:
+        attachment, deduplicated = pipeline.finalize(session, digest)
+    except pipeline.QuotaExceeded:
+        pipeline.abort(session)
+        return quota_exceeded_response()
+    except pipeline.TargetNotFound:
+        pipeline.abort(session)
+        return Response({'error': 'Ekin hedefi bulunamadı'}, status=status.HTTP_404_NOT_FOUND)
+
+    return Response({
+        'id': attachment.pk,
+        'filename': attachment.filename,
+        'file_size': attachment.file_size,
+        'sha256': attachment.blob.sha256,
+        'deduplicated': deduplicated,
+    }, status=status.HTTP_201_CREATED)